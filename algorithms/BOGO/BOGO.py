@@ -1,13 +1,13 @@
 import random
 
 from algorithms.base.driver import Driver
-from evotools.ea_utils import dominates
+from evotools import ea_utils
 
 
 class Individual:
-    def __init__(self, vector, fitnesses):
+    def __init__(self, vector, fit):
         self.v = vector
-        self.fit = [f(self.v) for f in fitnesses]
+        self.fit = fit
 
 
 class BOGO(Driver):
@@ -18,38 +18,37 @@ class BOGO(Driver):
         fitnesses,
         mutation_variance,
         crossover_variance,
+        fitness_archive=None,
         *args,
         **kwargs
     ):
         super().__init__(*args, **kwargs)
         self.archive = []
         self.fitnesses = fitnesses
+        self.init_evaluator(fitnesses, fitness_archive)
         self.dims = dims
         self.cost = 0
-        for p in population:
-            self.cost += 1
-            ind = Individual(p, self.fitnesses)
-            self.refresh_archive(ind)
+        for p, fit in zip(population, self.evaluate(population)):
+            self.refresh_archive(Individual(p, fit))
         self.finished = False
 
     def refresh_archive(self, individual):
-        new_archive = []
-        individual_dominated = False
-        for archival in self.archive:
-            if not individual_dominated and dominates(archival.fit, individual.fit):
-                individual_dominated = True
-            elif not dominates(individual.fit, archival.fit):
-                new_archive.append(archival)
-        if not individual_dominated:
-            new_archive.append(individual)
-        self.archive = new_archive
+        if self.archive:
+            archive_fits = [archival.fit for archival in self.archive]
+            if ea_utils.domination_matrix(archive_fits, [individual.fit]).any():
+                return
+            dominated = ea_utils.domination_matrix([individual.fit], archive_fits)[0]
+            self.archive = [
+                archival
+                for archival, is_dominated in zip(self.archive, dominated)
+                if not is_dominated
+            ]
+        self.archive.append(individual)
 
     def finalized_population(self):
         return [x.v for x in self.archive]
 
     def step(self):
         vector = [random.uniform(a, b) for (a, b) in self.dims]
-        self.cost += 1
-        ind = Individual(vector, self.fitnesses)
-        self.refresh_archive(ind)
+        self.refresh_archive(Individual(vector, self.evaluate([vector])[0]))
         print("cost", self.cost, "archive", len(self.archive))
@@ -34,6 +34,7 @@ class HGS(ComplexDriver):
         comparison_multipliers=(1.0, 0.1, 0.01),
         population_sizes=(64, 16, 4),
         hgs_type="classic",
+        hypervolume_estimation=None,
         *args,
         **kwargs,
     ):
@@ -65,6 +66,7 @@ class HGS(ComplexDriver):
             comparison_multipliers,
             population_sizes,
             *args,
+            hypervolume_estimation=hypervolume_estimation,
             **kwargs,
         )
 
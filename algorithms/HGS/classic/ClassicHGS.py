@@ -10,7 +10,7 @@ import rx.operators as ops
 from rx import Observable
 from rx.scheduler import NewThreadScheduler
 
-from algorithms.base import drivertools
+from algorithms.base import drivertools, evaluation
 from algorithms.base.driver import StepsRun, ComplexDriver
 from algorithms.base.hv import HyperVolume
 
@@ -39,6 +39,7 @@ class ClassicHGS(ComplexDriver):
         sproutiveness=1,
         comparison_multipliers=(1.0, 0.1, 0.01),
         population_sizes=(64, 16, 4),
+        hypervolume_estimation=None,
         *args,
         **kwargs
     ):
@@ -63,6 +64,7 @@ class ClassicHGS(ComplexDriver):
         self.max_sprouts_no = max_sprouts_no
         self.sproutiveness = sproutiveness
         self.min_progress_ratio = min_progress_ratio
+        self.hypervolume_estimation = hypervolume_estimation
 
         self.mutation_etas = mutation_etas
         self.mutation_rates = mutation_rates
@@ -210,19 +212,27 @@ class ClassicHGS(ComplexDriver):
             print("!!!   RESURRECTION")
 
     def blurred_fitnesses(self, level):
+        def blur(f_val):
+            x = math.fabs(
+                random.gauss(f_val, self.fitness_errors[level] * f_val / 3.0)
+            )
+
+            # print("level: {}, normal: {} blurred: {}, diff: {}".format(level, f_val, x, math.fabs(f_val - x)/f_val))
+            return x
+
         def blurred(f):
             def blurred_f(*args, **kwargs):
-                f_val = f(*args, **kwargs)
-                x = math.fabs(
-                    random.gauss(f_val, self.fitness_errors[level] * f_val / 3.0)
-                )
-
-                # print("level: {}, normal: {} blurred: {}, diff: {}".format(level, f_val, x, math.fabs(f_val - x)/f_val))
-                return x
+                return blur(f(*args, **kwargs))
 
             return blurred_f
 
-        return [blurred(f) for f in self.fitnesses]
+        def blurred_evaluate(x):
+            # all the objectives evaluated at once, blurred in the same order as one by one
+            return [blur(f_val) for f_val in evaluation.evaluate_one(self.fitnesses, x)]
+
+        return evaluation.ProblemFitnesses(
+            [blurred(f) for f in self.fitnesses], evaluate=blurred_evaluate
+        )
 
     class Node:
         def __init__(self, owner, level, population):
@@ -284,10 +294,10 @@ class ClassicHGS(ComplexDriver):
 
         def update_dominated_hypervolume(self):
             self.old_hypervolume = self.hypervolume
-            fitness_values = [
-                [f(p) for f in self.owner.fitnesses] for p in self.population
-            ]
-            hv = HyperVolume(self.owner.reference_point)
+            fitness_values = evaluation.evaluate(self.owner.fitnesses, self.population)
+            hv = HyperVolume(
+                self.owner.reference_point, self.owner.hypervolume_estimation
+            )
 
             if self.relative_hypervolume is None:
                 self.relative_hypervolume = hv.compute(fitness_values)
@@ -37,6 +37,7 @@ class DistributedHGS(ComplexDriver):
             sproutiveness=1,
             comparison_multipliers=(1.0, 0.1, 0.01),
             population_sizes=(64, 16, 4),
+            hypervolume_estimation=None,
             *args,
             **kwargs,
     ):
@@ -65,6 +66,7 @@ class DistributedHGS(ComplexDriver):
         self.hgs_config.max_sprouts_no = max_sprouts_no
         self.hgs_config.sproutiveness = sproutiveness
         self.hgs_config.min_progress_ratio = min_progress_ratio
+        self.hgs_config.hypervolume_estimation = hypervolume_estimation
 
         self.hgs_config.mutation_etas = mutation_etas
         self.hgs_config.mutation_rates = mutation_rates
@@ -53,6 +53,7 @@ class HgsConfig:
     mantissa_bits = None
     driver_message_adapter_factory = None
     reference_point = None
+    hypervolume_estimation = None
 
 
 class NodeConfig:
@@ -183,6 +184,7 @@ class Node(TaskActor):
     old_average_fitnesses = None
     average_fitnesses = None
     reference_point = None
+    hypervolume_estimation = None
     relative_hypervolume = None
     old_hypervolume = None
     hypervolume = None
@@ -267,6 +269,7 @@ class Node(TaskActor):
         self.average_fitnesses = [float("inf") for _ in config.hgs_config.fitnesses]
 
         self.reference_point = config.hgs_config.reference_point
+        self.hypervolume_estimation = config.hgs_config.hypervolume_estimation
         self.relative_hypervolume = None
         self.old_hypervolume = float("-inf")
         self.hypervolume = float("-inf")
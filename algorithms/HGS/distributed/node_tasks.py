@@ -16,6 +16,7 @@ from algorithms.HGS.distributed.message import (
     HgsOperation,
 )
 from algorithms.HGS.distributed.hgs_tasks import OperationTask
+from algorithms.base import evaluation
 from algorithms.base.driver import StepsRun
 from algorithms.base.hv import HyperVolume
 
@@ -147,10 +148,8 @@ class NewMetaepochNodeTask(NodeOperationTask):
 
     def update_dominated_hypervolume(self):
         self.node.old_hypervolume = self.node.hypervolume
-        fitness_values = [
-            [f(p) for f in self.node.fitnesses] for p in self.node.population
-        ]
-        hv = HyperVolume(self.node.reference_point)
+        fitness_values = evaluation.evaluate(self.node.fitnesses, self.node.population)
+        hv = HyperVolume(self.node.reference_point, self.node.hypervolume_estimation)
 
         if self.node.relative_hypervolume is None:
             self.node.relative_hypervolume = hv.compute(fitness_values)
@@ -5,7 +5,7 @@ import time
 import floatextras
 import numpy as np
 
-from algorithms.base import drivertools
+from algorithms.base import drivertools, evaluation
 
 
 def population_from_delegate(delegate, size, dims, rate, eta):
@@ -34,19 +34,24 @@ def trim_mantissa(value, bits_no):
 
 
 def blurred_fitnesses(level, fitnesses, fitness_errors):
+    def blur(f_val):
+        x = np.math.fabs(random.gauss(f_val, fitness_errors[level] * f_val / 3.0))
+
+        # print("level: {}, normal: {} blurred: {}, diff: {}".format(level, f_val, x, math.fabs(f_val - x)/f_val))
+        return x
+
     def blurred(f):
         def blurred_f(*args, **kwargs):
-            f_val = f(*args, **kwargs)
-            x = np.math.fabs(
-                random.gauss(f_val, fitness_errors[level] * f_val / 3.0)
-            )
-
-            # print("level: {}, normal: {} blurred: {}, diff: {}".format(level, f_val, x, math.fabs(f_val - x)/f_val))
-            return x
+            return blur(f(*args, **kwargs))
 
         return blurred_f
 
-    return [blurred(f) for f in fitnesses]
+    def blurred_evaluate(x):
+        return [blur(f_val) for f_val in evaluation.evaluate_one(fitnesses, x)]
+
+    return evaluation.ProblemFitnesses(
+        [blurred(f) for f in fitnesses], evaluate=blurred_evaluate
+    )
 
 
 class TransformedDict(collections.MutableMapping):
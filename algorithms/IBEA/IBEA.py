@@ -1,9 +1,9 @@
-import itertools
-import math
 import random
 import sys
 
-from algorithms.base.driver import Driver
+import numpy as np
+
+from algorithms.base.driver import Driver, no_trim
 from algorithms.base.drivertools import rank, mutate, crossover
 
 
@@ -19,7 +19,7 @@ class IBEA(Driver):
         crossover_eta,
         mutation_rate,
         crossover_rate,
-        trim_function=lambda x: x,
+        trim_function=no_trim,
         fitness_archive=None,
         *args,
         **kwargs
@@ -38,22 +38,20 @@ class IBEA(Driver):
 
         self.cost = 0
         self.objectives = fitnesses
-        self.indicator = self.EPlusIndicator(self)
         self.generation_counter = 0
         self.k = kappa
         self.mating_size_c = mating_population_size
         self.trim_function = trim_function
         self.population = [self.trim_function(x) for x in population]
 
+        self.init_evaluator(fitnesses, fitness_archive)
         self._scale_objectives()
 
-        self.fitness_archive = fitness_archive
-
     def finalized_population(self):
         return self.finish()
 
     def get_indivs_inorder(self):
-        return rank(self.population, self.calculate_objectives)
+        return (ind.v for ind in rank(self.individuals, self.calculate_objectives))
 
     def finish(self):
         self._scale_objectives()
@@ -73,78 +71,74 @@ class IBEA(Driver):
         self._scale_objectives()
         self.generation_counter += 1
 
-    def _scale_objectives(self):
-        min_max = lambda x: (min(x), max(x))
-        for ind in self.individuals:
-            if not ind.known_objectives or not (
-                (self.fitness_archive is not None) and (ind.v in self.fitness_archive)
-            ):
-                self.cost += 1
-            ind.known_objectives = True
-        measured = [
-            (objective, min_max([objective(ind.v) for ind in self.individuals]))
-            for objective in self.objectives
-        ]
-        self.scaled_objectives = [
-            self._scale(objective, min_o, max_o)
-            for objective, (min_o, max_o) in measured
-        ]
-
-    @staticmethod
-    def _scale(fun, min_o, max_o):
-        def scaled(x):
-            return (fun(x) - min_o) / (max_o - min_o + sys.float_info.epsilon)
+    def _objective_values(self):
+        pending = [ind for ind in self.individuals if ind.objectives is None]
+        for ind, objectives in zip(pending, self.evaluate([ind.v for ind in pending])):
+            ind.objectives = objectives
+        return np.array([ind.objectives for ind in self.individuals], dtype=float)
 
-        return scaled
+    def _scale_objectives(self):
+        """ Measures the range of every objective in the population, for _calculate_fitness. """
+        objective_values = self._objective_values()
+        self.objectives_min = objective_values.min(axis=0)
+        self.objectives_range = (
+            objective_values.max(axis=0) - self.objectives_min + sys.float_info.epsilon
+        )
 
     def _calculate_fitness(self):
-        self.indicators = {
-            (x1, x2): self.indicator(x1.v, x2.v)
-            for x1, x2 in itertools.product(self.individuals, self.individuals)
-        }
-        self.c = max([abs(x) for x in self.indicators.values()])
-        self.fitness = {
-            x1: sum(
-                [
-                    (-1)
-                    * math.exp(
-                        (-1)
-                        * (
-                            self.indicators[(x2, x1)]
-                            / abs(self.c * self.k + sys.float_info.epsilon)
-                        )
-                    )
-                    for x2 in self.individuals
-                    if x2 != x1
-                ]
-            )
-            for x1 in self.individuals
-        }
+        """
+        Fitness of every individual, in the order of self.individuals: the sum over the other
+        individuals of -exp(-I(other, individual) / (c * kappa)), c being the largest indicator
+        value. The contributions are kept in self.contributions for _environmental_selection.
+        """
+        scaled = (self._objective_values() - self.objectives_min) / self.objectives_range
+        indicators = self.eplus_indicators(scaled)
+        self.c = np.abs(indicators).max()
+        self.contributions = np.exp(
+            -indicators / abs(self.c * self.k + sys.float_info.epsilon)
+        )
+        np.fill_diagonal(self.contributions, 0)
+        self.fitness = -self.contributions.sum(axis=0)
+
+    @staticmethod
+    def eplus_indicators(scaled_objectives: np.ndarray) -> np.ndarray:
+        """
+        :param scaled_objectives: Scaled objectives of the individuals, array of shape (n, m).
+        :return: Array of the additive epsilon indicators I(x1, x2) of every pair: the smallest
+            distance by which x1 has to be moved to weakly dominate x2.
+        """
+        return (
+            scaled_objectives[:, np.newaxis, :] - scaled_objectives[np.newaxis, :, :]
+        ).max(axis=2)
 
     def _environmental_selection(self):
-        while len(self.individuals) > self.population_size:
-            self.individuals = sorted(
-                self.individuals, key=lambda y: self.fitness[y], reverse=True
-            )
-            removed = self.individuals.pop()
-            for x in self.individuals:
-                self.fitness[x] += math.exp(
-                    (-1)
-                    * (
-                        self.indicators[(removed, x)]
-                        / abs(self.c * self.k + sys.float_info.epsilon)
-                    )
-                )
+        """
+        Removes the individual with the lowest fitness until population_size remain, taking its
+        contribution back from the fitness of the others. The survivors are left sorted from the
+        highest fitness, ties in their previous order.
+        """
+        alive = np.arange(len(self.individuals))
+        while len(alive) > self.population_size:
+            alive = alive[np.argsort(-self.fitness[alive], kind="mergesort")]
+            removed, alive = alive[-1], alive[:-1]
+            self.fitness[alive] += self.contributions[removed, alive]
+        self.individuals = [self.individuals[i] for i in alive]
+        self.fitness = self.fitness[alive]
+        self.contributions = self.contributions[np.ix_(alive, alive)]
 
     def _mating_selection(self, p):
-        coin = lambda: random.random() < p
-        better = (
-            lambda x1, x2: self.fitness[x1] < self.fitness[x2] and x1 or x2
-            if coin()
-            else self.fitness[x1] > self.fitness[x2] and x1 or x2
-        )
+        def better(x1, x2):
+            if random.random() < p:
+                return x1 if self.fitness[x1] < self.fitness[x2] else x2
+            return x1 if self.fitness[x1] > self.fitness[x2] else x2
+
         self.mating_individuals = [
-            better(random.choice(self.individuals), random.choice(self.individuals))
+            self.individuals[
+                better(
+                    random.randrange(len(self.individuals)),
+                    random.randrange(len(self.individuals)),
+                )
+            ]
             for _ in range(2 * self.mating_size)
         ]
 
@@ -165,8 +159,6 @@ class IBEA(Driver):
             self.Individual(mutate(x, self.dims, self.mutation_rate, self.mutation_eta))
             for x in self.mating_individuals
         ]
-        for ind in self.mating_individuals:
-            ind.known_objectives = False
 
     @property
     def population(self):
@@ -179,28 +171,14 @@ class IBEA(Driver):
         self.mating_size = int(self.mating_size_c * self.population_size)
 
     def calculate_objectives(self, ind):
-        if (self.fitness_archive is not None) and (ind.v in self.fitness_archive):
-            return self.fitness_archive[ind.v]
-        if not ind.known_objectives:
-            self.cost += 1
-        return [objective(ind.v) for objective in self.objectives]
-
-    class EPlusIndicator:
-        def __init__(self, population):
-            self.population = population
-
-        def __call__(self, x1, x2):
-            return max(
-                [
-                    objective(x1) - objective(x2)
-                    for objective in self.population.scaled_objectives
-                ]
-            )
+        if ind.objectives is None:
+            ind.objectives = self.evaluate([ind.v])[0]
+        return ind.objectives
 
     class Individual:
         def __init__(self, vector):
             self.v = vector
-            self.known_objectives = False
+            self.objectives = None
 
 
 if __name__ == "__main__":
@@ -7,6 +7,7 @@ import rx.operators as ops
 from rx.scheduler import NewThreadScheduler
 
 from algorithms.IMGA.topology import TorusTopology, Topology
+from algorithms.base import evaluation
 from algorithms.base.driver import StepsRun, ComplexDriver
 from evotools import ea_utils
 from evotools.random_tools import weighted_choice
@@ -140,7 +141,7 @@ class IMGA(ComplexDriver):
             logger = logging.getLogger(__name__)
 
             def fitfun_res(ind):
-                return [f(ind) for f in self.outer.fitnesses]
+                return evaluation.evaluate_one(self.outer.fitnesses, ind)
 
             current_population = self.driver.population
 
@@ -1,6 +1,8 @@
 import random
 
-import algorithms
+import numpy as np
+
+from algorithms.base.driver import no_trim
 from algorithms.NSGAII.NSGAII import NSGAII
 
 
@@ -17,7 +19,7 @@ class JGBL(NSGAII):
         crossover_rate,
         jumping_rate,
         jumping_percentage,
-        trim_function=lambda x: x,
+        trim_function=no_trim,
         fitness_archive=None,
         *args,
         **kwargs
@@ -40,61 +42,52 @@ class JGBL(NSGAII):
         self.jumping_percentage = jumping_percentage
 
     def step(self):
-        old_pop = list(self.individuals)
+        old_vectors, old_objective_values = self.vectors, self.objective_values
         super().step()
-        new_pop = list(self.individuals)
+        new_vectors, new_objective_values = self.vectors, self.objective_values
 
-        self.individuals = set(old_pop + new_pop)
+        # the survivors of the step are in both populations, its offspring only in the new one
+        offspring = slice(len(new_vectors) - self.mating_size, None)
+        self.vectors = np.concatenate([old_vectors, new_vectors[offspring]])
+        self.objective_values = np.concatenate(
+            [old_objective_values, new_objective_values[offspring]]
+        )
+        union = self.vectors
 
         self._nd_sort()
         self._crowding()
-        self._environmental_selection()
-        nondominanted = self.front[1]
+        nondominanted = self.rank == 1
+        survivors = self._environmental_selection()
 
-        if len(nondominanted) > len(self.individuals):
+        if np.count_nonzero(nondominanted) > len(self.vectors):
             print("hop")
-            pop_set = set(self.individuals)
-            nondominanted = [n for n in nondominanted if n not in pop_set]
+            nondominanted[survivors] = False
+            nondominanted = union[nondominanted].tolist()
             print(len(nondominanted))
 
-            jumping_pop = self.jump_genes(self.individuals, nondominanted)
-            for ind in jumping_pop:
-                ind.v = self.trim_function(ind.v)
+            jumping_pop = self.jump_genes(self.vectors.tolist(), nondominanted)
+            jumping_pop = [self.trim_function(x) for x in jumping_pop]
 
-            self.individuals = set(self.individuals + jumping_pop)
+            self.vectors = np.concatenate([self.vectors, self._as_vectors(jumping_pop)])
             self._calculate_objectives()
             self._nd_sort()
             self._crowding()
             self._environmental_selection()
         else:
-            self.individuals = new_pop
+            self.vectors, self.objective_values = new_vectors, new_objective_values
 
     def jump_genes(self, pop, nondominated):
         jumping_pop = []
-        for ind in pop:
+        for x in pop:
             if random.random() < self.jumping_rate:
-                _, cut_self = self.cut_and_paste(ind.v, ind.v)
-                _, copy_self = self.copy_and_paste(ind.v, ind.v)
+                _, cut_self = self.cut_and_paste(x, x)
+                _, copy_self = self.copy_and_paste(x, x)
 
-                cut_ind1, cut_ind2 = self.cut_and_paste(
-                    ind.v, random.choice(nondominated).v
-                )
-                copy_ind1, copy_ind2 = self.copy_and_paste(
-                    ind.v, random.choice(nondominated).v
-                )
+                cut_ind1, cut_ind2 = self.cut_and_paste(x, random.choice(nondominated))
+                copy_ind1, copy_ind2 = self.copy_and_paste(x, random.choice(nondominated))
 
                 jumping_pop.extend(
-                    [
-                        algorithms.NSGAII.NSGAII.Individual(x)
-                        for x in [
-                            cut_self,
-                            copy_self,
-                            cut_ind1,
-                            cut_ind2,
-                            copy_ind1,
-                            copy_ind2,
-                        ]
-                    ]
+                    [cut_self, copy_self, cut_ind1, cut_ind2, copy_ind1, copy_ind2]
                 )
         return jumping_pop
 
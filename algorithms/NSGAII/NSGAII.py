@@ -1,11 +1,11 @@
-from algorithms.base.driver import Driver
+from algorithms.base import selection
+from algorithms.base.driver import Driver, no_trim
 from algorithms.base.drivertools import mutate, crossover
+from evotools.random_tools import numpy_generator
 
 __author__ = "Prpht"
 
-import collections
-import random
-import sys
+import numpy as np
 
 
 def dominates_weak(x, y):
@@ -26,6 +26,12 @@ def dominates(x, y):
 
 
 class NSGAII(Driver):
+    """
+    NSGA-II on arrays: the decision vectors, objectives, ranks and crowding distances of the
+    individuals are the rows of vectors, objective_values, rank and crowding, reordered together by
+    the environmental selection. Offspring are appended after the survivors.
+    """
+
     def __init__(
         self,
         population,
@@ -36,7 +42,7 @@ class NSGAII(Driver):
         crossover_eta,
         mutation_rate,
         crossover_rate,
-        trim_function=lambda x: x,
+        trim_function=no_trim,
         fitness_archive=None,
         *args,
         **kwargs
@@ -56,26 +62,29 @@ class NSGAII(Driver):
         self.generation_counter = 0
 
         self.trim_function = trim_function
-        self.fitness_archive = fitness_archive
+        self.init_evaluator(fitnesses, fitness_archive)
 
         self.population_size = 0
-        self.individuals = []
         self.mating_size = 0
         self.population = [self.trim_function(x) for x in population]
+        self.rank = np.zeros(0, dtype=int)
+        self.crowding = np.zeros(0)
+        self.first_front = self.vectors[:0]
 
         self._calculate_objectives()
 
     @property
     def population(self):
-        return [x.v for x in self.individuals]
+        return self.vectors.tolist()
 
     def finalized_population(self):
         return self.finish()
 
     @population.setter
     def population(self, pop):
-        self.individuals = [Individual(x) for x in pop]
-        self.population_size = len(self.individuals)
+        self.vectors = self._as_vectors(pop)
+        self.objective_values = np.zeros((0, len(self.objectives)))
+        self.population_size = len(self.vectors)
         self.mating_size = int(self.mating_size_c * self.population_size)
 
     def finish(self):
@@ -83,7 +92,7 @@ class NSGAII(Driver):
         self._nd_sort()
         self._crowding()
         self._environmental_selection()
-        return [x.v for x in self.individuals]
+        return self.population
 
     def step(self):
         self._nd_sort()
@@ -92,110 +101,54 @@ class NSGAII(Driver):
         self._mating_selection(0.9)
         self._crossover()
         self._mutation()
-        for ind in self.mating_individuals:
-            ind.v = self.trim_function(ind.v)
-        self.individuals += self.mating_individuals
+        offspring = [self.trim_function(x) for x in self.mating_individuals]
+        self.vectors = np.concatenate([self.vectors, self._as_vectors(offspring)])
         self._calculate_objectives()
         self.generation_counter += 1
 
+    def _as_vectors(self, solutions) -> np.ndarray:
+        return np.asarray(solutions, dtype=float).reshape(len(solutions), len(self.dims))
+
     def _calculate_objectives(self):
-        for ind in self.individuals:
-            if ind.objectives is None:
-                if (self.fitness_archive is not None) and (
-                    ind.v in self.fitness_archive
-                ):
-                    fitnesses = self.fitness_archive[ind.v]
-                else:
-                    self.cost += 1
-                    fitnesses = [objective(ind.v) for objective in self.objectives]
-                    if self.fitness_archive is not None:
-                        self.fitness_archive[ind.v] = fitnesses
-                ind.objectives = {
-                    objective: fitness
-                    for objective, fitness in zip(self.objectives, fitnesses)
-                }
+        """ Evaluates the vectors appended since the last evaluation. """
+        pending = self.vectors[len(self.objective_values) :]
+        if len(pending):
+            values = np.asarray(self.evaluate(pending.tolist()), dtype=float)
+            self.objective_values = np.concatenate(
+                [self.objective_values, values.reshape(len(pending), -1)]
+            )
 
     def _nd_sort(self):
-        self.dominated_by = collections.defaultdict(set)
-        self.how_many_dominates = collections.defaultdict(int)
-        self.nsga_rank = collections.defaultdict(int)
-        self.front = collections.defaultdict(list)
-        for x in self.individuals:
-            for y in self.individuals:
-                if dominates(x, y):
-                    self.dominated_by[x].add(y)
-                elif dominates(y, x):
-                    self.how_many_dominates[x] += 1
-            if self.how_many_dominates[x] is 0:
-                self.nsga_rank[x] = 1
-                self.front[1].append(x)
-        front_no = 1
-        while True:
-            if len(self.front[front_no]) is 0:
-                break
-            for x in self.front[front_no]:
-                for y in self.dominated_by[x]:
-                    self.how_many_dominates[y] -= 1
-                    if self.how_many_dominates[y] is 0:
-                        self.nsga_rank[y] = front_no + 1
-                        self.front[front_no + 1].append(y)
-            front_no += 1
+        self.rank = selection.ranks(self.objective_values)
+        self.first_front = self.vectors[self.rank == 1]
 
     def _crowding(self):
-        self.dist = collections.defaultdict(float)
-        for front_no, inds in self.front.items():
-            if len(inds) == 0:
-                break
-            elif len(inds) == 1:
-                self.dist[inds[0]] = 0
-            else:
-                for objective in self.objectives:
-                    inds.sort(key=lambda x: x.objectives[objective])
-                    # self.dist[inds[0]] = self.dist[inds[-1]] = float('inf')
-                    max_r = inds[-1].objectives[objective]
-                    min_r = inds[0].objectives[objective]
-                    self.dist[inds[0]] = float("inf")
-                    self.dist[inds[-1]] += (
-                        2
-                        * (
-                            inds[-1].objectives[objective]
-                            - inds[-2].objectives[objective]
-                        )
-                        / (max_r - min_r + sys.float_info.epsilon)
-                    )
-                    for k in range(1, len(inds) - 1):
-                        self.dist[inds[k]] += (
-                            inds[k + 1].objectives[objective]
-                            - inds[k - 1].objectives[objective]
-                        ) / (max_r - min_r + sys.float_info.epsilon)
-
-    def _environmental_selection(self):
-        fitness = lambda ind: (
-            self.nsga_rank[ind],
-            1 / (self.dist[ind] + sys.float_info.epsilon),
-        )
-        self.fitness = {ind: fitness(ind) for ind in self.individuals}
-        self.individuals = sorted(self.individuals, key=lambda ind: self.fitness[ind])[
-            : self.population_size
-        ]
+        self.crowding = selection.crowding_distances(self.objective_values, self.rank)
+
+    def _environmental_selection(self) -> np.ndarray:
+        """
+        Keeps the population_size best individuals by the crowded comparison, in that order.
+
+        :return: Indices of the survivors in the population before the selection.
+        """
+        survivors = selection.crowded_order(self.rank, self.crowding)[: self.population_size]
+        self.vectors = self.vectors[survivors]
+        self.objective_values = self.objective_values[survivors]
+        self.rank = self.rank[survivors]
+        self.crowding = self.crowding[survivors]
+        return survivors
 
     def _mating_selection(self, p):
-        coin = lambda: random.random() < p
-        better = (
-            lambda x1, x2: self.fitness[x1] < self.fitness[x2] and x1 or x2
-            if coin()
-            else self.fitness[x1] > self.fitness[x2] and x1 or x2
+        winners = selection.binary_tournament(
+            self.rank, self.crowding, 2 * self.mating_size, numpy_generator(), p
         )
-        self.mating_individuals = [
-            better(random.choice(self.individuals), random.choice(self.individuals))
-            for _ in range(2 * self.mating_size)
-        ]
+        self.mating_individuals = self.vectors[winners].tolist()
 
     def _crossover(self):
         self.mating_individuals = [
             crossover(
-                self.mating_individuals[i].v,
-                self.mating_individuals[self.mating_size + i].v,
+                self.mating_individuals[i],
+                self.mating_individuals[self.mating_size + i],
                 self.dims,
                 self.crossover_rate,
                 self.crossover_eta,
@@ -205,17 +158,11 @@ class NSGAII(Driver):
 
     def _mutation(self):
         self.mating_individuals = [
-            Individual(mutate(x, self.dims, self.mutation_rate, self.mutation_eta))
+            mutate(x, self.dims, self.mutation_rate, self.mutation_eta)
             for x in self.mating_individuals
         ]
 
 
-class Individual:
-    def __init__(self, vector):
-        self.v = vector
-        self.objectives = None
-
-
 if __name__ == "__main__":
     pass
     # import pylab
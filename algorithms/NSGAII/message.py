@@ -1,15 +1,54 @@
-from algorithms.HGS.distributed.message import DefaultHGSMessageAdapter
-from algorithms.IMGA.message import DefaultIMGAMessageAdapter
+import collections
 
+import numpy as np
 
-def NSGAIIIMGAMessageAdapter(driver):
-    return DefaultIMGAMessageAdapter(driver)
+from algorithms.HGS.distributed.message import HGSMessageAdapter
+from algorithms.IMGA.message import IMGAMessageAdapter
+from algorithms.base.model import SubPopulation
 
 
-class NSGAIIHGSMessageAdapter(DefaultHGSMessageAdapter):
+class NSGAIIIMGAMessageAdapter(IMGAMessageAdapter):
+    def get_population(self):
+        return self.driver.population
+
+    def immigrate(self, migrants):
+        if migrants:
+            vectors, objective_values = zip(*migrants)
+            self.driver.vectors = np.concatenate(
+                [self.driver.vectors, np.asarray(vectors, dtype=float)]
+            )
+            self.driver.objective_values = np.concatenate(
+                [self.driver.objective_values, np.asarray(objective_values, dtype=float)]
+            )
+
+    def emigrate(self, migrants: SubPopulation):
+        """ :return: (vector, objectives) of the removed individuals. """
+        to_leave = collections.Counter(tuple(x) for x in migrants)
+        leaving = np.zeros(len(self.driver.vectors), dtype=bool)
+
+        for i, x in enumerate(self.driver.vectors.tolist()):
+            if to_leave[tuple(x)] > 0:
+                leaving[i] = True
+                to_leave[tuple(x)] -= 1
+
+        to_remove = list(
+            zip(
+                self.driver.vectors[leaving].tolist(),
+                self.driver.objective_values[leaving].tolist(),
+            )
+        )
+        self.driver.vectors = self.driver.vectors[~leaving]
+        self.driver.objective_values = self.driver.objective_values[~leaving]
+        return to_remove
+
+
+class NSGAIIHGSMessageAdapter(HGSMessageAdapter):
+    def get_population(self):
+        return self.driver.population
+
     def nominate_delegates(self):
         self.driver.shutdown()
-        return super().nominate_delegates()
+        return self.driver.first_front.tolist()
 
 
 NSGAIIDHGSMessageAdapter = NSGAIIHGSMessageAdapter
@@ -1,11 +1,12 @@
+import collections
+import functools
 import math
 import random
 
-import collections
 import numpy
 import numpy.linalg
 
-from algorithms.base.driver import Driver
+from algorithms.base.driver import Driver, no_trim
 
 EPSILON = numpy.finfo(float).eps
 
@@ -23,14 +24,14 @@ class NSGAIII(Driver):
         mutation_rate="default",
         crossover_rate=0.9,
         theta=5,
-        trim_function=lambda x: x,
+        trim_function=no_trim,
         fitness_archive=None,
         *args,
         **kwargs
     ):
         super().__init__(*args, **kwargs)
 
-        self.fitness_archive = fitness_archive
+        self.init_evaluator(fitnesses, fitness_archive)
         self.theta = theta
 
         self.dims = dims
@@ -46,10 +47,10 @@ class NSGAIII(Driver):
         )
 
         self.population_size = len(population)
-        self.reference_points = self.generate_reference_points()
-        self.reference_point_lengths = [
-            numpy.linalg.norm(point) for point in self.reference_points
-        ]
+        self.reference_points = reference_directions(
+            self.objective_no, self.population_size
+        )
+        self.reference_point_lengths = numpy.linalg.norm(self.reference_points, axis=1)
 
         self.individuals = []
         self.trim_function = trim_function
@@ -59,24 +60,11 @@ class NSGAIII(Driver):
         self.primary_cost_included = False
         self.budget = None
 
-        self.ideal_point = [float("inf") for _ in range(self.objective_no)]
+        self.ideal_point = numpy.full(self.objective_no, float("inf"))
         self.update_ideal_point(self.individuals)
 
-        # TODO: remove debug
-        # plt.scatter([x.v[0] for x in self.individuals], [x.v[1] for x in self.individuals], c='g')
-        # plt.scatter([x.objectives[0] for x in self.individuals], [x.objectives[1] for x in self.individuals], c='b')
-        # plt.scatter([self.ideal_point[0]], [self.ideal_point[1]], c='r')
-        # plt.show()
-
-        self.clusters = [[] for _ in self.reference_points]
         self.front = []
 
-    def generate_reference_points(self):
-        return [
-            generate_reference_point(self.objective_no)
-            for _ in range(self.population_size)
-        ]
-
     @property
     def population(self):
         return [x.v for x in self.individuals]
@@ -92,24 +80,16 @@ class NSGAIII(Driver):
         self.population_size = len(self.individuals)
 
     def _calculate_objectives(self, individuals):
-        for ind in individuals:
-            if ind.objectives is None:
-                if (self.fitness_archive is not None) and (
-                    ind.v in self.fitness_archive
-                ):
-                    ind.objectives = self.fitness_archive[ind.v]
-                else:
-                    self.cost += 1
-                    ind.objectives = [objective(ind.v) for objective in self.objectives]
-                    if self.fitness_archive is not None:
-                        self.fitness_archive[ind.v] = ind.objectives
+        pending = [ind for ind in individuals if ind.objectives is None]
+        for ind, objectives in zip(pending, self.evaluate([ind.v for ind in pending])):
+            ind.objectives = objectives
 
     def update_ideal_point(self, individuals):
         self._calculate_objectives(individuals)
-        for ind in individuals:
-            for i, objective in enumerate(ind.objectives):
-                if self.ideal_point[i] > objective:
-                    self.ideal_point[i] = objective
+        if individuals:
+            self.ideal_point = numpy.minimum(
+                self.ideal_point, numpy.min([ind.objectives for ind in individuals], axis=0)
+            )
 
     def finalized_population(self):
         return [x.v for x in self.individuals]
@@ -118,90 +98,18 @@ class NSGAIII(Driver):
         offspring_inds = self.make_offspring_individuals()
         for ind in offspring_inds:
             ind.v = self.trim_function(ind.v)
-
-        # TODO: remove debug
-        # plt.scatter([x.v[0] for x in offspring_inds], [x.v[1] for x in offspring_inds], c='b', marker='^')
-        # plt.show()
-
         self.update_ideal_point(offspring_inds)
 
-        # TODO: remove debug
-        # plt.scatter([x.objectives[0] for x in offspring_inds],
-        # [x.objectives[1] for x in offspring_inds], c='g', marker='^')
-        # plt.scatter([self.ideal_point[0]], [self.ideal_point[1]], c='r')
-        # plt.show()
-
         offspring_inds.extend(self.individuals)
-        self.normalize(offspring_inds)
-
-        # TODO: remove debug
-        # plt.scatter([x.normalized_objectives[0] for x in offspring_inds],
-        #             [x.normalized_objectives[1] for x in offspring_inds])
-        # plt.scatter([x[0] for x in self.reference_points], [x[1] for x in self.reference_points], c='k', marker='+')
-        # plt.show()
-
-        self.clustering(offspring_inds)
-
-        # TODO: remove debug
-        # for i, cluster in enumerate(self.clusters):
-        # c = None
-        # k = 7
-        # if i % k == 0:
-        # c = 'r'
-        # elif i % k == 1:
-        #         c = 'g'
-        #     elif i % k == 2:
-        #         c = 'b'
-        #     elif i % k == 3:
-        #         c = 'y'
-        #     elif i % k == 4:
-        #         c = 'k'
-        #     elif i % k == 5:
-        #         c = 'c'
-        #     elif i % k == 6:
-        #         c = 'm'
-        #
-        #     if len(cluster) > 0:
-        #         plt.scatter([x.normalized_objectives[0] for x in cluster],
-        #                     [x.normalized_objectives[1] for x in cluster], c=c, marker='s')
-        #         plt.scatter([self.reference_points[i][0]], [self.reference_points[i][1]], c=c, marker='o', s=500)
-        # plt.scatter([x[0] for x in self.reference_points], [x[1] for x in self.reference_points], c='k', marker='o')
-        # plt.xlim([-0.2, 1.2])
-        # plt.ylim([-0.2, 1.2])
-        # plt.show()
-        #
-        # plt.scatter([x.objectives[0] for x in offspring_inds], [x.objectives[1] for x in offspring_inds],
-        #             c='g', s=400)
-
-        self.calculate_theta_fitness()
-        fronts = theta_non_dominated_sort(offspring_inds)
-
-        # TODO: remove debug
-        # for i in fronts.keys():
-        #     front = fronts[i]
-        #     c = None
-        #     k = 7
-        #     if i == 1:
-        #         c = 'r'
-        #     elif i == 2:
-        #         c = 'g'
-        #     elif i == 3:
-        #         c = 'b'
-        #     elif i == 4:
-        #         c = 'y'
-        #     elif i == 5:
-        #         c = 'm'
-        #     elif i == 6:
-        #         c = 'c'
-        #     else:
-        #         c = 'k'
-        #
-        # plt.scatter([x.normalized_objectives[0] for x in front], [x.normalized_objectives[1] for x in front],
-        #             c=c, marker='s', s=100)
-        # plt.xlim([-0.2, 1.2])
-        # plt.ylim([-0.2, 1.2])
-        # plt.show()
+        normalized_objectives = self.normalize(
+            numpy.array([ind.objectives for ind in offspring_inds], dtype=float)
+        )
+        clusters, projections, rejections = self.clustering(normalized_objectives)
+        ranks = theta_non_dominated_sort(clusters, projections + self.theta * rejections)
 
+        fronts = collections.defaultdict(list)
+        for ind, front_no in zip(offspring_inds, ranks.tolist()):
+            fronts[front_no].append(ind)
         self.create_final_population(fronts)
         self.front = fronts
 
@@ -233,51 +141,40 @@ class NSGAIII(Driver):
             offspring_inds.append(child_b)
         return offspring_inds
 
-    def normalize(self, individuals):
-        defiled_point = [float("-inf") for _ in range(self.objective_no)]
-        for ind in individuals:
-            for i, objective in enumerate(ind.objectives):
-                if defiled_point[i] < objective:
-                    defiled_point[i] = objective
-
-        # TODO: remove debug
-        # plt.scatter([defiled_point[0]], [defiled_point[1]], c='r')
-        # plt.show()
-
-        for ind in individuals:
-            ind.normalized_objectives = numpy.array(
-                [
-                    (obj - self.ideal_point[i])
-                    / (defiled_point[i] - self.ideal_point[i] + EPSILON)
-                    for i, obj in enumerate(ind.objectives)
-                ]
-            )
+    def normalize(self, objective_values):
+        """
+        :param objective_values: Objectives of the individuals, array of shape (n, m).
+        :return: The objectives scaled to [0, 1] between the ideal point and the worst values.
+        """
+        defiled_point = objective_values.max(axis=0)
+        return (objective_values - self.ideal_point) / (
+            defiled_point - self.ideal_point + EPSILON
+        )
 
-    def clustering(self, individuals):
-        self.clusters = [[] for _ in self.reference_points]
-        for ind in individuals:
-            min_rejection = float("inf")
-            min_i = -1
-            for i, reference_point in enumerate(self.reference_points):
-                rejection = scalar_rejection(
-                    ind, reference_point, self.reference_point_lengths[i]
-                )
-                if rejection < min_rejection:
-                    min_rejection = rejection
-                    min_i = i
-            self.clusters[min_i].append(ind)
-            ind.cluster = min_i
-            ind.rejection = min_rejection
-
-    def calculate_theta_fitness(self):
-        for i, cluster in enumerate(self.clusters):
-            for ind in cluster:
-                ind.theta_fitness = (
-                    scalar_projection(
-                        ind, self.reference_points[i], self.reference_point_lengths[i]
-                    )
-                    + self.theta * ind.rejection
-                )
+    def clustering(self, normalized_objectives):
+        """
+        Associates every individual with the nearest reference direction.
+
+        :param normalized_objectives: Normalized objectives of the individuals, array of shape
+            (n, m).
+        :return: Arrays of the index of the direction of every individual, of the length of its
+            projection on the direction and of its distance to the direction.
+        """
+        projections = (
+            normalized_objectives @ self.reference_points.T / self.reference_point_lengths
+        )
+        # the projections already computed give the rejections without an (n, r, m) array
+        squared_lengths = (normalized_objectives * normalized_objectives).sum(axis=1)
+        rejections = numpy.sqrt(
+            numpy.maximum(squared_lengths[:, numpy.newaxis] - projections * projections, 0)
+        )
+        clusters = rejections.argmin(axis=1)
+        individuals = numpy.arange(len(normalized_objectives))
+        return (
+            clusters,
+            projections[individuals, clusters],
+            rejections[individuals, clusters],
+        )
 
     def create_final_population(self, fronts):
         new_inds = []
@@ -316,74 +213,36 @@ class Individual:
         self.objectives = None
 
 
-def theta_non_dominated_sort(individuals):
-    dominated_by = collections.defaultdict(set)
-    how_many_dominates = collections.defaultdict(int)
-    nsga_rank = collections.defaultdict(int)
-    front = collections.defaultdict(list)
-
-    for x in individuals:
-        for y in individuals:
-            if dominates(x, y):
-                dominated_by[x].add(y)
-            elif dominates(y, x):
-                how_many_dominates[x] += 1
-        if how_many_dominates[x] == 0:
-            nsga_rank[x] = 1
-            front[1].append(x)
-
-    front_no = 1
-    while not len(front[front_no]) == 0:
-        for x in front[front_no]:
-            for y in dominated_by[x]:
-                how_many_dominates[y] -= 1
-                if how_many_dominates[y] == 0:
-                    nsga_rank[y] = front_no + 1
-                    front[front_no + 1].append(y)
-        front_no += 1
-
-    return front
-
-
-def dominates(x, y):
-    if x.cluster == y.cluster and x.theta_fitness < y.theta_fitness:
-        return True
-    else:
-        return False
-
-
-def generate_reference_point(objective_no):
-    reference_point = []
-    coord_sum = 0.0
-    for i in range(1, objective_no + 1):
-        if i < objective_no:
-            rand = 0.0
-            while rand == 0.0:
-                rand = random.random()
-            coordinate = (1.0 - coord_sum) * (
-                1.0 - math.pow(rand, 1.0 / (objective_no - i))
-            )
-            coord_sum += coordinate
-            reference_point.append(coordinate)
-        else:
-            reference_point.append(1.0 - coord_sum)
-    return numpy.array(reference_point)
-
-
-def scalar_projection(ind, reference_point, reference_point_length):
-    return (
-        numpy.dot(ind.normalized_objectives, reference_point) / reference_point_length
-    )
-
-
-def scalar_rejection(ind, reference_point, reference_point_length):
-    scalar_projection_value = scalar_projection(
-        ind, reference_point, reference_point_length
-    )
-    return numpy.linalg.norm(
-        ind.normalized_objectives
-        - ((scalar_projection_value / reference_point_length) * reference_point)
-    )
+def theta_non_dominated_sort(clusters, theta_fitness):
+    """
+    Non-dominated sorting by theta-dominance: an individual dominates another of the same cluster
+    with a greater theta fitness, so the fronts of a cluster are its distinct theta fitness values.
+
+    :return: Number of the front of every individual, the first front being 1.
+    """
+    order = numpy.lexsort((theta_fitness, clusters))
+    sorted_clusters, sorted_fitness = clusters[order], theta_fitness[order]
+    new_cluster = numpy.r_[True, sorted_clusters[1:] != sorted_clusters[:-1]]
+    new_front = new_cluster | numpy.r_[True, sorted_fitness[1:] != sorted_fitness[:-1]]
+    fronts_before = numpy.cumsum(new_front)
+    cluster_start = fronts_before[new_cluster][numpy.cumsum(new_cluster) - 1]
+
+    ranks = numpy.empty(len(order), dtype=int)
+    ranks[order] = fronts_before - cluster_start + 1
+    return ranks
+
+
+@functools.lru_cache(maxsize=None)
+def reference_directions(objective_no, directions_no):
+    """
+    Reference directions: directions_no points drawn uniformly from the unit simplex of
+    objective_no objectives. They are drawn once per (objective_no, directions_no), by a random
+    state seeded with them, and shared by the drivers, e.g. the HGS sprouts of a level.
+    """
+    rng = numpy.random.RandomState([objective_no, directions_no])
+    directions = rng.dirichlet(numpy.ones(objective_no), size=directions_no)
+    directions.flags.writeable = False
+    return directions
 
 
 def simulated_binary_crossover(parent_a, parent_b, dims, crossover_rate=1.0, eta=30.0):
@@ -2,7 +2,7 @@ import copy
 import logging
 import random
 
-from algorithms.base.driver import Driver
+from algorithms.base.driver import Driver, no_trim
 
 
 class OMOPSO(Driver):
@@ -19,7 +19,7 @@ class OMOPSO(Driver):
         crossover_rate,
         mutation_perturbation=0.5,
         mutation_probability=0.05,
-        trim_function=lambda x: x,
+        trim_function=no_trim,
         fitness_archive=None,
         *args,
         **kwargs
@@ -38,7 +38,7 @@ class OMOPSO(Driver):
 
         self.archive = Archive(self.ETA)
         self.leader_archive = LeaderArchive(self.leaders_size)
-        self.fitness_archive = fitness_archive
+        self.init_evaluator(fitnesses, fitness_archive)
 
         self.init()
 
@@ -58,7 +58,7 @@ class OMOPSO(Driver):
         self.logger = logging.getLogger(__name__)
         self.cost = 0
         self.gen_no = 0
-        self.cost += self.calculate_objectives()
+        self.calculate_objectives()
         self.init_leaders()
         self.init_personal_best()
         self.leader_archive.crowding()
@@ -85,7 +85,7 @@ class OMOPSO(Driver):
         for x in self.individuals:
             x.value = self.trim_function(x.value)
 
-        self.cost += self.calculate_objectives()
+        self.calculate_objectives()
 
         self.update_leaders()
         self.update_personal_best()
@@ -113,15 +113,10 @@ class OMOPSO(Driver):
                 self.archive.add(copy.deepcopy(p))
 
     def calculate_objectives(self):
-        objectives_cost = 0
-        for p in self.individuals:
-            if (self.fitness_archive is not None) and (p.value in self.fitness_archive):
-                p.objectives = self.fitness_archive[p.value]
-                objectives_cost = 0
-            else:
-                p.objectives = [o(p.value) for o in self.fitnesses]
-                objectives_cost = len(self.individuals)
-        return objectives_cost
+        for p, objectives in zip(
+            self.individuals, self.evaluate([p.value for p in self.individuals])
+        ):
+            p.objectives = objectives
 
     def move(self):
         for p in self.individuals:
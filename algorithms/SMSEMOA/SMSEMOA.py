@@ -3,9 +3,11 @@ import random
 
 import collections
 
-from algorithms.base.driver import Driver
+import numpy as np
+
+from algorithms.base.driver import Driver, no_trim
 from algorithms.base.drivertools import crossover, mutate
-from algorithms.base.hv import HyperVolume
+from algorithms.base.hv import hypervolume_contributions
 from evotools import ea_utils
 
 
@@ -21,7 +23,7 @@ class SMSEMOA(Driver):
         crossover_rate,
         reference_point,
         epoch_length_multiplier=0.5,
-        trim_function=lambda x: x,
+        trim_function=no_trim,
         fitness_archive=None,
         *args,
         **kwargs
@@ -39,10 +41,10 @@ class SMSEMOA(Driver):
         self.epoch_length = int(len(self.individuals) * epoch_length_multiplier)
         self.reference_point = reference_point
 
-        self.fitness_archive = fitness_archive
+        self.init_evaluator(fitnesses, fitness_archive)
 
         self.logger = logging.getLogger(__name__)
-        self.cost = self.calculate_objectives(self.individuals)
+        self.calculate_objectives(self.individuals)
 
     @property
     def population(self):
@@ -58,19 +60,12 @@ class SMSEMOA(Driver):
     def step(self):
         for _ in range(self.epoch_length):
             new_indiv = self.generate(self.individuals)
-            self.cost += self.calculate_objectives([new_indiv])
+            self.calculate_objectives([new_indiv])
             self.individuals = self.reduce_population(self.individuals + [new_indiv])
 
     def calculate_objectives(self, pop):
-        objectives_cost = 0
-        for p in pop:
-            if (self.fitness_archive is not None) and (p.value in self.fitness_archive):
-                p.objectives = self.fitness_archive[p.value]
-                objectives_cost = 0
-            else:
-                p.objectives = [o(p.value) for o in self.fitnesses]
-                objectives_cost = len(self.population)
-        return objectives_cost
+        for p, objectives in zip(pop, self.evaluate([p.value for p in pop])):
+            p.objectives = objectives
 
     def generate(self, pop):
         selected_parents = [x.value for x in random.sample(pop, 2)]
@@ -93,47 +88,20 @@ class SMSEMOA(Driver):
         worst_front = max(sorted_pop.items(), key=lambda x: x[0])[1]
 
         hv_contribution = self.calculate_hypervolume_contribution(worst_front)
-        min_contributor = min(hv_contribution, key=lambda x: x[1])
-
-        pop.remove(min_contributor[0])
+        pop.remove(worst_front[int(np.argmin(hv_contribution))])
         return pop
 
     def calculate_hypervolume_contribution(self, pop):
-        hv = HyperVolume(self.reference_point)
-        results = [x.objectives for x in pop]
-
-        hv_global = hv.compute(results)
-
-        return [
-            (pop[i], hv_global - hv.compute(results[:i] + results[i + 1 :]))
-            for i in range(len(results))
-        ]
+        return hypervolume_contributions(
+            [x.objectives for x in pop], self.reference_point
+        )
 
 
 def nd_sort(pop):
-    dominated_by = collections.defaultdict(set)
-    how_many_dominates = collections.defaultdict(int)
     front = collections.defaultdict(list)
-
-    for x in pop:
-        for y in pop:
-            if ea_utils.dominates(x.objectives, y.objectives):
-                dominated_by[x].add(y)
-            elif ea_utils.dominates(y.objectives, x.objectives):
-                how_many_dominates[x] += 1
-        if how_many_dominates[x] is 0:
-            front[1].append(x)
-    front_no = 1
-    while True:
-        if len(front[front_no]) is 0:
-            break
-        for x in front[front_no]:
-            for y in dominated_by[x]:
-                how_many_dominates[y] -= 1
-                if how_many_dominates[y] is 0:
-                    front[front_no + 1].append(y)
-        front_no += 1
-    del front[front_no]
+    fronts = ea_utils.dominance_fronts([x.objectives for x in pop])
+    for front_no, indices in enumerate(fronts, start=1):
+        front[front_no] = [pop[i] for i in indices]
     return front
 
 
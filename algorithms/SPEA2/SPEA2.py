@@ -6,8 +6,11 @@
 """
 import math
 import random
+from typing import List
 
-from algorithms.base.driver import Driver
+import numpy as np
+
+from algorithms.base.driver import Driver, no_trim
 from algorithms.base.drivertools import crossover, mutate
 from evotools import ea_utils
 from metrics.metrics_utils import euclid_distance
@@ -31,7 +34,7 @@ class SPEA2(Driver):
         mutation_rate,
         crossover_eta,
         crossover_rate,
-        trim_function=lambda x: x,
+        trim_function=no_trim,
         fitness_archive=None,
         *args,
         **kwargs
@@ -51,7 +54,7 @@ class SPEA2(Driver):
         self.archive = []
         self.select = SPEA2.Tournament()
 
-        self.fitness_archive = fitness_archive
+        self.init_evaluator(fitnesses, fitness_archive)
 
     @property
     def population(self):
@@ -68,8 +71,10 @@ class SPEA2(Driver):
         return [x["value"] for x in self.archive]
 
     def step(self):
-        self.cost += self.calculate_fitnesses(self.individuals, self.archive)
-        self.archive = self.environmental_selection(self.individuals, self.archive)
+        distances = self.calculate_fitnesses(self.individuals, self.archive)
+        self.archive = self.environmental_selection(
+            self.individuals, self.archive, distances
+        )
 
         self.population = [
             self.trim_function(
@@ -89,45 +94,43 @@ class SPEA2(Driver):
             for _ in self.individuals
         ]
 
-    def calculate_fitnesses(self, population, archive):
-        objectives_cost = self.calculate_objectives(population)
+    def calculate_fitnesses(self, population, archive) -> np.ndarray:
+        """
+        :return: Distances between the objectives of archive + population, computed once for the
+            densities and the truncation of the archive.
+        """
+        self.calculate_objectives(population)
         union = archive + population
-        self.calculate_dominated(union)
+        domination = self.calculate_dominated(union)
+        raw_fitnesses = self.calculate_raw_fitnesses(union, domination)
+        distances = self.distance_matrix(union)
+        densities = self.calculate_densities(distances)
 
-        for p in union:
-            raw_fitness = self.calculate_raw_fitness(p, union)
-            density = self.calculate_density(p, union)
+        for p, raw_fitness, density in zip(union, raw_fitnesses, densities):
             p["fitness"] = raw_fitness + density
-        return objectives_cost
+        return distances
 
-    def calculate_raw_fitness(self, p1, pop):
-        return 0.0 + sum(y["dominates"] for y in pop if self.dominates(y, p1))
+    @staticmethod
+    def calculate_raw_fitnesses(pop, domination):
+        strengths = np.array([p["dominates"] for p in pop], dtype=float)
+        return (strengths @ domination).tolist()
 
-    def calculate_density(self, p1, pop):
-        distances = sorted(
-            [self.euclidean_distance(p1["objectives"], p2["objectives"]) for p2 in pop]
-        )
-        k = int(math.sqrt(len(pop)))
-        return 1.0 / (distances[k] + 2.0)
+    @staticmethod
+    def calculate_densities(distances) -> List[float]:
+        """ 1 / (distance to the k-th nearest + 2), k = sqrt(population size), self included. """
+        k = int(math.sqrt(len(distances)))
+        kth_distances = np.partition(distances, k, axis=1)[:, k]
+        return (1.0 / (kth_distances + 2.0)).tolist()
 
     def calculate_objectives(self, pop):
-        objectives_cost = 0
-        for p in pop:
-            if (self.fitness_archive is not None) and (
-                p["value"] in self.fitness_archive
-            ):
-                p["objectives"] = self.fitness_archive[p["value"]]
-                objectives_cost = 0
-            else:
-                p["objectives"] = [o(p["value"]) for o in self.fitnesses]
-                objectives_cost = len(self.population)
-        return objectives_cost
+        for p, objectives in zip(pop, self.evaluate([p["value"] for p in pop])):
+            p["objectives"] = objectives
 
     def calculate_dominated(self, pop):
-        for p in pop:
-            p["dominates"] = len(
-                [x for x in pop if id(p) != id(x) and self.dominates(p, x)]
-            )
+        domination = ea_utils.domination_matrix([p["objectives"] for p in pop])
+        for p, dominates_count in zip(pop, domination.sum(axis=1)):
+            p["dominates"] = int(dominates_count)
+        return domination
 
     @staticmethod
     def dominates(p1, p2):
@@ -137,22 +140,34 @@ class SPEA2(Driver):
     def euclidean_distance(c1, c2):
         return euclid_distance(c1, c2)
 
-    def environmental_selection(self, pop, archive):
+    @staticmethod
+    def distance_matrix(pop) -> np.ndarray:
+        """ Euclidean distances between the objectives of the individuals, as euclid_distance. """
+        objectives = np.array([p["objectives"] for p in pop], dtype=float)
+        if objectives.ndim < 2:
+            return np.zeros((len(pop), len(pop)))
+        differences = objectives[:, None, :] - objectives[None, :, :]
+        return np.sqrt((differences * differences).sum(axis=2))
+
+    def environmental_selection(self, pop, archive, distances):
+        """
+        :param distances: Distance matrix of archive + pop (see calculate_fitnesses).
+        """
         union = archive + pop
-        sorted_union = sorted(union, key=lambda x: x["fitness"])
-        index = self.get_domination_index(sorted_union)
-        environment = sorted_union[:index]
+        order = sorted(range(len(union)), key=lambda i: union[i]["fitness"])
+        index = self.get_domination_index([union[i] for i in order])
+        environment = order[:index]
 
         if len(environment) < self.__archive_size:
             diff_size = self.__archive_size - len(environment)
-            environment += sorted_union[index : index + diff_size]
+            environment += order[index : index + diff_size]
 
         elif len(environment) > self.__archive_size:
-            while len(environment) > self.__archive_size:
-                to_truncate = self.choose_to_truncate(environment)
-                environment.remove(to_truncate)
+            environment = self.truncate(
+                environment, distances[np.ix_(environment, environment)]
+            )
 
-        return environment
+        return [union[i] for i in environment]
 
     @staticmethod
     def get_domination_index(sorted_pop):
@@ -162,42 +177,61 @@ class SPEA2(Driver):
 
         return len(sorted_pop)
 
-    def choose_to_truncate(self, pop):
-        distances = []
-        for p in pop:
-            distances.append(
-                (
-                    p,
-                    sorted(
-                        [
-                            (
-                                p2,
-                                self.euclidean_distance(
-                                    p["objectives"], p2["objectives"]
-                                ),
-                            )
-                            for p2 in pop
-                        ],
-                        key=lambda x: x[1],
-                    ),
-                )
-            )
-
-        return self.get_min(distances, 0)[0]
+    def truncate(self, environment, distances):
+        """
+        Removes from the environment, one at a time, the individual whose distances to the others,
+        in increasing order, are the smallest, compared nearest first (see choose_to_truncate).
+
+        Every row of the distance matrix is sorted once, without the individual itself (a zero
+        leading every row, which does not change their order). The removed individuals are then
+        only masked out: each row keeps a pointer to its nearest neighbour left, moved past the
+        removed ones, so a removal costs O(n) besides the O(n^2) pointer moves of all of them.
+
+        :param environment: Individuals, in the order of their distance matrix.
+        :return: The archive_size individuals left, in their order.
+        """
+        size = len(environment)
+        distances = np.array(distances, dtype=float)
+        np.fill_diagonal(distances, np.inf)
+        # the individual itself is last in its row, so a pointer never moves past the row
+        neighbours = np.argsort(distances, axis=1)
+        sorted_distances = np.sort(distances, axis=1)
+        alive = np.ones(size, dtype=bool)
+        nearest = np.zeros(size, dtype=int)
+        rows = np.arange(size)
+        while len(rows) > self.__archive_size:
+            removed = self.choose_to_truncate(sorted_distances, neighbours, alive, nearest)
+            alive[removed] = False
+            rows = rows[rows != removed]
+            self._skip_removed(neighbours, alive, nearest, rows)
+        return [environment[i] for i in rows]
 
-    def get_min(self, distances, level):
-        if level >= len(distances):
-            return distances[0]
+    @staticmethod
+    def _skip_removed(neighbours, alive, positions, rows):
+        """ Moves the positions of the rows in their sorted rows to the next individual left. """
+        rows = rows[~alive[neighbours[rows, positions[rows]]]]
+        while len(rows):
+            positions[rows] += 1
+            rows = rows[~alive[neighbours[rows, positions[rows]]]]
 
-        sorted_distances = sorted(distances, key=lambda dist: dist[1][level][1])
-        result = [sorted_distances[0]]
-        for d in sorted_distances[1:]:
-            if d[1][level][1] == result[0][1][level][1]:
-                result.append(d)
-            else:
+    @staticmethod
+    def choose_to_truncate(sorted_distances, neighbours, alive, nearest) -> int:
+        """
+        :param sorted_distances: Distances from every individual to the others, sorted by row.
+        :param neighbours: Individuals of the sorted distances.
+        :param alive: Mask of the individuals left.
+        :param nearest: Position in every row of the nearest individual left.
+        :return: Index of the individual left with the lexicographically smallest row of distances
+            to the individuals left, the first one of equal rows.
+        """
+        candidates = np.flatnonzero(alive)
+        positions = np.zeros(len(alive), dtype=int)
+        positions[candidates] = nearest[candidates]
+        for level in range(len(candidates) - 1):
+            column = sorted_distances[candidates, positions[candidates]]
+            candidates = candidates[column == column.min()]
+            if len(candidates) == 1:
                 break
-
-        if len(result) > 1:
-            return self.get_min(result, level + 1)
-
-        return result[0]
+            positions[candidates] += 1
+            SPEA2._skip_removed(neighbours, alive, positions, candidates)
+        return int(candidates[0])
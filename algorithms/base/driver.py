@@ -1,11 +1,13 @@
 import threading
 import time
+from typing import List
 
 import rx
 from rx import Observable
 from rx import operators as ops
 from rx.core.typing import Observer
 
+from algorithms.base.evaluation import Evaluator
 from algorithms.base.model import (
     ProgressMessageAdapter,
     ProgressMessage,
@@ -13,6 +15,11 @@ from algorithms.base.model import (
 )
 
 
+def no_trim(xs):
+    """ Default trim_function of the drivers: a module-level function, so that drivers pickle. """
+    return xs
+
+
 class StepCountingDriver(type):
     def __init__(cls, name, bases, clsdict):
         step_function = "next_step"
@@ -27,12 +34,33 @@ class StepCountingDriver(type):
 
 
 class Driver(object, metaclass=StepCountingDriver):
-    def __init__(self, message_adapter_factory=ProgressMessageAdapter):
+    def __init__(
+        self,
+        message_adapter_factory=ProgressMessageAdapter,
+        evaluator: Evaluator = None,
+        evaluator_factory=Evaluator,
+    ):
         self.max_budget = None
         self.finished = False
         self.cost = 0
         self.step_no = 0
         self.message_adapter = message_adapter_factory(self)
+        self.evaluator = evaluator
+        self.evaluator_factory = evaluator_factory
+
+    def init_evaluator(self, fitnesses, fitness_archive=None):
+        """
+        Sets up the evaluator of the driver's fitnesses, caching them in the fitness archive,
+        unless one was given to the constructor: evaluator_factory(fitnesses, fitness_archive).
+        """
+        if self.evaluator is None:
+            self.evaluator = self.evaluator_factory(fitnesses, fitness_archive)
+
+    def evaluate(self, solutions) -> List[List[float]]:
+        """ Objectives of the solutions, their actual evaluations added to the cost. """
+        objectives, evaluations = self.evaluator.evaluate(solutions)
+        self.cost += evaluations
+        return objectives
 
     def shutdown(self):
         pass
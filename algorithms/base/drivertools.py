@@ -1,6 +1,7 @@
 import math
 import numpy
 import random
+from algorithms.base.evaluation import evaluate_one
 from evotools.ea_utils import paretofront_layers
 
 EPSILON = numpy.finfo(float).eps
@@ -160,6 +161,6 @@ def get_indivs_inorder(self, fitnesses, population):
     """ :return: Iterator: bieżąca populacja posortowana od najlepszych do najgorszych. """
 
     def calc_objective(ind):
-        return [f(ind) for f in fitnesses]
+        return evaluate_one(fitnesses, ind)
 
     return rank(population, calc_objective)
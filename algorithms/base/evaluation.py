@@ -0,0 +1,290 @@
+import functools
+import logging
+import math
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import util
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Fewer solutions are evaluated one by one: converting them to an array costs more than the calls.
+BATCH_MIN_SIZE = 8
+
+
+class ProblemFitnesses(list):
+    """
+    The fitnesses of a problem, along with its evaluation functions if it defines them:
+    evaluate, computing all the objectives of a solution at once, and evaluate_batch, a function
+    of an (n, d) array of solutions returning the (n, m) array of their objectives. Drivers use it
+    as any list of fitnesses; evaluate() and evaluate_one() use the evaluation functions.
+    """
+
+    def __init__(self, fitnesses, evaluate_batch=None, evaluate=None):
+        super().__init__(fitnesses)
+        self.evaluate_batch = evaluate_batch
+        self.evaluate = evaluate
+
+
+class SharedObjectives:
+    """
+    A problem's evaluate(x), with a memo of the last solutions evaluated, so that the single
+    objectives taken from it (see Objective) evaluate the problem once per solution and not once
+    per objective. Two solutions are kept, for the code comparing solutions objective by objective.
+    """
+
+    MEMO_SIZE = 2
+
+    def __init__(self, evaluate):
+        self.evaluate = evaluate
+        self._memo = ()
+
+    def __call__(self, x):
+        key = tuple(x)
+        # replaced, never modified: the memo may be shared by the threads of a driver
+        memo = self._memo
+        for memo_key, values in memo:
+            if memo_key == key:
+                return values
+        values = self.evaluate(x)
+        self._memo = ((key, values),) + memo[: self.MEMO_SIZE - 1]
+        return values
+
+
+class Objective:
+    """ One of the SharedObjectives, as a fitness. """
+
+    def __init__(self, objectives: SharedObjectives, index: int):
+        self.objectives = objectives
+        self.index = index
+
+    def __call__(self, x):
+        return self.objectives(x)[self.index]
+
+
+def problem_fitnesses(problem_mod):
+    """
+    The fitnesses of the problem module, with its evaluate_batch and evaluate if it has them. With
+    evaluate, the fitnesses are the Objectives of a single SharedObjectives.
+    """
+    evaluate_batch = getattr(problem_mod, "evaluate_batch", None)
+    evaluate_solution = getattr(problem_mod, "evaluate", None)
+    if evaluate_batch is None and evaluate_solution is None:
+        return problem_mod.fitnesses
+    fitnesses = problem_mod.fitnesses
+    if evaluate_solution is not None:
+        evaluate_solution = SharedObjectives(evaluate_solution)
+        fitnesses = [Objective(evaluate_solution, i) for i in range(len(fitnesses))]
+    return ProblemFitnesses(fitnesses, evaluate_batch, evaluate_solution)
+
+
+def evaluate_one(fitnesses, x) -> List[float]:
+    """ Objectives of the solution: one call of the fitnesses' evaluate, if they have one. """
+    evaluate_solution = getattr(fitnesses, "evaluate", None)
+    if evaluate_solution is None:
+        return [objective(x) for objective in fitnesses]
+    return list(evaluate_solution(x))
+
+
+def evaluate(fitnesses, solutions: Sequence) -> List[List[float]]:
+    """
+    Objectives of every solution: a single call of evaluate_batch if the fitnesses come with one
+    (see ProblemFitnesses) and there are at least BATCH_MIN_SIZE solutions, else evaluate_one for
+    every solution.
+    """
+    evaluate_batch = getattr(fitnesses, "evaluate_batch", None)
+    if evaluate_batch is None or len(solutions) < BATCH_MIN_SIZE:
+        return [evaluate_one(fitnesses, x) for x in solutions]
+    return evaluate_batch(np.asarray(solutions, dtype=float)).tolist()
+
+
+class Evaluator:
+    """
+    Evaluation of the objectives of a driver's solutions. Solutions found in the cache (any
+    mapping from solutions, as tuples, to objectives, e.g. the fitness archive of HGS) are taken
+    from it, the others are evaluated together (see evaluate) and added to it; a solution repeated
+    in a population is then evaluated only once. With an executor, the evaluation is split into
+    chunks of chunk_size solutions run on it.
+
+    evaluations counts the actual evaluations, which is the cost of the drivers.
+    """
+
+    def __init__(self, fitnesses, cache=None, executor=None, chunk_size=BATCH_MIN_SIZE):
+        self.fitnesses = fitnesses
+        self.cache = cache
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.evaluations = 0
+
+    def __getstate__(self):
+        # executors do not pickle: a restored driver evaluates in its process
+        state = self.__dict__.copy()
+        state["executor"] = None
+        return state
+
+    def evaluate(self, solutions: Sequence) -> Tuple[List[List[float]], int]:
+        """ :return: Objectives of every solution, and the number of actual evaluations. """
+        objectives = [None] * len(solutions)
+        pending, repeated = [], []
+        first_pending = set()
+        for i, x in enumerate(solutions):
+            if self.cache is None:
+                pending.append(i)
+                continue
+            key = tuple(x)
+            if key in self.cache:
+                objectives[i] = self.cache[key]
+            elif key in first_pending:
+                repeated.append(i)
+            else:
+                first_pending.add(key)
+                pending.append(i)
+
+        for i, values in zip(pending, self._evaluate([solutions[i] for i in pending])):
+            objectives[i] = values
+            if self.cache is not None:
+                self.cache[tuple(solutions[i])] = values
+        for i in repeated:
+            objectives[i] = self.cache[tuple(solutions[i])]
+
+        self.evaluations += len(pending)
+        return objectives, len(pending)
+
+    def _evaluate(self, solutions):
+        if self.executor is None or len(solutions) <= self.chunk_size:
+            return evaluate(self.fitnesses, solutions)
+        return self._map_chunks(self.executor, solutions, self.chunk_size)
+
+    def _map_chunks(self, executor, solutions, chunk_size):
+        chunks = [
+            solutions[i : i + chunk_size] for i in range(0, len(solutions), chunk_size)
+        ]
+        return [
+            values
+            for chunk_objectives in executor.map(
+                functools.partial(evaluate, self.fitnesses), chunks
+            )
+            for values in chunk_objectives
+        ]
+
+
+class ProcessPoolEvaluator(Evaluator):
+    """
+    Evaluator running the evaluations on the persistent process pool of evaluation_pool(), about
+    CHUNKS_PER_PROCESS chunks per process, for objectives expensive enough to pay for sending the
+    fitnesses, solutions and objectives between processes. The cache and the cost counting stay in
+    the driver's process.
+
+    Fitnesses which do not pickle (e.g. the closures of the HGS blurred fitnesses) are evaluated in
+    the driver's process, as are the solutions of a pool whose process died.
+    """
+
+    CHUNKS_PER_PROCESS = 4
+
+    def __init__(self, fitnesses, cache=None, processes: int = None):
+        super().__init__(fitnesses, cache)
+        self.processes = processes if processes else os.cpu_count()
+        self._picklable = None
+
+    def _evaluate(self, solutions):
+        if len(solutions) < 2 or self.processes < 2 or not self._fitnesses_picklable():
+            return evaluate(self.fitnesses, solutions)
+        executor = evaluation_pool(self.processes)
+        chunk_size = math.ceil(len(solutions) / (self.processes * self.CHUNKS_PER_PROCESS))
+        try:
+            return self._map_chunks(executor, solutions, chunk_size)
+        except BrokenProcessPool:
+            logger.warning("Evaluation pool broken, evaluating %d solutions", len(solutions))
+            _replace_broken_pool(self.processes, executor)
+            return evaluate(self.fitnesses, solutions)
+
+    def _fitnesses_picklable(self) -> bool:
+        if self._picklable is None:
+            try:
+                pickle.dumps(self.fitnesses)
+                self._picklable = True
+            except (pickle.PicklingError, AttributeError, TypeError):
+                logger.debug("Fitnesses do not pickle, evaluating in the driver's process")
+                self._picklable = False
+        return self._picklable
+
+
+_evaluation_pools = {}
+_evaluation_pools_lock = threading.Lock()
+
+
+def evaluation_pool(processes: int) -> ProcessPoolExecutor:
+    """
+    The process pool of the given size shared by the ProcessPoolEvaluators of this process, started
+    on first use and kept until exit, so that the processes are not restarted every generation.
+    Its processes are started by a fork server: a driver's process runs threads, and forking it
+    directly may leave a lock held by one of them locked forever in the child. Python 3.6 cannot
+    choose the start method of a ProcessPoolExecutor, the pool is then a _ForkServerPool.
+    """
+    with _evaluation_pools_lock:
+        if not _evaluation_pools:
+            # not atexit: the simulation workers are pool processes, which exit without running it
+            # and then wait for their children. Run before the finalizers of the pools' queues
+            # (priority 10), which would stop sending the shutdown to the processes.
+            util.Finalize(None, shutdown_evaluation_pools, exitpriority=20)
+        if processes not in _evaluation_pools:
+            if sys.version_info >= (3, 7):
+                _evaluation_pools[processes] = ProcessPoolExecutor(
+                    processes, mp_context=multiprocessing.get_context("forkserver")
+                )
+            else:
+                _evaluation_pools[processes] = _ForkServerPool(processes)
+        return _evaluation_pools[processes]
+
+
+class _ForkServerPool:
+    """
+    The part of ProcessPoolExecutor used by the evaluators, on a multiprocessing pool of processes
+    started by a fork server, for Python 3.6.
+    """
+
+    # How often (in seconds) a running map checks the processes of the pool.
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, processes: int):
+        self._pool = multiprocessing.get_context("forkserver").Pool(processes)
+
+    def map(self, fn, iterable):
+        # a multiprocessing pool replaces the processes which died, but never completes their
+        # tasks: a map fails as one of ProcessPoolExecutor would
+        workers = list(self._pool._pool)
+        result = self._pool.map_async(fn, iterable, chunksize=1)
+        while not result.ready():
+            result.wait(self.POLL_INTERVAL)
+            if any(worker.exitcode is not None for worker in workers):
+                raise BrokenProcessPool("A process of the evaluation pool died")
+        return result.get()
+
+    def shutdown(self, wait=True):
+        if wait:
+            self._pool.close()
+        else:
+            self._pool.terminate()
+        self._pool.join()
+
+
+def _replace_broken_pool(processes: int, broken_pool: ProcessPoolExecutor):
+    with _evaluation_pools_lock:
+        if _evaluation_pools.get(processes) is broken_pool:
+            del _evaluation_pools[processes]
+    broken_pool.shutdown(wait=False)
+
+
+def shutdown_evaluation_pools():
+    with _evaluation_pools_lock:
+        pools = list(_evaluation_pools.values())
+        _evaluation_pools.clear()
+    for pool in pools:
+        pool.shutdown()
@@ -15,9 +15,336 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 
+import bisect
+import collections
+
+import numpy as np
+from scipy.stats import norm
+
+from evotools.nd_sort import non_dominated_front
+
+try:
+    from scipy.stats import qmc
+except ImportError:
+    # scipy < 1.7: no Sobol points, estimation samples pseudo-random points by default
+    qmc = None
+
 __author__ = "Simon Wessing"
 
-# TODO Use global hv after evil branch merge!
+
+def hypervolume(front, reference_point) -> "Float":
+    """
+    Hypervolume dominated by `front` and bounded by `reference_point` (minimization).
+
+    Points which do not weakly dominate the reference point are ignored. Two and three
+    objectives are handled by O(n log n) sweeps, more objectives fall back to the recursive
+    `HyperVolume` algorithm.
+
+    :param front: Objective vectors, array-like of shape (n, m). Dominated points are allowed.
+    :param reference_point: Sequence of m values.
+    """
+    reference_point = np.asarray(reference_point, dtype=float)
+    points = _relevant_points(front, reference_point)
+    if len(points) == 0:
+        return 0.0
+    objectives_no = len(reference_point)
+    if objectives_no == 1:
+        return float(reference_point[0] - points[:, 0].min())
+    elif objectives_no == 2:
+        return _hv_2d(points, reference_point)
+    elif objectives_no == 3:
+        return _hv_3d(points, reference_point)
+    # the recursive algorithm may miscount duplicated points, feed it the distinct front only
+    points = np.unique(points, axis=0)
+    points = points[non_dominated_front(points)]
+    return HyperVolume(reference_point.tolist()).computeRecursive(points.tolist())
+
+
+def _relevant_points(front, reference_point) -> "np.ndarray":
+    points = np.asarray(
+        front if isinstance(front, np.ndarray) else list(front), dtype=float
+    ).reshape((-1, len(reference_point)))
+    return points[(points <= reference_point).all(axis=1)]
+
+
+def _hv_2d(points, reference_point) -> "Float":
+    """ Sort by the first objective and sum up the rectangles of the resulting staircase. """
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    f1, f2 = points[order, 0], points[order, 1]
+    previous_best = np.minimum.accumulate(np.concatenate(([reference_point[1]], f2[:-1])))
+    # keep only the steps of the staircase: vectors strictly better on f2 than all before
+    steps = f2 < previous_best
+    f1, f2 = f1[steps], f2[steps]
+    widths = np.diff(np.append(f1, reference_point[0]))
+    return float(np.dot(widths, reference_point[1] - f2))
+
+
+def _hv_3d(points, reference_point) -> "Float":
+    """
+    Sweep along the third objective, maintaining the 2-D staircase of points seen so far
+    (Beume et al. 2009). Every point is inserted once and removed at most once.
+    """
+    r1, r2, r3 = reference_point.tolist()
+    points = points[np.argsort(points[:, 2], kind="mergesort")].tolist()
+    # staircase sorted by f1 ascending, hence f2 descending
+    xs = []
+    ys = []
+    area = 0.0
+    volume = 0.0
+    for (x, y, z), next_point in zip(points, points[1:] + [[None, None, r3]]):
+        i = bisect.bisect_left(xs, x)
+        dominated = (i > 0 and ys[i - 1] <= y) or (i < len(xs) and xs[i] == x and ys[i] <= y)
+        if not dominated:
+            upper_y = ys[i - 1] if i > 0 else r2
+            j = i
+            left_x, left_y = x, upper_y
+            # points from the staircase weakly dominated by the new one
+            while j < len(xs) and ys[j] >= y:
+                area += (xs[j] - left_x) * (left_y - y)
+                left_x, left_y = xs[j], ys[j]
+                j += 1
+            right_x = xs[j] if j < len(xs) else r1
+            area += (right_x - left_x) * (left_y - y)
+            xs[i:j] = [x]
+            ys[i:j] = [y]
+        volume += area * (next_point[2] - z)
+    return volume
+
+
+def hypervolume_contributions(front, reference_point) -> "np.ndarray":
+    """
+    Exclusive hypervolume contribution of every point: the volume dominated only by that point.
+
+    For a mutually non-dominated front this equals `hypervolume(front) - hypervolume(front
+    without the point)`, but all the contributions are computed in a single pass: a sort and
+    neighbour lookup for two objectives and an incremental z-sweep for three. Dominated points
+    and points outside the reference box contribute nothing and are ignored when computing the
+    contributions of the others; copies of the same point contribute nothing either.
+
+    :param front: Objective vectors, array-like of shape (n, m).
+    :param reference_point: Sequence of m values.
+    :return: Array of n contributions.
+    """
+    reference_point = np.asarray(reference_point, dtype=float)
+    points = np.asarray(
+        front if isinstance(front, np.ndarray) else list(front), dtype=float
+    ).reshape((-1, len(reference_point)))
+    contributions = np.zeros(len(points))
+
+    relevant = np.flatnonzero((points <= reference_point).all(axis=1))
+    if len(relevant) == 0:
+        return contributions
+    unique, inverse, counts = np.unique(
+        points[relevant], axis=0, return_inverse=True, return_counts=True
+    )
+    inverse = inverse.reshape(-1)
+    candidates = np.asarray(non_dominated_front(unique), dtype=int)
+
+    objectives_no = len(reference_point)
+    if objectives_no == 2:
+        candidate_contributions = _contributions_2d(unique[candidates], reference_point)
+    elif objectives_no == 3:
+        candidate_contributions = _contributions_3d(unique[candidates], reference_point)
+    else:
+        candidate_contributions = _contributions_by_exclusion(
+            unique[candidates], reference_point
+        )
+
+    unique_contributions = np.zeros(len(unique))
+    unique_contributions[candidates] = candidate_contributions
+    unique_contributions[counts > 1] = 0.0
+    contributions[relevant] = unique_contributions[inverse]
+    return contributions
+
+
+def _contributions_2d(points, reference_point) -> "np.ndarray":
+    """ Contributions of mutually non-dominated, distinct 2-D points. """
+    order = np.argsort(points[:, 0])
+    f1, f2 = points[order, 0], points[order, 1]
+    right_f1 = np.append(f1[1:], reference_point[0])
+    upper_f2 = np.concatenate(([reference_point[1]], f2[:-1]))
+    contributions = np.empty(len(points))
+    contributions[order] = (right_f1 - f1) * (upper_f2 - f2)
+    return contributions
+
+
+def _contributions_3d(points, reference_point) -> "np.ndarray":
+    """
+    Contributions of mutually non-dominated, distinct 3-D points.
+
+    Sweeps along the third objective like `_hv_3d`. Every point of the 2-D staircase keeps its
+    exclusive area in the current slab: its staircase cell minus the points it pushed out of the
+    staircase when inserted (they are still dominating a part of the cell). The area only
+    changes for the inserted point and its two neighbours, so only those are updated.
+    """
+    r1, r2, r3 = reference_point.tolist()
+    order = np.argsort(points[:, 2], kind="mergesort").tolist()
+    coordinates = points.tolist()
+    contributions = [0.0] * len(points)
+    areas = [0.0] * len(points)
+    since = [0.0] * len(points)
+    shadows = [[] for _ in points]
+
+    # staircase sorted by f1 ascending, hence f2 descending, with indices of its points
+    xs = []
+    ys = []
+    ids = []
+
+    def settle(k, z):
+        contributions[k] += areas[k] * (z - since[k])
+        since[k] = z
+
+    def exclusive_area(position):
+        k = ids[position]
+        x, y = xs[position], ys[position]
+        right_x = xs[position + 1] if position + 1 < len(xs) else r1
+        upper_y = ys[position - 1] if position > 0 else r2
+        area = (right_x - x) * (upper_y - y)
+        # shadows form a staircase as well, subtract its part inside the cell
+        covered = [(sx, sy) for sx, sy in shadows[k] if sx < right_x and sy < upper_y]
+        for (sx, sy), (next_x, _) in zip(covered, covered[1:] + [(right_x, None)]):
+            area -= (next_x - sx) * (upper_y - sy)
+        return area
+
+    for p in order:
+        x, y, z = coordinates[p]
+        i = bisect.bisect_left(xs, x)
+        j = i
+        while j < len(xs) and ys[j] >= y:
+            settle(ids[j], z)
+            j += 1
+        shadows[p] = list(zip(xs[i:j], ys[i:j]))
+        xs[i:j] = [x]
+        ys[i:j] = [y]
+        ids[i:j] = [p]
+
+        since[p] = z
+        areas[p] = exclusive_area(i)
+        for neighbour in (i - 1, i + 1):
+            if 0 <= neighbour < len(ids):
+                settle(ids[neighbour], z)
+                areas[ids[neighbour]] = exclusive_area(neighbour)
+
+    for k in ids:
+        settle(k, r3)
+    return np.array(contributions)
+
+
+def _contributions_by_exclusion(points, reference_point) -> "np.ndarray":
+    """ Box of every point minus the hypervolume of the other points clipped to that box. """
+    contributions = np.empty(len(points))
+    for i, point in enumerate(points):
+        others = np.maximum(np.delete(points, i, axis=0), point)
+        contributions[i] = np.prod(reference_point - point) - hypervolume(
+            others, reference_point
+        )
+    return contributions
+
+
+HypervolumeEstimate = collections.namedtuple(
+    "HypervolumeEstimate", ["value", "lower", "upper", "samples"]
+)
+
+# Upper bound for the number of (point, sample) pairs compared at once by `estimate_hypervolume`.
+ESTIMATION_CHUNK_SIZE = 2 ** 22
+
+
+def estimate_hypervolume(
+    front,
+    reference_point,
+    samples=None,
+    relative_error=None,
+    confidence=0.95,
+    sampler=None,
+    seed=None,
+    max_samples=2 ** 22,
+) -> HypervolumeEstimate:
+    """
+    Monte Carlo estimate of `hypervolume`, for many objectives where the exact value is too
+    expensive. Samples are drawn from the box spanned by the ideal point of the front and the
+    reference point; the hypervolume is the box volume times the fraction of dominated samples.
+
+    :param front: Objective vectors, array-like of shape (n, m).
+    :param reference_point: Sequence of m values.
+    :param samples: Fixed sample budget. Defaults to 2 ** 16 when `relative_error` is not given.
+    :param relative_error: Keep sampling (in doubling batches, up to `max_samples`) until the
+        half-width of the confidence interval drops below `relative_error` * estimate.
+    :param confidence: Confidence level of the reported interval (normal approximation of the
+        binomial proportion, conservative for Sobol points).
+    :param sampler: "sobol" (scrambled quasi-random points, needs scipy.stats.qmc of scipy 1.7)
+        or "random" (pseudo-random points). Defaults to "sobol" when scipy.stats.qmc is available
+        and to "random" otherwise, as with the pinned scipy 1.0.
+    :param seed: Seed of the sampler.
+    :return: HypervolumeEstimate(value, lower, upper, samples).
+    """
+    reference_point = np.asarray(reference_point, dtype=float)
+    points = _relevant_points(front, reference_point)
+    if len(points) == 0:
+        return HypervolumeEstimate(0.0, 0.0, 0.0, 0)
+    points = np.unique(points, axis=0)
+    points = points[non_dominated_front(points)]
+
+    ideal = points.min(axis=0)
+    box_volume = float(np.prod(reference_point - ideal))
+    if box_volume == 0.0:
+        return HypervolumeEstimate(0.0, 0.0, 0.0, 0)
+
+    if samples is None and relative_error is None:
+        samples = 2 ** 16
+    budget = samples if samples is not None else max_samples
+    z = norm.ppf((1.0 + confidence) / 2.0)
+    draw = _sampler(sampler, len(reference_point), seed)
+
+    hits = 0
+    drawn = 0
+    while drawn < budget:
+        # doubling the total keeps Sobol sample counts at powers of two
+        batch = min(max(drawn, 2 ** 10), budget - drawn)
+        unit = draw(batch)
+        hits += _count_dominated(points, ideal + unit * (reference_point - ideal))
+        drawn += batch
+        if relative_error is not None and hits > 0:
+            ratio = hits / drawn
+            if z * np.sqrt(ratio * (1.0 - ratio) / drawn) <= relative_error * ratio:
+                break
+
+    ratio = hits / drawn
+    half_width = float(z * np.sqrt(ratio * (1.0 - ratio) / drawn))
+    return HypervolumeEstimate(
+        box_volume * ratio,
+        box_volume * max(0.0, ratio - half_width),
+        box_volume * min(1.0, ratio + half_width),
+        drawn,
+    )
+
+
+def _sampler(name, dimensions, seed):
+    if name is None:
+        name = "random" if qmc is None else "sobol"
+    if name == "sobol":
+        if qmc is None:
+            raise ValueError("Sobol sampling needs scipy.stats.qmc (scipy >= 1.7)")
+        engine = qmc.Sobol(d=dimensions, scramble=True, seed=seed)
+        return engine.random
+    elif name == "random":
+        rng = np.random.RandomState(seed)
+        return lambda n: rng.random_sample((n, dimensions))
+    raise ValueError("Unknown sampler: {}".format(name))
+
+
+def _count_dominated(points, samples) -> "Int":
+    chunk = max(1, ESTIMATION_CHUNK_SIZE // len(points))
+    dominated = 0
+    for start in range(0, len(samples), chunk):
+        block = samples[start : start + chunk]
+        # (points, samples) matrix, built one objective at a time
+        weakly = points[:, 0, None] <= block[None, :, 0]
+        for k in range(1, points.shape[1]):
+            weakly &= points[:, k, None] <= block[None, :, k]
+        dominated += int(weakly.any(axis=0).sum())
+    return dominated
+
+
 class HyperVolume:
     """
     Hypervolume computation based on variant 3 of the algorithm in the paper:
@@ -29,14 +356,36 @@ class HyperVolume:
 
     """
 
-    def __init__(self, referencePoint):
-        """Constructor."""
+    def __init__(self, referencePoint, estimation=None):
+        """Constructor.
+
+        'estimation' is an optional dict of `estimate_hypervolume` parameters
+        (e.g. {"relative_error": 0.01}); when given, `compute` returns the
+        estimated value instead of the exact one.
+
+        """
         self.referencePoint = referencePoint
+        self.estimation = estimation
         self.list = []
 
     def compute(self, front):
         """Returns the hypervolume that is dominated by a non-dominated front.
 
+        Delegates to `hypervolume`, which uses the sweep kernels for up to three
+        objectives and `computeRecursive` on the distinct front otherwise.
+
+        """
+        if self.estimation is not None:
+            return self.estimate(front, **self.estimation).value
+        return hypervolume(front, self.referencePoint)
+
+    def estimate(self, front, **kwargs):
+        """Returns a HypervolumeEstimate, see `estimate_hypervolume`."""
+        return estimate_hypervolume(front, self.referencePoint, **kwargs)
+
+    def computeRecursive(self, front):
+        """Returns the hypervolume that is dominated by a non-dominated front.
+
         Before the HV computation, front and reference point are translated, so
         that the reference point is [0, ..., 0].
 
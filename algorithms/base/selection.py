@@ -0,0 +1,78 @@
+import sys
+
+import numpy as np
+
+from evotools import ea_utils
+
+
+def ranks(objective_values) -> np.ndarray:
+    """
+    :param objective_values: Objectives of the individuals, array-like of shape (n, m).
+    :return: Number of the non-dominated front of every individual, the first front being 1.
+    """
+    objective_values = np.asarray(objective_values, dtype=float)
+    rank = np.zeros(len(objective_values), dtype=int)
+    for front_no, front in enumerate(
+        ea_utils.dominance_fronts(objective_values), start=1
+    ):
+        rank[front] = front_no
+    return rank
+
+
+def crowding_distances(objective_values, rank) -> np.ndarray:
+    """
+    Crowding distances of the individuals within their fronts, with one stable sort of the whole
+    population per objective: by rank, then by the objective, ties kept in the order of the
+    previous sort. The extreme of a front with the lowest value gets an infinite distance, the one
+    with the highest value twice the gap to its neighbour. Single individual fronts get 0.
+
+    :param objective_values: Objectives of the individuals, array of shape (n, m).
+    :param rank: Front numbers of the individuals (see ranks).
+    """
+    crowding = np.zeros(len(rank))
+    if not len(rank):
+        return crowding
+    order = np.argsort(rank, kind="mergesort")
+    for column in np.asarray(objective_values, dtype=float).T:
+        order = order[np.lexsort((column[order], rank[order]))]
+        sorted_rank, values = rank[order], column[order]
+        starts = np.r_[True, sorted_rank[1:] != sorted_rank[:-1]]
+        ends = np.r_[sorted_rank[1:] != sorted_rank[:-1], True]
+        front_ids = np.cumsum(starts) - 1
+        ranges = (
+            values[ends][front_ids] - values[starts][front_ids] + sys.float_info.epsilon
+        )
+
+        increments = np.zeros(len(order))
+        inner = ~starts & ~ends
+        increments[1:-1][inner[1:-1]] = (values[2:] - values[:-2])[inner[1:-1]]
+        last = ends & ~starts
+        increments[last] = 2 * (values[last] - values[np.roll(last, -1)])
+        crowding[order] += increments / ranges
+        crowding[order[starts & ~ends]] = float("inf")
+    return crowding
+
+
+def crowded_order(rank, crowding) -> np.ndarray:
+    """ Indices of the individuals from the best: by rank, then by decreasing crowding distance. """
+    return np.lexsort((-crowding, rank))
+
+
+def binary_tournament(rank, crowding, size, rng: np.random.RandomState, p=1.0) -> np.ndarray:
+    """
+    Winners of size tournaments between two random individuals: with probability p the better one
+    by the crowded comparison (lower rank, then larger crowding distance), else the worse one.
+
+    :return: Indices of the winners.
+    """
+    first = rng.randint(len(rank), size=size)
+    second = rng.randint(len(rank), size=size)
+    rank_1, rank_2 = rank[first], rank[second]
+    crowding_1, crowding_2 = crowding[first], crowding[second]
+    better = (rank_1 < rank_2) | ((rank_1 == rank_2) & (crowding_1 > crowding_2))
+    worse = (rank_1 > rank_2) | ((rank_1 == rank_2) & (crowding_1 < crowding_2))
+    return np.where(
+        rng.random_sample(size) < p,
+        np.where(better, first, second),
+        np.where(worse, first, second),
+    )
@@ -10,11 +10,13 @@ Usage:
   evogil.py rank
   evogil.py rank_details
   evogil.py table
-  evogil.py summary
+  evogil.py summary [options]
   evogil.py pictures [options]
   evogil.py pictures_summary [options]
   evogil.py best_fronts [options]
   evogil.py violin [options]
+  evogil.py import_metrics [--remove] [options]
+  evogil.py rebuild_manifest [options]
 
 Commands:
   run
@@ -24,7 +26,8 @@ Commands:
         time
             Run with timeout constraints. Params: timeout and/or step measured in seconds.
   summary
-    Returns number of results for each tuple: algorithm, problem, budget.
+    Returns number of results for each tuple: algorithm, problem, budget. Read from the results
+    directory's manifest (manifest.sqlite), which is rebuilt first if it is missing.
   stats
     Generates statistics from benchmarks' results.
   rank
@@ -33,6 +36,13 @@ Commands:
     Some pictures?
   violin
     Plots violin plots?
+  import_metrics
+    Moves metric values from the per-result metric pickles into the results directory's
+    metrics database (metrics.sqlite). With --remove the imported pickles are deleted. They are
+    also imported when metrics are first computed for a results directory without the database.
+  rebuild_manifest
+    Indexes all the results of the results directory in its manifest (manifest.sqlite), e.g. of
+    results stored before the manifest existed.
 
 Options:
   -a <algo_name>, --algo <algo_name>       
@@ -69,6 +79,9 @@ Options:
         [default: 1]
   --renice <increment>
         Renice workers. Works on UNIX & derivatives.
+  --resume
+        Only run the simulation cases (problem, algorithm, run) whose results are not all stored
+        in the results directory yet. Unfinished budget runs continue from their last checkpoint.
   -d <results_dir>, --dir <results_dir>
         Directory where simulation results will be stored. If not specified, serialization.RESULTS_DIR is set.
   -o <plots_dir>
@@ -87,12 +100,14 @@ from docopt import docopt
 import plots.best_fronts
 import plots.pictures
 import plots.violin
+import simulation.metrics_processor
 import simulation.run_parallel
 import statistic.ranking
 import statistic.stats
 import statistic.summary
 from plots import pictures
 from simulation import run_config, log_helper, factory, serialization
+from simulation.manifest import ResultsManifest
 from simulation.timing import system_time, log_time
 
 
@@ -106,6 +121,18 @@ def all_algos_problems(*args, **kwargs):
         print("   ", problem)
 
 
+def import_metrics(args):
+    imported = simulation.metrics_processor.import_metric_pickles(
+        args["--dir"], args["--remove"]
+    )
+    print("Imported {} metric values.".format(imported))
+
+
+def rebuild_manifest(args):
+    indexed = ResultsManifest(args["--dir"]).rebuild()
+    print("Indexed {} results.".format(indexed))
+
+
 def main_worker():
     logger = logging.getLogger(__name__)
     logger.debug("Starting the evogil. Parsing arguments.")
@@ -126,6 +153,8 @@ def main_worker():
         "violin": plots.violin.violin,
         "summary": statistic.summary.analyse_results,
         "list": all_algos_problems,
+        "import_metrics": import_metrics,
+        "rebuild_manifest": rebuild_manifest,
     }
     set_default_options(argv)
 
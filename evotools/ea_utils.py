@@ -1,7 +1,11 @@
 # coding=utf-8
 import logging
 import random
-import itertools
+
+import numpy as np
+
+# Upper bound (in bytes) for temporary arrays allocated by a single block of `domination_matrix`.
+DOMINATION_MEMORY_CAP = 64 * 2 ** 20
 
 
 def gen_population(count: "Int", dims: "Int") -> "[[Float]]":
@@ -36,6 +40,74 @@ def domination_cmp(xs, ys) -> "Int":
     return direction
 
 
+def domination_matrix(fitnesses, other=None, block_size=None) -> "np.ndarray":
+    """
+    Vectorized counterpart of `dominates` for whole sets of objective vectors.
+
+    :param fitnesses: Objective vectors A, array-like of shape (n, m).
+    :param other: Objective vectors B, array-like of shape (k, m). Defaults to `fitnesses`.
+    :param block_size: Number of rows of A compared at once. When omitted, it is derived from
+        DOMINATION_MEMORY_CAP, so large sets are processed in tiles instead of one (n, k) pass.
+    :return: Boolean (n, k) matrix M such that M[i, j] <=> A[i] dominates B[j].
+    """
+    fitnesses = _as_objectives_array(fitnesses)
+    other = fitnesses if other is None else _as_objectives_array(other)
+    n, k = len(fitnesses), len(other)
+    result = np.zeros((n, k), dtype=bool)
+    if n == 0 or k == 0:
+        return result
+
+    if block_size is None:
+        # two boolean accumulators and one comparison temporary per block
+        block_size = max(1, DOMINATION_MEMORY_CAP // (3 * k))
+
+    for start in range(0, n, block_size):
+        block = fitnesses[start : start + block_size]
+        weakly = np.ones((len(block), k), dtype=bool)
+        strictly = np.zeros((len(block), k), dtype=bool)
+        for a, b in zip(block.T, other.T):
+            weakly &= a[:, None] <= b[None, :]
+            strictly |= a[:, None] < b[None, :]
+        result[start : start + block_size] = weakly & strictly
+    return result
+
+
+def non_dominated_mask(fitnesses, block_size=None) -> "np.ndarray":
+    """
+    :param fitnesses: Objective vectors, array-like of shape (n, m).
+    :return: Boolean vector of length n, True for vectors not dominated by any other one.
+    """
+    return ~domination_matrix(fitnesses, block_size=block_size).any(axis=0)
+
+
+def dominance_fronts(fitnesses, block_size=None) -> "[[Int]]":
+    """
+    Non-dominated sorting on top of `domination_matrix`.
+
+    :param fitnesses: Objective vectors, array-like of shape (n, m).
+    :return: List of fronts [F1, F2, ...], each being a list of indices into `fitnesses`.
+    """
+    domination = domination_matrix(fitnesses, block_size=block_size)
+    dominators_count = domination.sum(axis=0)
+    fronts = []
+    current = np.flatnonzero(dominators_count == 0)
+    while current.size > 0:
+        fronts.append(current.tolist())
+        dominators_count -= domination[current].sum(axis=0)
+        dominators_count[current] = -1
+        current = np.flatnonzero(dominators_count == 0)
+    return fronts
+
+
+def _as_objectives_array(fitnesses) -> "np.ndarray":
+    fitnesses = np.asarray(
+        fitnesses if isinstance(fitnesses, np.ndarray) else list(fitnesses), dtype=float
+    )
+    if fitnesses.ndim == 1:
+        fitnesses = fitnesses.reshape((len(fitnesses), 0 if len(fitnesses) == 0 else -1))
+    return fitnesses
+
+
 def paretofront_layers(lst, fitfun_res) -> "[[Individual]]":
     """
     :param lst: Lista indywiduów.
@@ -43,44 +115,22 @@ def paretofront_layers(lst, fitfun_res) -> "[[Individual]]":
     :return: Lista list [A1, A2, ...] taka, że i<j gddy wszystkie elementy Ai dominują wszystkie z Aj.
     """
 
+    # nd_sort builds on domination_matrix defined in this module
+    from evotools import nd_sort
+
+    lst = list(lst)
     try:
-        lst_f_doms = [[indiv, fitfun_res(indiv), 0] for indiv in lst]
+        fits = [fitfun_res(indiv) for indiv in lst]
     except TypeError:
         # workaround:
         logger = logging.getLogger(__name__)
         logger.error(
             "Wow, this is a bug. Please pass a function, not a list!", stack_info=True
         )
-        lst_f_doms = [[indiv, [f(indiv) for f in fitfun_res], 0] for indiv in lst]
-
-    while len(lst_f_doms) > 0:
-        for i, j in itertools.permutations(lst_f_doms, 2):
-            if dominates(i[1], j[1]):
-                j[2] += 1
-        yield [ind for ind, f_ind, domtd in lst_f_doms if domtd == 0]
-        lst_f_doms = [[ind, f_ind, 0] for ind, f_ind, domtd in lst_f_doms if domtd > 0]
-
-        # No dobra, ten algo jest słaby: jego czas działania to O(k d n^2) dla k-ilości "warstw", n-ilości indywiduów.
-        # Da się lepiej, ale ten margines jest zbyt mały, by... AW FCUK IT!
-        #
-        # Dla d=1 (jednowymiarowego przypadku): po prostu minimum.
-        # Czas: O(n)
-        # Dla d=2:
-        # 1. A_1, ..., A_n posortuj w kolejności leksykograficznej (tj. [1,2] < [1,3] < [2,0] < [2,2] )
-        #   2. i=1
-        #   3. A_i należy do frontu Pareto
-        #   4. znajdź j>i takie, że A_j[2] < A_i[2] (tj. pierwszy następny, którego wartość na indeksie 2 jest lepsza)
-        #   5. jeśli j istnieje: i=j, GOTO 3
-        #   Czas: O(n log n)
-        # Dla d=3,4,5...
-        #   1. A_1, ..., A_n posortuj w kolejności leksykograficznej
-        #   2. Wybierz wszystkie wierzchołki, których pierwsza współrzędna jest najmniejsza
-        #   3. Rekurencyjnie wywołaj się dla tych wierzchołków (przypadek d-1)
-        #   4. Wynik dodaj do frontu pareto.
-        #   5. Dodaj informację o dominacji do d-wymiarowego drzewa przedziałowego   <-- koszt budowy drzewa: O(n (log n)^d)
-        #   6. Znajdź następny, niezdominowany wierzchołek (niezdominowane wierzchołki), GOTO 3
-        #   Czas: O(n (log n)^d) przy założeniu, że k <= (log n)^(d-1) o ile krok 5, tj. jest (d n / log n)
-        #     czyli DUŻO ale nie na tyle, by mi się chciało to pisać.
+        fits = [[f(indiv) for f in fitfun_res] for indiv in lst]
+
+    for front in nd_sort.iter_fronts(fits):
+        yield [lst[i] for i in front]
 
 
 def split_front(pareto_front, epsilon):
@@ -0,0 +1,179 @@
+# coding=utf-8
+"""
+Fast non-dominated sorting.
+
+Both `non_dominated_front` and `non_dominated_sort` start from a lexicographic sort of the objective
+vectors. After such a sort a vector can only be dominated by vectors placed before it, which is what
+all the algorithms below rely on:
+
+- 2 objectives: a single sweep, front of every vector is found by a binary search over the last
+  members of the fronts built so far -- O(n log n),
+- 3 and more objectives: Kung's divide-and-conquer for the first front and Efficient Non-dominated
+  Sort with binary search (ENS-BS, Zhang et al. 2015) for the whole ranking.
+"""
+import bisect
+
+import numpy as np
+
+from evotools.ea_utils import domination_matrix
+
+# below this size Kung's recursion falls back to a single domination matrix
+KUNG_LEAF_SIZE = 128
+
+
+def iter_fronts(fitnesses) -> "Iterator [Int]":
+    """
+    Lazy non-dominated sorting: the first front is computed on its own, the remaining ones only if the
+    consumer asks for the second front.
+
+    :param fitnesses: Objective vectors, array-like of shape (n, m).
+    :return: Generator of fronts [F1, F2, ...], each being a sorted list of indices into `fitnesses`.
+    """
+    fitnesses = _as_array(fitnesses)
+    if len(fitnesses) == 0:
+        return
+
+    first_front = non_dominated_front(fitnesses)
+    yield first_front
+
+    rest = np.ones(len(fitnesses), dtype=bool)
+    rest[first_front] = False
+    rest = np.flatnonzero(rest)
+    for front in non_dominated_sort(fitnesses[rest]):
+        yield rest[front].tolist()
+
+
+def non_dominated_front(fitnesses) -> "[Int]":
+    """
+    :param fitnesses: Objective vectors, array-like of shape (n, m).
+    :return: Sorted list of indices of the vectors not dominated by any other vector.
+    """
+    fitnesses = _as_array(fitnesses)
+    if len(fitnesses) == 0:
+        return []
+    order = _lexsort(fitnesses)
+    objectives_no = fitnesses.shape[1]
+    if objectives_no == 1:
+        front = order[fitnesses[order, 0] == fitnesses[order[0], 0]]
+    elif objectives_no == 2:
+        front = order[_sweep_2d(fitnesses[order])]
+    else:
+        front = order[_kung(fitnesses[order])]
+    return sorted(front.tolist())
+
+
+def non_dominated_sort(fitnesses) -> "[[Int]]":
+    """
+    :param fitnesses: Objective vectors, array-like of shape (n, m).
+    :return: List of fronts [F1, F2, ...], each being a sorted list of indices into `fitnesses`.
+    """
+    fitnesses = _as_array(fitnesses)
+    if len(fitnesses) == 0:
+        return []
+    order = _lexsort(fitnesses)
+    objectives_no = fitnesses.shape[1]
+    if objectives_no == 1:
+        _, ranks = np.unique(fitnesses[order, 0], return_inverse=True)
+    elif objectives_no == 2:
+        ranks = _ranks_2d(fitnesses[order])
+    else:
+        ranks = _ranks_ens_bs(fitnesses[order])
+
+    fronts = [[] for _ in range(max(ranks) + 1)]
+    for i, rank in zip(order.tolist(), ranks):
+        fronts[rank].append(i)
+    return [sorted(front) for front in fronts]
+
+
+def _as_array(fitnesses) -> "np.ndarray":
+    fitnesses = np.asarray(
+        fitnesses if isinstance(fitnesses, np.ndarray) else list(fitnesses), dtype=float
+    )
+    if fitnesses.ndim == 1:
+        fitnesses = fitnesses.reshape((len(fitnesses), 0 if len(fitnesses) == 0 else 1))
+    return fitnesses
+
+
+def _lexsort(fitnesses) -> "np.ndarray":
+    # np.lexsort uses the last key as the primary one
+    return np.lexsort(fitnesses.T[::-1])
+
+
+def _sweep_2d(sorted_fitnesses) -> "np.ndarray":
+    """ Boolean mask of the first front of lexicographically sorted 2-D vectors. """
+    f1, f2 = sorted_fitnesses[:, 0], sorted_fitnesses[:, 1]
+    best_f2 = np.minimum.accumulate(f2)
+    previous_best = np.concatenate(([np.inf], best_f2[:-1]))
+    # a vector survives if nothing before it is better on f2, or the only vectors as good on f2 are
+    # its exact copies (equal f1 as well)
+    first_with_best = np.searchsorted(-best_f2, -f2, side="left")
+    return (f2 < previous_best) | (
+        (f2 == previous_best) & (f1[np.minimum(first_with_best, len(f1) - 1)] == f1)
+    )
+
+
+def _ranks_2d(sorted_fitnesses) -> "[Int]":
+    """ Front numbers of lexicographically sorted 2-D vectors. """
+    ranks = []
+    # the last vectors of the fronts; their f2 values grow with the front number
+    last = []
+    last_f2 = []
+    for f1, f2 in sorted_fitnesses.tolist():
+        # fronts whose last vector is strictly better on f2 certainly dominate the current one
+        rank = bisect.bisect_left(last_f2, f2)
+        while rank < len(last) and last_f2[rank] == f2 and last[rank][0] < f1:
+            rank += 1
+        if rank == len(last):
+            last.append((f1, f2))
+            last_f2.append(f2)
+        else:
+            last[rank] = (f1, f2)
+            last_f2[rank] = f2
+        ranks.append(rank)
+    return ranks
+
+
+def _kung(sorted_fitnesses) -> "np.ndarray":
+    """ Indices of the first front of lexicographically sorted vectors (Kung et al. 1975). """
+    n = len(sorted_fitnesses)
+    if n <= KUNG_LEAF_SIZE:
+        return np.flatnonzero(~domination_matrix(sorted_fitnesses).any(axis=0))
+    half = n // 2
+    top = _kung(sorted_fitnesses[:half])
+    bottom = _kung(sorted_fitnesses[half:]) + half
+    # vectors from the bottom half can not dominate the ones from the top half
+    dominated = domination_matrix(sorted_fitnesses[top], sorted_fitnesses[bottom]).any(
+        axis=0
+    )
+    return np.concatenate((top, bottom[~dominated]))
+
+
+def _ranks_ens_bs(sorted_fitnesses) -> "[Int]":
+    """ Front numbers of lexicographically sorted vectors, ENS with binary search over fronts. """
+    n, objectives_no = sorted_fitnesses.shape
+    # members of every front are kept in a growing buffer, so that the domination check against
+    # a whole front stays a single vectorized comparison
+    fronts = []
+    sizes = []
+    ranks = []
+    for vector in sorted_fitnesses:
+        low, high = 0, len(fronts)
+        while low < high:
+            middle = (low + high) // 2
+            if _dominated_by_front(vector, fronts[middle][: sizes[middle]]):
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(fronts):
+            fronts.append(np.empty((4, objectives_no)))
+            sizes.append(0)
+        elif sizes[low] == len(fronts[low]):
+            fronts[low] = np.concatenate((fronts[low], np.empty_like(fronts[low])))
+        fronts[low][sizes[low]] = vector
+        sizes[low] += 1
+        ranks.append(low)
+    return ranks
+
+
+def _dominated_by_front(vector, front) -> "Bool":
+    return bool(((front <= vector).all(axis=1) & (front < vector).any(axis=1)).any())
@@ -2,6 +2,8 @@ from contextlib import suppress, contextmanager
 import copy
 import random
 
+import numpy as np
+
 
 def weighted_choice(choices):
     # http://stackoverflow.com/a/3679747/547223
@@ -49,3 +51,11 @@ def close_and_join(x):
     finally:
         x.close()
         x.join()
+
+
+def numpy_generator():
+    """
+    A NumPy random state seeded from `random`, so that it follows the seed of the simulation
+    (see simulation.worker) instead of the global NumPy state shared by forked workers.
+    """
+    return np.random.RandomState(random.getrandbits(32))
@@ -1,32 +1,51 @@
 import multiprocessing
 import os
+import threading
 import time
 from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Callable
 
 import rx
 from rx.scheduler import NewThreadScheduler
 
 default_process_executor = ProcessPoolExecutor()
+_default_processes_no = None
+_default_executor_lock = threading.Lock()
 
 
 def configure_default_executor(number_of_processes: int):
-    global default_process_executor
+    global default_process_executor, _default_processes_no
     default_process_executor = ProcessPoolExecutor(number_of_processes)
+    _default_processes_no = number_of_processes
 
 
 def shutdown_default_executor():
     default_process_executor.shutdown()
 
 
+def _replace_broken_default_executor(broken_executor: ProcessPoolExecutor):
+    # a worker process which died (segfault, OOM kill) breaks the whole pool; the jobs submitted
+    # later get a fresh one
+    global default_process_executor
+    with _default_executor_lock:
+        if default_process_executor is broken_executor:
+            broken_executor.shutdown(wait=False)
+            default_process_executor = ProcessPoolExecutor(_default_processes_no)
+
+
 def from_process(
     worker: Callable, *args, executor: ProcessPoolExecutor = None, **kwargs
 ):
-    executor = executor if executor else default_process_executor
-
     def run_as_process():
-        future = executor.submit(worker, *args, **kwargs)
-        return future.result()
+        # the default executor is looked up on subscription, so it may have been replaced
+        pool = executor if executor else default_process_executor
+        try:
+            return pool.submit(worker, *args, **kwargs).result()
+        except BrokenProcessPool:
+            if not executor:
+                _replace_broken_default_executor(pool)
+            raise
 
     return rx.from_callable(run_as_process, NewThreadScheduler())
 
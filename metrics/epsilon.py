@@ -1,42 +1,56 @@
+import numpy as np
+
+# Upper bound (in bytes) for the (solution, pareto, objectives) block compared at once.
+EPSILON_MEMORY_CAP = 64 * 2 ** 20
+
+
+def epsilon(solution, pareto, kind="additive", return_index=False):
+    """
+    Epsilon indicator: max over solution points of min over pareto points of max over objectives
+    of `pareto[j][k] - solution[i][k]` (additive) or `pareto[j][k] / solution[i][k]`
+    (multiplicative).
+
+    :param solution: Objective vectors of the evaluated solution, array-like of shape (n, m).
+    :param pareto: Reference front, array-like of shape (p, m).
+    :param kind: "additive" or "multiplicative".
+    :param return_index: If True, also return (i, j): the solution point and the reference point
+        which set the value.
+    """
+    if kind not in ("additive", "multiplicative"):
+        raise ValueError("Unknown epsilon kind: {}".format(kind))
+    solution = np.asarray(solution, dtype=float)
+    pareto = np.asarray(pareto, dtype=float)
+    if len(solution) == 0:
+        return (float("-inf"), None) if return_index else float("-inf")
+
+    solution = solution.reshape((len(solution), -1))
+    pareto = pareto.reshape((len(pareto), -1))
+    block_size = max(1, EPSILON_MEMORY_CAP // (8 * pareto.size))
+
+    # for every solution point: the best (smallest) over pareto of the worst objective gap
+    best = np.empty(len(solution))
+    best_pareto = np.empty(len(solution), dtype=int)
+    for start in range(0, len(solution), block_size):
+        block = solution[start : start + block_size, None, :]
+        if kind == "additive":
+            gaps = pareto[None, :, :] - block
+        else:
+            gaps = pareto[None, :, :] / block
+        worst_gaps = gaps.max(axis=2)
+        best_pareto[start : start + len(block)] = worst_gaps.argmin(axis=1)
+        best[start : start + len(block)] = worst_gaps.min(axis=1)
+
+    i = int(best.argmax())
+    if return_index:
+        return float(best[i]), (i, int(best_pareto[i]))
+    return float(best[i])
+
+
 class Epsilon:
-    def __init__(self):
-        self._dim = 0
-        self._obj = []
+    """ Additive epsilon indicator, kept for the callers of the former stateful implementation. """
 
     def epsilon(self, solution, pareto):
-        eps_j = 0.0
-        eps_k = 0.0
-
-        self._dim = len(pareto[0])
-        self.set_params()
-
-        eps = float("-inf")
-
-        for i in range(len(solution)):
-            for j in range(len(pareto)):
-                for k in range(self._dim):
-                    if self._obj[k] == 0:
-                        eps_temp = pareto[j][k] - solution[i][k]
-                    else:
-                        eps_temp = solution[i][k] - pareto[j][k]
-
-                    if k == 0:
-                        eps_k = eps_temp
-                    elif eps_k < eps_temp:
-                        eps_k = eps_temp
-                if j == 0:
-                    eps_j = eps_k
-                elif eps_j > eps_k:
-                    eps_j = eps_k
-            if i == 0:
-                eps = eps_j
-            elif eps < eps_j:
-                eps = eps_j
-
-        return eps
-
-    def set_params(self):
-        self._obj = [0 for _ in range(self._dim)]
+        return epsilon(solution, pareto)
 
 
 if __name__ == "__main__":
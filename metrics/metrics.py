@@ -2,8 +2,6 @@ import algorithms.base.hv as hv
 import metrics.epsilon as eps
 import metrics.metrics_utils as metrics_utils
 
-EPSILON = eps.Epsilon()
-
 
 # do wyfiltrowania niezdominowanej czesci populacji
 def filter_not_dominated(solution):
@@ -26,15 +24,14 @@ def inverse_generational_distance(solution, not_dominated_solution, pareto):
 
 # im mniejszy tym lepszy, gorsza z wartosci : GD, IGD dla danego rozwiazania
 def average_hausdorff_distance(solution, not_dominated_solution, pareto):
-    return max(
-        generational_distance(solution, not_dominated_solution, pareto),
-        inverse_generational_distance(solution, not_dominated_solution, pareto),
+    return metrics_utils.average_hausdorff_distance(
+        solution, not_dominated_solution, pareto
     )
 
 
 # im wiekszy tym lepszy, smieszna forma odleglosci, ostra zbieznosc
-def epsilon(solution, not_dominated_solution, pareto):
-    return EPSILON.epsilon(not_dominated_solution, pareto)
+def epsilon(solution, not_dominated_solution, pareto, kind="additive"):
+    return eps.epsilon(not_dominated_solution, pareto, kind=kind)
 
 
 # im wiekszy tym lepszy, jak szeroka przestrzen pokryta, zakres dostarczanych opcji
@@ -53,11 +50,11 @@ def non_domination_ratio(solution, not_dominated_solution, pareto):
 
 
 # im wiekszy tym lepszy, jak duzy hipervolume zdominowany, zbieznosc i pokrycie
-def hypervolume(solution, not_dominated_solution, pareto):
+def hypervolume(solution, not_dominated_solution, pareto, estimation=None):
     dims = len(pareto[0])
     reference_point = [50.0 for _ in range(dims)]
     # TODO kij wie jaki powinien byc -.-
-    hv_instance = hv.HyperVolume(reference_point)
+    hv_instance = hv.HyperVolume(reference_point, estimation)
     return hv_instance.compute(not_dominated_solution)
 
 
@@ -1,20 +1,30 @@
+import collections
+import hashlib
 import logging
 import math
 
 import numpy as np
+from scipy.spatial import cKDTree
 
-from evotools.ea_utils import dominates
+from evotools.ea_utils import dominates, non_dominated_mask
 
 EPSILON = np.finfo(float).eps
 
+# How many KD-trees (one per point set, e.g. per known Pareto front) and directional distances
+# are kept between metric calls.
+KD_TREE_CACHE_SIZE = 16
+DISTANCE_CACHE_SIZE = 64
+
+_kd_trees = collections.OrderedDict()
+_distances = collections.OrderedDict()
+
 
 def distance_from_pareto(solution, pareto):
     logger = logging.getLogger(__name__)
     solution = list(solution)
     logger.debug("distance_from_pareto: input length %d", len(solution))
-    return sum([min([euclid_distance(x, y) for y in pareto]) for x in solution]) / len(
-        solution
-    )
+    distances, _ = kd_tree(pareto).query(_as_points(solution))
+    return float(np.sum(distances)) / len(solution)
 
 
 def distribution(solution, sigma=0.5):
@@ -37,12 +47,9 @@ def distribution(solution, sigma=0.5):
 def extent(solution):
     logger = logging.getLogger(__name__)
     logger.debug("extent: input length %d", len(solution))
-    return math.sqrt(
-        sum(
-            max(math.fabs(x[i] - y[i]) for x in solution for y in solution)
-            for i in range(len(solution[0]))
-        )
-    )
+    # the widest pair on every objective is simply its maximum and minimum
+    points = _as_points(solution)
+    return math.sqrt(sum((points.max(axis=0) - points.min(axis=0)).tolist()))
 
 
 def euclid_distance(xs, ys):
@@ -61,22 +68,27 @@ def inverse_generational_distance(solution, pareto):
     return distance(pareto, solution)
 
 
+def average_hausdorff_distance(solution, not_dominated_solution, pareto):
+    # both directions come from the distance cache if GD / IGD were already computed
+    return max(
+        generational_distance(not_dominated_solution, pareto),
+        inverse_generational_distance(solution, pareto),
+    )
+
+
 def non_domination_ratio(solution, not_dominated_solution):
     return float(len(not_dominated_solution)) / float(len(solution))
 
 
 def spacing(solution):
-    dims = len(solution[0])
-
-    min_distances = []
-    for i, ind_a in enumerate(solution):
-        distances = []
-        for j, ind_b in enumerate(solution):
-            if not i == j:
-                dist = sum([math.fabs(ind_a[k] - ind_b[k]) for k in range(dims)])
-                distances.append(dist)
-        if len(distances) > 0:
-            min_distances.append(min(distances))
+    points = _as_points(solution)
+
+    if len(points) > 1:
+        # the nearest neighbour of a point other than itself (Manhattan distance)
+        distances, _ = cKDTree(points).query(points, k=2, p=1)
+        min_distances = distances[:, 1].tolist()
+    else:
+        min_distances = []
 
     if len(min_distances) > 0:
         mean_dist = np.mean(min_distances)
@@ -87,8 +99,51 @@ def spacing(solution):
 
 
 def distance(from_set, to_set):
-    distances = [min([euclid_sqr_distance(f, t) for t in to_set]) for f in from_set]
-    return math.sqrt(sum(distances) / len(distances))
+    """
+    Root of the mean squared distance from every point of `from_set` to the nearest point of
+    `to_set`. The KD-tree of `to_set` and the result are cached, so GD, IGD and AHD computed for
+    the same result share the work.
+    """
+    from_points = _as_points(from_set)
+    to_points = _as_points(to_set)
+    key = (_digest(from_points), _digest(to_points))
+    if key in _distances:
+        _distances.move_to_end(key)
+        return _distances[key]
+
+    distances, _ = kd_tree(to_points).query(from_points)
+    result = math.sqrt(float(np.sum(distances ** 2)) / len(from_points))
+
+    _distances[key] = result
+    if len(_distances) > DISTANCE_CACHE_SIZE:
+        _distances.popitem(last=False)
+    return result
+
+
+def kd_tree(points) -> "cKDTree":
+    """ KD-tree over `points`, reused for the same (by value) point set. """
+    points = _as_points(points)
+    key = _digest(points)
+    if key in _kd_trees:
+        _kd_trees.move_to_end(key)
+        return _kd_trees[key]
+
+    tree = cKDTree(points)
+    _kd_trees[key] = tree
+    if len(_kd_trees) > KD_TREE_CACHE_SIZE:
+        _kd_trees.popitem(last=False)
+    return tree
+
+
+def _as_points(points) -> "np.ndarray":
+    points = np.asarray(
+        points if isinstance(points, np.ndarray) else list(points), dtype=float
+    )
+    return points.reshape((len(points), -1)) if len(points) else points.reshape((0, 0))
+
+
+def _digest(points) -> "(Tuple, Bytes)":
+    return points.shape, hashlib.sha1(np.ascontiguousarray(points).tobytes()).digest()
 
 
 def pareto_dominance_indicator(solution, not_dominated_solution, all_solutions):
@@ -112,16 +167,9 @@ def filter_not_dominated2(ind_set):
 
 
 def filter_not_dominated(ind_set):
-    not_dominated = []
-    for ind in ind_set:
-        dominated_by_sth = False
-        new_not_dominated = []
-        for nd_ind in not_dominated:
-            if not dominates(ind, nd_ind):
-                new_not_dominated.append(nd_ind)
-            if dominates(nd_ind, ind):
-                dominated_by_sth = True
-        if not dominated_by_sth:
-            new_not_dominated.append(ind)
-        not_dominated = new_not_dominated
-    return not_dominated
+    ind_set = list(ind_set)
+    return [
+        ind
+        for ind, not_dominated in zip(ind_set, non_dominated_mask(ind_set))
+        if not_dominated
+    ]
@@ -491,7 +491,7 @@ def pictures_from_stats(args):
             for algo_name, budgets in algorithms:
                 for result in budgets:
                     _, _, cost_data = next(result["analysis"])
-                    cost_data = list(x() for x in cost_data)
+                    cost_data = list(cost_data)
                     cost_analysis = yield_analysis(cost_data, boot_size)
 
                     budget = cost_analysis["btstrpd"]["metrics"]
@@ -503,7 +503,7 @@ def pictures_from_stats(args):
                         if metric_name in best_func:
                             if metric_name == "dst from pareto":
                                 metric_name = "dst"
-                            data_process = list(x() for x in data_process)
+                            data_process = list(data_process)
 
                             data_analysis = yield_analysis(data_process, boot_size)
 
@@ -545,7 +545,7 @@ def pictures_time(args):
                         if metric_name in best_func:
                             if metric_name == "dst from pareto":
                                 metric_name = "dst"
-                            data_process = list(x() for x in data_process)
+                            data_process = list(data_process)
 
                             data_analysis = yield_analysis(data_process, boot_size)
 
@@ -643,7 +643,7 @@ def pictures_summary(args):
                         "analysis"
                     ]:
                         if metric_name in ranking.best_func:
-                            data_process = list(x() for x in data_process)
+                            data_process = list(data_process)
                             data_analysis = yield_analysis(data_process, boot_size)
 
                             score = math.log(
@@ -45,7 +45,7 @@ def violin(args):
                     "analysis"
                 ]:
                     if metric_name in best_func:
-                        data_process = list(x() for x in data_process)
+                        data_process = list(data_process)
                         global_data[(problem_name, metric_name)][
                             algo_name
                         ] = data_process
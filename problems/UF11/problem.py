@@ -27,6 +27,7 @@ with m5_dat.open("r") as f:
     pf_lines = f.readlines()
 
 lambdas = [float(x) for x in lambda_lines[0].split()]
+lambdas_array = np.array(lambdas)
 M = np.array([[float(x) for x in line.split()] for line in M_lines])
 
 pareto_front = [[float(x) for x in line.split()] for line in pf_lines]
@@ -101,6 +102,31 @@ def gen_fit(m):
     return lambda x: base_fit(x, m)
 
 
+def evaluate(x):
+    """ All the objectives of a solution, rotating it once. """
+    Z = z(x)
+    z_b = z_bis(Z)
+    base_fit_m = base_fit_up if all_non_negative(Z) else base_fit_bottom
+    return [base_fit_m(z_b, m) for m in range(1, f_dims + 1)]
+
+
+def evaluate_batch(xs):
+    """ Objectives of the rows of an array of solutions, vectorized (see fitnesses). """
+    Z = xs @ M.T
+    z_b = np.where(Z < 0, -lambdas_array * Z, np.where(Z > 1, lambdas_array * Z, Z))
+    g_b = ((z_b - 0.5) ** 2).sum(axis=1)
+    p_b = np.where(z_b < 0, -z_b, np.where(z_b > 1, z_b - 1, 0))
+    all_non_negative_b = (Z >= 0).all(axis=1)
+    objectives = []
+    for m in range(1, f_dims + 1):
+        up = (1 + g_b) * np.cos((z_b[:, : m - 1] * math.pi) / 2.0).prod(axis=1) * (
+            np.sin(z_b[:, m - 1]) if m < f_dims else 1
+        ) + 1
+        s = 2 / (1 + np.exp(-np.sqrt((p_b[:, : m - 1] ** 2).sum(axis=1))))
+        objectives.append(np.where(all_non_negative_b, up, s * up))
+    return np.column_stack(objectives)
+
+
 fitnesses = [gen_fit(m) for m in range(1, f_dims + 1)]
 
 dims = [
@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 n = 30
 p_no = 150
 emoa_points = [i / (p_no - 1) for i in range(p_no)]
@@ -40,6 +42,26 @@ def fit_2(x):
     return 1 - math.sqrt(x[0]) + base_fit(x, J2, math.sin)
 
 
+def batch_base_fit(xs, J, trig):
+    j = np.array(J)
+    x0 = xs[:, [0]]
+    y = xs[:, j - 1] - (
+        0.3 * x0 ** 2 * np.cos(24 * math.pi * x0 + 4 * j * math.pi / n) + 0.6 * x0
+    ) * trig(6 * math.pi * x0 + j * math.pi / n)
+    return 2 / len(J) * (y ** 2).sum(axis=1)
+
+
+def evaluate_batch(xs):
+    """ Objectives of the rows of an array of solutions, vectorized (see fitnesses). """
+    x0 = xs[:, 0]
+    return np.column_stack(
+        [
+            x0 + batch_base_fit(xs, J1, np.cos),
+            1 - np.sqrt(x0) + batch_base_fit(xs, J2, np.sin),
+        ]
+    )
+
+
 name = "UF2"
 fitnesses = [fit_1, fit_2]
 dims = [(0, 1)] + [(-1, 1)] * (n - 1)
@@ -2,6 +2,8 @@ import functools
 import math
 import operator
 
+import numpy as np
+
 n = 30
 p_no = 150
 emoa_points = [i / (p_no - 1) for i in range(p_no)]
@@ -45,6 +47,28 @@ def fit_2(x):
     return 1 - math.sqrt(x[0]) + base_fit(x, J2)
 
 
+def batch_base_fit(xs, J):
+    j = np.array(J)
+    Y = xs[:, j - 1] - xs[:, [0]] ** (0.5 * (1.0 + (3 * (j - 2)) / (n - 2)))
+    return (
+        2
+        * (
+            4 * (Y ** 2).sum(axis=1)
+            - 2 * np.cos((20 * Y * math.pi) / np.sqrt(j)).prod(axis=1)
+            + 2
+        )
+        / len(J)
+    )
+
+
+def evaluate_batch(xs):
+    """ Objectives of the rows of an array of solutions, vectorized (see fitnesses). """
+    x0 = xs[:, 0]
+    return np.column_stack(
+        [x0 + batch_base_fit(xs, J1), 1 - np.sqrt(x0) + batch_base_fit(xs, J2)]
+    )
+
+
 name = "UF3"
 fitnesses = [fit_1, fit_2]
 dims = [(0, 1)] * n
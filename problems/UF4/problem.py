@@ -2,6 +2,8 @@ import functools
 import math
 import operator
 
+import numpy as np
+
 n = 30
 p_no = 150
 emoa_points = [i / (p_no - 1) for i in range(p_no)]
@@ -33,6 +35,20 @@ def fit_2(x):
     return 1 - x[0] ** 2 + base_fit(x, J2)
 
 
+def batch_base_fit(xs, J):
+    j = np.array(J)
+    t = np.abs(xs[:, j - 1] - np.sin(6 * math.pi * xs[:, [0]] + (j * math.pi) / n))
+    return (2 * (t / (1 + np.exp(2 * t))).sum(axis=1)) / len(J)
+
+
+def evaluate_batch(xs):
+    """ Objectives of the rows of an array of solutions, vectorized (see fitnesses). """
+    x0 = xs[:, 0]
+    return np.column_stack(
+        [x0 + batch_base_fit(xs, J1), 1 - x0 ** 2 + batch_base_fit(xs, J2)]
+    )
+
+
 name = "UF4"
 fitnesses = [fit_1, fit_2]
 dims = [(0, 1)] + [(-2, 2)] * (n - 1)
@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 n = 10
 eps = 0.1
 
@@ -32,6 +34,22 @@ def fit_2(x):
     return 1 - x[0] + base_fit(x, J2)
 
 
+def batch_base_fit(xs, J):
+    j = np.array(J)
+    t = xs[:, j - 1] - np.sin(6 * math.pi * xs[:, [0]] + (j * math.pi) / n)
+    return (1 / (2 * n) + eps) * np.abs(np.sin(2 * n * math.pi * xs[:, 0])) + (
+        2 * (2 * t ** 2 - np.cos(4 * math.pi * t) + 1).sum(axis=1)
+    ) / len(J)
+
+
+def evaluate_batch(xs):
+    """ Objectives of the rows of an array of solutions, vectorized (see fitnesses). """
+    x0 = xs[:, 0]
+    return np.column_stack(
+        [x0 + batch_base_fit(xs, J1), 1 - x0 + batch_base_fit(xs, J2)]
+    )
+
+
 name = "UF5"
 fitnesses = [fit_1, fit_2]
 dims = [(0, 1)] + [(-1, 1)] * (n - 1)
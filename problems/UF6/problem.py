@@ -57,6 +57,34 @@ def fit_2(x):
     return 1 - x[0] + base_fit(x, J2)
 
 
+def batch_base_fit(xs, J):
+    j = numpy.array(J)
+    Y = xs[:, j - 1] - numpy.sin(6 * math.pi * xs[:, [0]] + (j * math.pi) / n)
+    inner = (
+        2
+        * (
+            4 * (Y ** 2).sum(axis=1)
+            - 2 * numpy.cos((20 * Y * math.pi) / numpy.sqrt(j)).prod(axis=1)
+            + 2
+        )
+        / len(J)
+    )
+    return (
+        numpy.maximum(
+            0, 2 * (1 / (2 * n) + eps) * numpy.sin(2 * n * math.pi * xs[:, 0])
+        )
+        + inner
+    )
+
+
+def evaluate_batch(xs):
+    """ Objectives of the rows of an array of solutions, vectorized (see fitnesses). """
+    x0 = xs[:, 0]
+    return numpy.column_stack(
+        [x0 + batch_base_fit(xs, J1), 1 - x0 + batch_base_fit(xs, J2)]
+    )
+
+
 name = "UF6"
 fitnesses = [fit_1, fit_2]
 dims = [(0, 1)] + [(-1, 1)] * (n - 1)
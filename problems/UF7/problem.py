@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 n = 30
 p_no = 150
 emoa_points = [i / (p_no - 1) for i in range(p_no)]
@@ -27,6 +29,20 @@ def fit_2(x):
     return 1 - math.pow(x[0], 0.2) + base_fit(x, J2)
 
 
+def batch_base_fit(xs, J):
+    j = np.array(J)
+    Y = xs[:, j - 1] - np.sin(6 * math.pi * xs[:, [0]] + (j * math.pi) / n)
+    return (2 * (Y ** 2).sum(axis=1)) / len(J)
+
+
+def evaluate_batch(xs):
+    """ Objectives of the rows of an array of solutions, vectorized (see fitnesses). """
+    x0_pow = xs[:, 0] ** 0.2
+    return np.column_stack(
+        [x0_pow + batch_base_fit(xs, J1), 1 - x0_pow + batch_base_fit(xs, J2)]
+    )
+
+
 name = "UF7"
 fitnesses = [fit_1, fit_2]
 dims = [(0, 1)] + [(-1, 1)] * (n - 1)
@@ -1,6 +1,8 @@
 import math
 import itertools
 
+import numpy as np
+
 n = 30
 p_no = 150
 
@@ -47,6 +49,26 @@ def fit_3(x):
     return math.sin(0.5 * x[0] * math.pi) + base_fit(x, J3)
 
 
+def batch_base_fit(xs, J):
+    j = np.array(J)
+    Y = xs[:, j - 1] - 2 * xs[:, [1]] * np.sin(
+        2 * math.pi * xs[:, [0]] + (j * math.pi) / n
+    )
+    return (2 * (Y ** 2).sum(axis=1)) / len(J)
+
+
+def evaluate_batch(xs):
+    """ Objectives of the rows of an array of solutions, vectorized (see fitnesses). """
+    a, b = 0.5 * xs[:, 0] * math.pi, 0.5 * xs[:, 1] * math.pi
+    return np.column_stack(
+        [
+            np.cos(a) * np.cos(b) + batch_base_fit(xs, J1),
+            np.cos(a) * np.sin(b) + batch_base_fit(xs, J2),
+            np.sin(a) + batch_base_fit(xs, J3),
+        ]
+    )
+
+
 name = "UF8"
 fitnesses = [fit_1, fit_2, fit_3]
 dims = [(0, 1)] * 2 + [(-2, 2)] * (n - 2)
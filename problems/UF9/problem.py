@@ -1,6 +1,8 @@
 import math
 import itertools
 
+import numpy as np
+
 n = 30
 eps = 0.1
 p_no = 150
@@ -47,6 +49,27 @@ def fit_3(x):
     return 1 - x[1] + base_fit(x, J3)
 
 
+def batch_base_fit(xs, J):
+    j = np.array(J)
+    Y = xs[:, j - 1] - 2 * xs[:, [1]] * np.sin(
+        2 * math.pi * xs[:, [0]] + (j * math.pi) / n
+    )
+    return (2 * (Y ** 2).sum(axis=1)) / len(J)
+
+
+def evaluate_batch(xs):
+    """ Objectives of the rows of an array of solutions, vectorized (see fitnesses). """
+    x0, x1 = xs[:, 0], xs[:, 1]
+    bump = np.maximum(0, (1 + eps) * (1 - 4 * (2 * x0 - 1) ** 2))
+    return np.column_stack(
+        [
+            0.5 * (bump + 2 * x0) * x1 + batch_base_fit(xs, J1),
+            0.5 * (bump - 2 * x0 + 2) * x1 + batch_base_fit(xs, J2),
+            1 - x1 + batch_base_fit(xs, J3),
+        ]
+    )
+
+
 name = "UF9"
 fitnesses = [fit_1, fit_2, fit_3]
 dims = [(0, 1)] * 2 + [(-2, 2)] * (n - 2)
@@ -1,6 +1,8 @@
 import functools
 import math
 
+import numpy as np
+
 p_no = 150
 emoa_points = [i / (p_no - 1) for i in range(p_no)]
 
@@ -62,3 +64,17 @@ fitnesses, dims, name, pareto_front = emoa_fitnesses(
 )
 
 pareto_front = [[x, y] for x, y in zip(pareto_front[0], pareto_front[1])]
+
+
+def evaluate(x):
+    """ Both objectives of a solution, computing g once. """
+    f1 = f1a(x[0])
+    y = ga(x[1:])
+    return [f1, y * ha(f1, y)]
+
+
+def evaluate_batch(xs):
+    """ Objectives of the rows of an array of solutions, vectorized (see fitnesses). """
+    f1 = xs[:, 0]
+    g = 1 + 0.3103448275862069 * xs[:, 1:].sum(axis=1)
+    return np.column_stack([f1, g * (1 - np.sqrt(np.abs(f1 / g)))])
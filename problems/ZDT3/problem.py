@@ -1,5 +1,8 @@
 import functools
 import math
+
+import numpy as np
+
 from evotools import ea_utils
 
 p_no = 150
@@ -85,3 +88,20 @@ fitnesses, dims, name, pareto_front = emoa_fitnesses(
 pareto_front = trim_dominated(
     [[x, y] for x, y in zip(pareto_front[0], pareto_front[1])]
 )
+
+
+def evaluate(x):
+    """ Both objectives of a solution, computing g once. """
+    f1 = f1c(x[0])
+    y = gc(x[1:])
+    return [f1, y * hc(f1, y)]
+
+
+def evaluate_batch(xs):
+    """ Objectives of the rows of an array of solutions, vectorized (see fitnesses). """
+    f1 = xs[:, 0]
+    g = 1 + 0.3103448275862069 * xs[:, 1:].sum(axis=1)
+    f1_g = f1 / g
+    return np.column_stack(
+        [f1, g * (1 - np.sqrt(np.abs(f1_g)) - f1_g * np.sin(10 * math.pi * f1))]
+    )
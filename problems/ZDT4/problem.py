@@ -1,6 +1,8 @@
 import functools
 import math
 
+import numpy as np
+
 dims = [(-5, 5), (-5, 5), (-5, 5)]
 pareto_set = []
 
@@ -68,3 +70,17 @@ fitnesses, dims, name, pareto_front = emoa_fitnesses2(
     f1d, gd, hd, 10, "d", emoa_d_analytical
 )
 pareto_front = [[x, y] for x, y in zip(pareto_front[0], pareto_front[1])]
+
+
+def evaluate(x):
+    """ Both objectives of a solution, computing g once. """
+    f1 = f1d(x[0])
+    y = gd(x[1:])
+    return [f1, y * hd(f1, y)]
+
+
+def evaluate_batch(xs):
+    """ Objectives of the rows of an array of solutions, vectorized (see fitnesses). """
+    f1 = xs[:, 0]
+    g = 91 + (xs[:, 1:] ** 2 - 10 * np.cos(fpi * xs[:, 1:])).sum(axis=1)
+    return np.column_stack([f1, g * (1 - np.sqrt(np.abs(f1 / g)))])
@@ -1,6 +1,8 @@
 import functools
 import math
 
+import numpy as np
+
 dims = [(-5, 5), (-5, 5), (-5, 5)]
 pareto_set = []
 
@@ -68,3 +70,17 @@ fitnesses, dims, name, pareto_front = emoa_fitnesses(
     f1e, ge, he, 10, "e", emoa_e_analytical
 )
 pareto_front = [[x, y] for x, y in zip(pareto_front[0], pareto_front[1])]
+
+
+def evaluate(x):
+    """ Both objectives of a solution, computing g once. """
+    f1 = f1e(x[0])
+    y = ge(x[1:])
+    return [f1, y * he(f1, y)]
+
+
+def evaluate_batch(xs):
+    """ Objectives of the rows of an array of solutions, vectorized (see fitnesses). """
+    f1 = 1 - np.exp(-4 * xs[:, 0]) * (np.sin(spi * xs[:, 0]) ** 6)
+    g = 1 + 5.19615 * xs[:, 1:].sum(axis=1) ** 0.25
+    return np.column_stack([f1, g * (1 - (f1 / g) ** 2)])
@@ -1,13 +1,16 @@
 import logging
+import re
 from contextlib import suppress
 from functools import partial
 from importlib import import_module
 from itertools import product
+from pathlib import Path
 from typing import List, Dict, Any
 
+from algorithms.base import evaluation
 from evotools.ea_utils import gen_population
 from evotools.random_tools import show_partial, show_conf
-from simulation import run_config, serialization, worker
+from simulation import run_config, serialization, serializer, worker
 from simulation.model import SimulationCase
 from simulation.run_config import NotViableConfiguration
 
@@ -57,7 +60,7 @@ def create_simulation(args: Dict[str, str], params: Dict[str, Any]):
         logger.info("  {problem:12} :: {algo:12}".format(problem=problem, algo=algo))
 
     logger.debug("Duplicating problems (-N flag)")
-    return [
+    simulation_cases = [
         SimulationCase(
             simulation_case[0],
             simulation_case[1],
@@ -69,6 +72,51 @@ def create_simulation(args: Dict[str, str], params: Dict[str, Any]):
         for simulation_case in order
         for run_id in range(int(args["-N"]))
     ]
+    if args.get("--resume"):
+        simulation_cases = resume_simulation(simulation_cases)
+    return simulation_cases
+
+
+def expected_results(simulation_case: SimulationCase):
+    """ Names of the results a finished simulation case leaves in its run directory. """
+    if BUDGETS_PARAM in simulation_case.params:
+        return {str(budget) for budget in simulation_case.params[BUDGETS_PARAM]}
+    timeout = simulation_case.params[TIMEOUT_PARAM]
+    step = simulation_case.params[SAMPLING_INTERVAL_PARAM]
+    return {str(time_slot) for time_slot in range(step, timeout + 1, step)}
+
+
+def resume_simulation(simulation_cases: List[SimulationCase]):
+    """
+    Drops the cases whose results are all stored already, and points the cases with some results
+    missing at their existing run directory (the latest one with the same run id), so that the
+    worker continues there.
+    """
+    run_dirs = {}
+    for problem, algo in {simulation_case.config for simulation_case in simulation_cases}:
+        with suppress(FileNotFoundError):
+            results_dir = simulation_cases[0].results_dir
+            for candidate in sorted(Path(results_dir, problem, algo).iterdir()):
+                match = re.fullmatch(serialization.RUN_DIR_PATTERN, candidate.name)
+                if match and candidate.is_dir():
+                    run_dirs[(problem, algo, int(match.group("runid")))] = candidate
+
+    pending = []
+    for simulation_case in simulation_cases:
+        run_dir = run_dirs.get(simulation_case.config + (simulation_case.run_id,))
+        if run_dir:
+            stored = set(serializer.stored_results(run_dir))
+            missing = expected_results(simulation_case) - stored
+            if not missing:
+                logger.debug("Skipping finished run: %s", run_dir)
+                continue
+            logger.info("Resuming %s, missing results: %s", run_dir, sorted(missing, key=int))
+            simulation_case.id = run_dir.name
+        pending.append(simulation_case)
+    logger.info(
+        "Resuming: %d of %d simulation cases left", len(pending), len(simulation_cases)
+    )
+    return pending
 
 
 def parse_problems(args):
@@ -335,7 +383,14 @@ def load_algorithm_config(algo: str, config: Dict[str, str]):
 
 
 def load_obligatory_problem_parameters(config: Dict[str, str], problem_mod):
-    update = {"dims": problem_mod.dims, "fitnesses": problem_mod.fitnesses}
+    update = {
+        "dims": problem_mod.dims,
+        "fitnesses": evaluation.problem_fitnesses(problem_mod),
+    }
+    if run_config.evaluation_processes:
+        update["evaluator_factory"] = partial(
+            evaluation.ProcessPoolEvaluator, processes=run_config.evaluation_processes
+        )
     logger.debug("Per-problem config: %s", update)
     config.update(update)
     logger.debug("config: %s", show_conf(config))
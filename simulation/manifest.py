@@ -0,0 +1,200 @@
+import logging
+import re
+import sqlite3
+from collections import namedtuple
+from contextlib import closing
+from pathlib import Path
+
+ManifestEntry = namedtuple(
+    "ManifestEntry",
+    [
+        "problem",
+        "algorithm",
+        "simulation_id",
+        "run_id",
+        "name",
+        "path",
+        "population_size",
+        "cost",
+    ],
+)
+
+
+class ResultsManifest:
+    """
+    Index of the results stored in a results directory, kept in a SQLite database at its root
+    and updated by Serializer.store, so that finding out what is stored does not need walking the
+    directories and unpickling the results.
+
+    The extractors only trust a complete manifest: one created before the first result of the
+    directory was stored (see initialize) or rebuilt from the directory tree, and list the run
+    directories of an algorithm instead while some of them hold results it does not index.
+    """
+
+    FILE_NAME = "manifest.sqlite"
+
+    def __init__(self, results_dir):
+        self.results_dir = Path(results_dir)
+        self.path = self.results_dir / self.FILE_NAME
+
+    def _connect(self) -> sqlite3.Connection:
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=60)
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " problem TEXT, algorithm TEXT, simulation_id TEXT, run_id INTEGER,"
+                " name TEXT, number INTEGER, path TEXT, population_size INTEGER, cost REAL,"
+                " PRIMARY KEY (problem, algorithm, simulation_id, name))"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS properties (key TEXT PRIMARY KEY, value TEXT)"
+            )
+        return connection
+
+    def initialize(self):
+        """
+        Creates the manifest of a new results directory. A directory with results stored without
+        a manifest gets an incomplete one, to be rebuilt.
+        """
+        if self.path.exists():
+            return
+        has_results = any(
+            run_path.is_dir() for run_path in self.results_dir.glob("*/*/*")
+        )
+        with closing(self._connect()) as connection, connection:
+            if has_results:
+                logging.getLogger(__name__).warning(
+                    "Results in %s are not indexed, run rebuild_manifest", self.results_dir
+                )
+            else:
+                self._set_complete(connection)
+
+    def is_complete(self) -> bool:
+        if not self.path.exists():
+            return False
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT value FROM properties WHERE key = 'complete'"
+            ).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _set_complete(connection):
+        connection.execute(
+            "INSERT OR REPLACE INTO properties VALUES ('complete', '1')"
+        )
+
+    def add(self, simulation_case, name, path: Path, result):
+        """ Records the result stored at path (in a single transaction). """
+        self.add_all([self._entry(simulation_case, name, path, result)])
+
+    def add_all(self, entries):
+        with closing(self._connect()) as connection, connection:
+            self._insert(connection, entries)
+
+    @staticmethod
+    def _insert(connection, entries):
+        rows = [
+            (
+                entry.problem,
+                entry.algorithm,
+                entry.simulation_id,
+                entry.run_id,
+                entry.name,
+                int(entry.name),
+                entry.path,
+                entry.population_size,
+                entry.cost,
+            )
+            for entry in entries
+        ]
+        connection.executemany(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+
+    def _entry(self, simulation_case, name, path: Path, result) -> ManifestEntry:
+        cost = result.additional_data.get("cost")
+        return ManifestEntry(
+            simulation_case.problem_name,
+            simulation_case.algorithm_name,
+            simulation_case.id,
+            int(simulation_case.run_id),
+            str(name),
+            Path(path).relative_to(self.results_dir).as_posix(),
+            len(result.population),
+            float(cost) if cost is not None else None,
+        )
+
+    def query(self, problem=None, algorithm=None, number=None, simulation_id=None):
+        """
+        Entries matching all the given filters, ordered by problem, algorithm, simulation id and
+        number. Problem and algorithm are glob patterns, e.g. query("UF3", "HGS+*", 5500).
+        """
+        if not self.path.exists():
+            return []
+        conditions, params = [], []
+        for column, operator, value in [
+            ("problem", "GLOB", problem),
+            ("algorithm", "GLOB", algorithm),
+            ("number", "=", number),
+            ("simulation_id", "=", simulation_id),
+        ]:
+            if value is not None:
+                conditions.append("{} {} ?".format(column, operator))
+                params.append(value)
+        sql = (
+            "SELECT problem, algorithm, simulation_id, run_id, name, path, population_size, cost"
+            " FROM results"
+        )
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY problem, algorithm, simulation_id, number"
+        with closing(self._connect()) as connection:
+            return [ManifestEntry(*row) for row in connection.execute(sql, params)]
+
+    def summary(self):
+        """ (problem, algorithm, number, number of runs) of everything stored. """
+        if not self.path.exists():
+            return []
+        with closing(self._connect()) as connection:
+            return connection.execute(
+                "SELECT problem, algorithm, number, COUNT(*) FROM results"
+                " GROUP BY problem, algorithm, number ORDER BY problem, algorithm, number"
+            ).fetchall()
+
+    def rebuild(self) -> int:
+        """
+        Indexes all the results of the directory tree anew, e.g. of a tree stored before the
+        manifest existed.
+
+        :return: Number of indexed results.
+        """
+        from simulation import serialization, serializer
+        from simulation.model import SimulationCase
+
+        entries = []
+        for run_path in sorted(self.results_dir.glob("*/*/*")):
+            match = re.fullmatch(serialization.RUN_DIR_PATTERN, run_path.name)
+            if not match or not run_path.is_dir():
+                continue
+            problem, algorithm = run_path.parts[-3:-1]
+            simulation_case = SimulationCase(
+                problem, algorithm, match.group("runid"), None, self.results_dir, run_path.name
+            )
+            for name, path in serializer.stored_results(run_path).items():
+                try:
+                    result = serializer.load_result(path, name)
+                except Exception:
+                    logging.getLogger(__name__).exception("Could not index %s", path)
+                    continue
+                entries.append(self._entry(simulation_case, name, path, result))
+
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM results")
+            self._insert(connection, entries)
+            self._set_complete(connection)
+        logging.getLogger(__name__).info(
+            "Indexed %d results in %s", len(entries), self.path
+        )
+        return len(entries)
@@ -1,257 +1,280 @@
 import fnmatch
+import hashlib
 import logging
 import os
 import pickle
-import re
 from collections import defaultdict
-from contextlib import suppress
-from functools import partial
-from importlib import import_module
 from pathlib import Path
 from typing import List
 
+import numpy as np
+
 from metrics import metrics
-from simulation import serializer
+from simulation import run_config, serializer
+from simulation.metrics_store import MetricsStore
 from simulation.serializer import ResultWithMetadata
 
 
-def yield_metrics(result_list: List[ResultWithMetadata], problem_mod):
+# (short name, long name, function of metrics.metrics), in the order they are reported
+METRICS = [
+    ("gd", "generational distance", "generational_distance"),
+    ("igd", "inverse generational distance", "inverse_generational_distance"),
+    ("ahd", "average hausdorff distance", "average_hausdorff_distance"),
+    ("epsilon", "epsilon", "epsilon"),
+    ("extent", "extent", "extent"),
+    ("spacing", "spacing", "spacing"),
+    ("ndr", "non domination ratio", "non_domination_ratio"),
+    ("hypervolume", "hypervolume", "hypervolume"),
+    ("pdi", "pareto dominance indicator", "pareto_dominance_indicator"),
+]
+
+
+def yield_metrics(result_list: List[ResultWithMetadata], problem_mod, pool=None):
+    """
+    Yields (metric name, long name, values of the results), cost first. The metrics are evaluated
+    together by evaluate_metrics when the first of them is requested, on the pool if given.
+    """
+    yield "cost", "cost", [float(x.cost) for x in result_list]
+
+    values = evaluate_metrics(result_list, problem_mod, pool=pool)
+    for metric_name, metric_name_long, _ in METRICS:
+        yield metric_name, metric_name_long, [
+            result_values[metric_name] for result_values in values
+        ]
+
+
+def evaluate_metrics(
+    result_list: List[ResultWithMetadata], problem_mod, metric_names=None, pool=None
+) -> "[{str: Any}]":
+    """
+    Values of the requested metrics (all by default) for every result, as dicts keyed by the
+    metric short name. Stored values are read from the results directory's MetricsStore in bulk.
+    The results with metrics missing are evaluated by evaluate_result, on the pool if given, and
+    the new values are written back in a single transaction.
+    """
+    logger = logging.getLogger(__name__)
+    if metric_names is None:
+        metric_names = [metric_name for metric_name, _, _ in METRICS]
+    functions = {metric_name: function for metric_name, _, function in METRICS}
+    pdi_cache = defaultdict(list)
+
+    stores = {}
+    stored_values = {}
+    values = []
+    pending = []
     for result in result_list:
-        result.non_dominated_fitnesses = metrics.filter_not_dominated(result.fitnesses)
-
-    yield "cost", "cost", [
-        partial(float, x.additional_data["cost"]) for x in result_list
-    ]
-    yield "gd", "generational distance", [
-        partial(generational_distance, result=result, pareto=problem_mod.pareto_front)
-        for result in result_list
-    ]
-    yield "igd", "inverse generational distance", [
-        partial(
-            inverse_generational_distance,
-            result=result,
-            pareto=problem_mod.pareto_front,
-        )
-        for result in result_list
-    ]
-    yield "ahd", "average hausdorff distance", [
-        partial(
-            average_hausdorff_distance, result=result, pareto=problem_mod.pareto_front
-        )
-        for result in result_list
-    ]
-    yield "epsilon", "epsilon", [
-        partial(epsilon, result=result, pareto=problem_mod.pareto_front)
-        for result in result_list
-    ]
-    yield "extent", "extent", [
-        partial(extent, result=result, pareto=problem_mod.pareto_front)
-        for result in result_list
-    ]
-    yield "spacing", "spacing", [
-        partial(spacing, result=result, pareto=problem_mod.pareto_front)
-        for result in result_list
-    ]
-    yield "ndr", "non domination ratio", [
-        partial(non_domination_ratio, result=result, pareto=problem_mod.pareto_front)
-        for result in result_list
-    ]
-    yield "hypervolume", "hypervolume", [
-        partial(hypervolume, result=result, pareto=problem_mod.pareto_front)
-        for result in result_list
-    ]
-    cache = defaultdict(list)
-    yield "pdi", "pareto dominance indicator", [
-        partial(pareto_dominance_indicator, result=result, cache=cache)
-        for result in result_list
+        case = result.simulation_case
+        if case.results_dir not in stores:
+            stores[case.results_dir] = metrics_store(case.results_dir)
+        group = (case.results_dir, case.problem_name, case.algorithm_name)
+        if group not in stored_values:
+            stored_values[group] = stores[case.results_dir].load(
+                case.problem_name, case.algorithm_name
+            )
+        stored = stored_values[group].get((case.id, result.name), {})
+
+        result_values = {}
+        missing = {}
+        for metric_name in metric_names:
+            function = functions[metric_name]
+            try:
+                metric_params = get_metric_params(
+                    result, metric_name, problem_mod, pdi_cache
+                )
+            except KeyError:
+                logger.exception(
+                    "No matching run for: problem=%s algo=%s run_no=%s",
+                    case.problem_name,
+                    case.algorithm_name,
+                    result.run_no,
+                )
+                result_values[metric_name] = None
+                continue
+
+            params_digest = get_params_digest(metric_params)
+            if (function, params_digest) in stored:
+                result_values[metric_name] = stored[(function, params_digest)]
+            else:
+                missing[metric_name] = (function, params_digest, metric_params)
+        values.append(result_values)
+        if missing:
+            pending.append((result, result_values, missing))
+
+    tasks = [
+        (result, {name: (function, params) for name, (function, _, params) in missing.items()})
+        for result, _, missing in pending
     ]
+    if pool is not None:
+        computed = pool.starmap(evaluate_result, tasks, chunksize=1)
+    else:
+        computed = [evaluate_result(*task) for task in tasks]
+
+    new_rows = defaultdict(list)
+    for (result, result_values, missing), result_computed in zip(pending, computed):
+        case = result.simulation_case
+        for metric_name, value in result_computed.items():
+            function, params_digest, _ = missing[metric_name]
+            new_rows[case.results_dir].append(
+                (
+                    case.problem_name,
+                    case.algorithm_name,
+                    case.id,
+                    result.name,
+                    function,
+                    params_digest,
+                    value,
+                )
+            )
+            result_values[metric_name] = value
+    for result in result_list:
+        result.release()
 
+    for results_dir, rows in new_rows.items():
+        stores[results_dir].store(rows)
+    return values
 
-def get_metric(
-    result: ResultWithMetadata, metric_name, metric_mod_name=None, metric_params=None
-):
-    logger = logging.getLogger(__name__)
-    try:
-        if not metric_mod_name:
-            metric_mod_name = ["metrics", "metrics"]
-        if not metric_params:
-            metric_params = {}
-
-        metric_path = result.path.parent / f"{result.name}.{metric_name}.pickle"
-
-        with suppress(FileNotFoundError):
-            with metric_path.open(mode="rb") as fh:
-                res = pickle.load(fh)
-                metric_val = res["value"]
-                if res["metric"]["params"] != metric_params:
-                    e = Exception(
-                        "You have changed params of the metric. "
-                        "recalculating / per-param storage not implemented"
-                    )
-                    logger.exception(
-                        "Metric params do not match: %s != %s",
-                        res["metric"]["params"],
-                        metric_params,
-                        exc_info=e,
-                    )
-                    raise e
-            return metric_val
-
-        # noinspection PyUnreachableCode
-        metric_mod = import_module(".".join(metric_mod_name))
-        metric_fun = getattr(metric_mod, metric_name)
-        metric_val = metric_fun(
-            result.fitnesses, result.non_dominated_fitnesses, **metric_params
-        )
-
-        with metric_path.open(mode="wb") as fh:
-            pickle_store = {
-                "value": metric_val,
-                "metric": {
-                    "name": metric_name,
-                    "module": metric_mod_name,
-                    "params": metric_params,
-                },
-            }
-            pickle.dump(pickle_store, fh)
-
-        return metric_val
-    except Exception as e:
-        logger.exception(
-            "Error: Result.path=%s -> metric=%s", result.path, metric_name, exc_info=e
-        )
-        raise e
-
-
-def generational_distance(result: ResultWithMetadata, pareto):
-    return get_metric(result, "generational_distance", metric_params={"pareto": pareto})
-
-
-def inverse_generational_distance(result: ResultWithMetadata, pareto):
-    return get_metric(
-        result, "inverse_generational_distance", metric_params={"pareto": pareto}
-    )
-
-
-def average_hausdorff_distance(result: ResultWithMetadata, pareto):
-    return get_metric(
-        result, "average_hausdorff_distance", metric_params={"pareto": pareto}
-    )
-
-
-def epsilon(result: ResultWithMetadata, pareto):
-    return get_metric(result, "epsilon", metric_params={"pareto": pareto})
-
-
-def extent(result: ResultWithMetadata, pareto):
-    return get_metric(result, "extent", metric_params={"pareto": pareto})
 
+def evaluate_result(result: ResultWithMetadata, metrics) -> "{str: Any}":
+    """
+    Computes metrics of a result, loading it once and releasing it afterwards.
 
-def spacing(result: ResultWithMetadata, pareto):
-    return get_metric(result, "spacing", metric_params={"pareto": pareto})
+    :param metrics: {metric short name: (function of metrics.metrics, metric params)}.
+    :return: Values of the metrics, keyed by their short names.
+    """
+    logger = logging.getLogger(__name__)
+    values = {}
+    try:
+        for metric_name, (function, metric_params) in metrics.items():
+            try:
+                values[metric_name] = compute_metric(result, function, metric_params)
+            except Exception as e:
+                logger.exception(
+                    "Error: Result.path=%s -> metric=%s", result.path, function, exc_info=e
+                )
+                raise e
+    finally:
+        result.release()
+    return values
+
+
+def get_metric_params(result: ResultWithMetadata, metric_name, problem_mod, pdi_cache):
+    if metric_name == "pdi":
+        key = (result.simulation_case.problem_name, result.name, result.run_no)
+        if key not in pdi_cache:
+            preload_results_for_problem(pdi_cache, result.path.parent.parent.parent)
+        return {"all_solutions": pdi_cache[key]}
+
+    metric_params = {"pareto": problem_mod.pareto_front}
+    if metric_name == "hypervolume" and run_config.hypervolume_estimation is not None:
+        metric_params["estimation"] = run_config.hypervolume_estimation
+    return metric_params
+
+
+def compute_metric(result: ResultWithMetadata, function, metric_params):
+    if result.non_dominated_fitnesses is None:
+        result.non_dominated_fitnesses = metrics.filter_not_dominated(result.fitnesses)
+    metric_fun = getattr(metrics, function)
+    return metric_fun(result.fitnesses, result.non_dominated_fitnesses, **metric_params)
 
 
-def non_domination_ratio(result: ResultWithMetadata, pareto):
-    return get_metric(result, "non_domination_ratio", metric_params={"pareto": pareto})
+def get_params_digest(metric_params) -> str:
+    digest = hashlib.sha1()
+    for name in sorted(metric_params):
+        param = metric_params[name]
+        if isinstance(param, (set, frozenset)):
+            param = sorted(param)
+        digest.update(name.encode())
+        digest.update(pickle.dumps(param))
+    return digest.hexdigest()
 
 
-def hypervolume(result: ResultWithMetadata, pareto):
-    return get_metric(result, "hypervolume", metric_params={"pareto": pareto})
+def import_metric_pickles(results_dir, remove=False) -> int:
+    """ Moves the metric values of the former per-result pickles into the MetricsStore. """
+    return MetricsStore(results_dir).import_pickles(get_params_digest, remove)
 
 
-def pareto_dominance_indicator(result: ResultWithMetadata, cache):
-    problem = result.simulation_case.problem_name
-    algorithm = result.simulation_case.algorithm_name
-    run_no = result.run_no
-    if (problem, result.name, run_no) not in cache:
-        preload_results_for_problem(cache, result.path.parent.parent.parent)
-    try:
-        all_solutions = cache[(problem, result.name, run_no)]
-        print("cache: " +str(cache))
-        return get_metric(
-            result,
-            "pareto_dominance_indicator",
-            metric_params={"all_solutions": all_solutions},
-        )
-
-    except KeyError:
-        logger = logging.getLogger(__name__)
-        logger.exception(
-            "No matching run for: problem=%s algo=%s run_no=%s",
-            problem,
-            algorithm,
-            run_no,
-        )
-        return None
+def metrics_store(results_dir) -> MetricsStore:
+    """
+    The MetricsStore of the results directory. Until its database exists, the values of the
+    former per-result metric pickles are imported into it first, so that they are not computed
+    again; the pickles are kept.
+    """
+    store = MetricsStore(results_dir)
+    if not store.path.exists():
+        import_metric_pickles(results_dir)
+    return store
 
 
 def preload_results_for_problem(cache, problem_path: Path):
+    """
+    Fills the cache with the non-dominated solutions of every (problem, result name, run no),
+    taken over all the algorithms. The fronts are merged one result at a time, so only the
+    current fronts are kept in memory, and are reused from the problem's cache file until the
+    stored results change.
+    """
     logger = logging.getLogger(__name__)
     problem_name = problem_path.name
     logger.debug("Loading for problem : {}".format(problem_name))
+
+    stored = []
     for algo_path in problem_path.iterdir():
         if algo_path.is_dir():
             runs = [run for run in algo_path.iterdir() if run.is_dir()]
             for run_no in range(len(runs)):
-                for result_file in runs[run_no].iterdir():
-                    try:
-                        print(result_file)
-                        match = re.fullmatch(
-                            "(?P<name>[0-9]+)\.pickle", result_file.name
-                        )
-
-                        result_name = match.groupdict()["name"]
-                        result = serializer.load_file(result_file)
-
-                        logger.debug(
-                            "Caching for algo: {} ... {}".format(
-                                algo_path.name, (problem_name, result_name, run_no)
-                            )
-                        )
-                        cache[(problem_name, result_name, run_no)].append(
-                            result.fitnesses
-                        )
-                    except (AttributeError, IsADirectoryError):
-                        pass
-    filter_non_dominated_in_cache(problem_path, cache)
-
-
-def filter_non_dominated_in_cache(problem_path: Path, cache):
-    logger = logging.getLogger(__name__)
-    problem_name = problem_path.name
-    problem_keys = sorted(filter(lambda run_key: run_key[0] == problem_name, cache))
-    problem_solutions = [cache[key] for key in problem_keys]
+                run_results = serializer.stored_results(runs[run_no])
+                for result_name in sorted(run_results):
+                    stored.append(
+                        ((problem_name, result_name, run_no), run_results[result_name])
+                    )
 
     problem_cache_file = problem_path / f"{problem_name}_nondominated"
+    fingerprint = get_results_fingerprint(stored)
     try:
-        solutions, problem_nondominated = serializer.load_file(problem_cache_file)
+        cached_fingerprint, problem_nondominated = serializer.load_file(problem_cache_file)
     except IOError:
-        problem_nondominated = {}
-        solutions = None
+        cached_fingerprint, problem_nondominated = None, {}
 
-    if solutions and solutions == problem_solutions:
-        pass
+    if cached_fingerprint == fingerprint:
         logger.debug(
-            "Cache for problem {} does not changed, loading nondominated solutions from file..."
+            "Cache for problem %s does not changed, loading nondominated solutions from file...",
+            problem_name,
         )
     else:
-        logger.debug("Cache for problem {} changed, calculating new nondominated... ")
+        logger.debug(
+            "Cache for problem %s changed, calculating new nondominated... ", problem_name
+        )
         clear_old_pdi_metrics(problem_path)
-        for key in problem_keys:
-            logger.debug("Filtering non dominated for: " + str(key))
-            solutions = cache[key]
+        problem_nondominated = {}
+        for key, path in stored:
+            logger.debug("Merging non dominated for: " + str(key))
+            result = serializer.load_result(path, key[1])
+            # plain tuples of floats, whatever the storage
+            solutions = [
+                tuple(y) for y in np.asarray(result.fitnesses, dtype=float).tolist()
+            ]
+            # non-domination is transitive: the front of the union of the results is the front of
+            # the union of the front so far and the next result
             problem_nondominated[key] = set(
-                metrics.filter_not_dominated(tuple(y) for s in solutions for y in s)
+                metrics.filter_not_dominated(
+                    list(problem_nondominated.get(key, ())) + solutions
+                )
             )
 
-        serializer.save_file(
-            problem_cache_file, (problem_solutions, problem_nondominated)
-        )
+        serializer.save_file(problem_cache_file, (fingerprint, problem_nondominated))
 
     cache.update(problem_nondominated)
     print("Cache of results -> cache of nondominated results")
 
 
+def get_results_fingerprint(stored) -> str:
+    """ Digest of the keys, paths, sizes and modification times of the stored results. """
+    digest = hashlib.sha1()
+    for key, path in sorted(stored, key=lambda item: (item[0], str(item[1]))):
+        stat = path.stat()
+        digest.update(repr((key, str(path), stat.st_size, stat.st_mtime_ns)).encode())
+    return digest.hexdigest()
+
+
 def clear_old_pdi_metrics(problem_path: Path):
     logger = logging.getLogger(__name__)
 
@@ -268,3 +291,7 @@ def clear_old_pdi_metrics(problem_path: Path):
             file_path = os.path.join(root, filename)
             logger.debug("Removing file: " + str(file_path))
             os.remove(file_path)
+
+    MetricsStore(problem_path.parent).delete(
+        problem_path.name, "pareto_dominance_indicator"
+    )
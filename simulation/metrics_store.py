@@ -0,0 +1,122 @@
+import logging
+import pickle
+import re
+import sqlite3
+from collections import defaultdict
+from contextlib import closing
+from pathlib import Path
+
+from simulation import serializer
+
+
+class MetricsStore:
+    """
+    Metric values of all the results in a results directory, kept in a single SQLite database
+    at its root instead of one small pickle per (result, metric).
+
+    Rows are keyed by (problem, algorithm, run id, budget, metric, params digest); the run id is
+    the name of the run directory and the budget is the result name.
+    """
+
+    FILE_NAME = "metrics.sqlite"
+
+    def __init__(self, results_dir):
+        self.path = Path(results_dir, self.FILE_NAME)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=60)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS metrics ("
+            " problem TEXT, algorithm TEXT, run_id TEXT, budget TEXT,"
+            " metric TEXT, params TEXT, value BLOB,"
+            " PRIMARY KEY (problem, algorithm, run_id, budget, metric, params))"
+        )
+        return connection
+
+    def load(self, problem, algorithm) -> "{(str, str): {(str, str): Any}}":
+        """
+        All the values stored for the algorithm on the problem, as
+        {(run id, budget): {(metric, params digest): value}}.
+        """
+        if not self.path.exists():
+            return {}
+        values = defaultdict(dict)
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT run_id, budget, metric, params, value FROM metrics"
+                " WHERE problem = ? AND algorithm = ?",
+                (problem, algorithm),
+            )
+            for run_id, budget, metric, params, value in rows:
+                values[(run_id, budget)][(metric, params)] = pickle.loads(value)
+        return values
+
+    def store(self, rows):
+        """
+        :param rows: Iterable of (problem, algorithm, run id, budget, metric, params digest, value).
+        """
+        rows = [row[:-1] + (pickle.dumps(row[-1]),) for row in rows]
+        if not rows:
+            return
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def delete(self, problem, metric):
+        if not self.path.exists():
+            return
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "DELETE FROM metrics WHERE problem = ? AND metric = ?", (problem, metric)
+            )
+
+    def import_pickles(self, params_digest, remove=False) -> int:
+        """
+        Moves the values of the former `<budget>.<metric>.pickle` files into the store.
+
+        :param params_digest: Function computing the params digest of a legacy metric pickle.
+        :param remove: Remove the imported pickles.
+        :return: Number of imported values.
+        """
+        logger = logging.getLogger(__name__)
+        imported = 0
+        results_dir = self.path.parent
+        for run_path in results_dir.glob("*/*/*"):
+            if not run_path.is_dir():
+                continue
+            problem, algorithm, run_id = run_path.parts[-3:]
+            rows = []
+            imported_paths = []
+            for metric_path in run_path.iterdir():
+                match = re.fullmatch(
+                    r"(?P<budget>[0-9]+)\.(?P<metric>\w+)\.pickle", metric_path.name
+                )
+                if not match:
+                    continue
+                budget, metric = match.group("budget"), match.group("metric")
+                try:
+                    stored = serializer.load_file(metric_path)
+                except Exception:
+                    logger.exception("Could not import metric file %s", metric_path)
+                    continue
+                rows.append(
+                    (
+                        problem,
+                        algorithm,
+                        run_id,
+                        budget,
+                        metric,
+                        params_digest(stored["metric"]["params"]),
+                        stored["value"],
+                    )
+                )
+                imported_paths.append(metric_path)
+            self.store(rows)
+            imported += len(rows)
+            if remove:
+                for metric_path in imported_paths:
+                    metric_path.unlink()
+        logger.info("Imported %d metric values into %s", imported, self.path)
+        return imported
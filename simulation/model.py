@@ -5,7 +5,7 @@ from typing import List
 
 def get_simulation_id(run_id, run_date=None):
     run_date = run_date if run_date else datetime.today().strftime("%Y-%m-%d.%H%M%S.%f")
-    if not run_id:
+    if run_id is None:
         run_id = random.randint(1000000, 9999999)
     return f"{run_date}__{run_id:0>7}"
 
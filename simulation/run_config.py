@@ -28,6 +28,19 @@ problems = [
 ]
 
 DEFAULT_POPULATION_SIZE = 64
+
+# Settings of the approximate hypervolume (see algorithms.base.hv.estimate_hypervolume) used by
+# the hypervolume metric, e.g. {"relative_error": 0.01}. None means the exact value.
+hypervolume_estimation = None
+
+# Format of the stored results (see simulation.serializer.Serializer): "pickle", one file per
+# budget / time slot, or "npz", float64 arrays of all the results of a run in one memory-mapped file.
+results_storage = "pickle"
+
+# Number of processes evaluating the objectives of every simulation (see
+# algorithms.base.evaluation.ProcessPoolEvaluator), worth it for objectives taking milliseconds or
+# more per solution. None evaluates them in the simulation's process.
+evaluation_processes = None
 metaconfig_budgets = list(range(500, 9500, 1000))
 
 
@@ -49,6 +62,8 @@ algo_base = {
     "NSLS": {"local_search_mu": 0.5, "local_search_sigma": 0.5},
     "HGS": {
         "hgs_type": "classic",
+        # approximate hypervolume for the progress checks, e.g. {"samples": 4096}
+        "hypervolume_estimation": None,
         "fitness_errors": (0.0, 0.00, 0.0),
         "cost_modifiers": (1.0, 1.0, 1.0),
         "mutation_etas": (10.0, 12.0, 15.0),
@@ -63,6 +78,8 @@ algo_base = {
     },
     "DHGS": {
         "hgs_type": "distributed",
+        # approximate hypervolume for the progress checks, e.g. {"samples": 4096}
+        "hypervolume_estimation": None,
         "fitness_errors": (0.0, 0.00, 0.0),
         "cost_modifiers": (1.0, 1.0, 1.0),
         "mutation_etas": (10.0, 12.0, 15.0),
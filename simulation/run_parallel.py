@@ -2,6 +2,8 @@ import collections
 import logging
 import operator
 import random
+import threading
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
 import rx
@@ -9,18 +11,31 @@ from rx import operators as ops
 from thespian.actors import ActorSystem
 
 from evotools import rxtools
-from simulation import factory, log_helper
+from simulation import factory, log_helper, scheduling
+from simulation.manifest import ResultsManifest
 from simulation.timing import log_time
 from simulation.timing import system_time
 
 logger = logging.getLogger(__name__)
 
 
+# How many times a job is resubmitted when the pool it ran in broke down (e.g. one of the worker
+# processes was killed), before it is reported as failed.
+POOL_CRASH_RETRIES = 2
+
+
 def run_parallel(args):
     worker_factory, simulation_cases = factory.resolve_configuration(args)
+    if not simulation_cases:
+        logger.info("No simulation cases to run")
+        return
 
-    logger.debug("Shuffling the job queue")
+    # the shuffle only breaks the ties of the ordering
+    logger.debug("Ordering the job queue, longest jobs first")
     random.shuffle(simulation_cases)
+    history = scheduling.RuntimeHistory(factory.resolve_results_dir(args))
+    ResultsManifest(factory.resolve_results_dir(args)).initialize()
+    simulation_cases = scheduling.longest_first(simulation_cases, history)
 
     logger.debug("Creating the pool")
 
@@ -29,7 +44,10 @@ def run_parallel(args):
 
     wall_time = []
     start_time = datetime.now()
-    results = []
+    # indexed by simulation_no, filled in the order the jobs complete
+    results = [None] * len(simulation_cases)
+    completed = []
+    history_lock = threading.Lock()
     logger.debug("Simulation cases: %s", simulation_cases)
     logger.debug("Work will be divided into %d processes", processes_no)
 
@@ -37,25 +55,57 @@ def run_parallel(args):
 
     with log_time(system_time, logger, "Pool evaluated in {time_res}s", out=wall_time):
 
-        def process_result(subres):
-            results.append(subres)
-            log_simulation_stats(start_time, subres[-1], len(simulation_cases))
+        def process_result(job):
+            simulation_no, subres = job
+            results[simulation_no] = subres
+            completed.append(simulation_no)
+            # the CPU time of a resumed run covers only the budgets left; saved at once, so that
+            # the history survives an interrupted sweep
+            if subres and not subres[3]:
+                with history_lock:
+                    history.add(simulation_cases[simulation_no], subres[1])
+                    history.save()
+            log_simulation_stats(start_time, len(completed), len(simulation_cases))
 
         rx.from_iterable(range(len(simulation_cases))).pipe(
             ops.map(lambda i: worker_factory(simulation_cases[i], i)),
-            # ops.map(lambda w: rxtools.from_process(w.run)),
-            ops.map(lambda w : w.run()),
-            # ops.merge(max_concurrent=1)
-            ops.do_action(on_next=process_result)
+            ops.map(run_in_process),
+            ops.merge(max_concurrent=processes_no),
+            ops.do_action(on_next=process_result),
         ).run()
     log_summary(args, results, simulation_cases, wall_time)
     rxtools.shutdown_default_executor()
     sys.shutdown()
 
-def log_simulation_stats(start_time, simulation_id, simultations_count):
+
+def run_in_process(worker, retries=POOL_CRASH_RETRIES):
+    """
+    Observable of (simulation_no, worker result) of the worker run in the default process pool.
+    The result of a job which could not be completed is None, as for the errors caught by the
+    worker itself.
+    """
+
+    def on_error(error, _):
+        if isinstance(error, BrokenProcessPool) and retries > 0:
+            logger.warning(
+                "Process pool broke down, resubmitting simulation case: %s",
+                worker.simulation,
+            )
+            return run_in_process(worker, retries - 1)
+        logger.error(
+            "Simulation case failed: %s", worker.simulation, exc_info=error
+        )
+        return rx.of((worker.simulation_no, None))
+
+    return rxtools.from_process(worker.run).pipe(
+        ops.map(lambda subres: (worker.simulation_no, subres)), ops.catch(on_error)
+    )
+
+
+def log_simulation_stats(start_time, completed_count, simultations_count):
     current_time = datetime.now()
     diff_time = current_time - start_time
-    ratio = simulation_id * 1.0 / simultations_count
+    ratio = completed_count * 1.0 / simultations_count
     try:
         est_delivery_time = start_time + diff_time / ratio
         time_to_delivery = est_delivery_time - current_time
@@ -0,0 +1,134 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import List
+
+from simulation import factory
+from simulation.model import SimulationCase
+
+logger = logging.getLogger(__name__)
+
+
+def get_run_type(simulation: SimulationCase) -> str:
+    """ "budget" for a run with budgets, "time" for a run with a timeout. """
+    return "budget" if factory.BUDGETS_PARAM in simulation.params else "time"
+
+
+def get_budget(simulation: SimulationCase):
+    """ The largest budget of a budget run, or the timeout of a time run. """
+    if get_run_type(simulation) == "budget":
+        return simulation.params[factory.BUDGETS_PARAM][-1]
+    return simulation.params[factory.TIMEOUT_PARAM]
+
+
+def static_estimate(algorithm, budget):
+    """ Relative cost of a case with no history: the budget, times the number of stacked drivers. """
+    return int(budget) * len(algorithm.split("+"))
+
+
+class RuntimeHistory:
+    """
+    Mean CPU time of the simulation cases run so far, per (problem, algorithm, run type, budget),
+    kept in a JSON file at the root of the results directory. Budgets are numbers of evaluations
+    for budget runs and timeouts in seconds for time runs, so runs of the two types are never
+    compared.
+    """
+
+    FILE_NAME = "runtimes.json"
+
+    def __init__(self, results_dir):
+        self.path = Path(results_dir, self.FILE_NAME)
+        self.runtimes = {}
+        if self.path.exists():
+            with self.path.open() as fh:
+                self.runtimes = json.load(fh)
+
+    @staticmethod
+    def _key(problem, algorithm, run_type, budget):
+        return "{}::{}::{}:{}".format(problem, algorithm, run_type, budget)
+
+    def add(self, simulation: SimulationCase, cpu_time: float):
+        key = self._key(
+            simulation.problem_name,
+            simulation.algorithm_name,
+            get_run_type(simulation),
+            get_budget(simulation),
+        )
+        mean, count = self.runtimes.get(key, (0.0, 0))
+        self.runtimes[key] = ((mean * count + cpu_time) / (count + 1), count + 1)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # written aside and renamed, so that an interrupted sweep does not leave a truncated file
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w") as fh:
+            json.dump(self.runtimes, fh, indent=1, sort_keys=True)
+        os.replace(str(tmp_path), str(self.path))
+
+    def estimate(self, simulation: SimulationCase):
+        """
+        Expected CPU time of the case: the recorded mean for its budget, else the mean scaled
+        linearly from the other budgets of the same (problem, algorithm, run type), else None.
+        """
+        run_type, budget = get_run_type(simulation), get_budget(simulation)
+        problem, algorithm = simulation.config
+        key = self._key(problem, algorithm, run_type, budget)
+        if key in self.runtimes:
+            return self.runtimes[key][0]
+
+        per_budget = [
+            mean / other_budget
+            for (*other_case, other_budget), (mean, _) in self._entries()
+            if tuple(other_case) == (problem, algorithm, run_type)
+        ]
+        if per_budget:
+            return budget * sum(per_budget) / len(per_budget)
+        return None
+
+    def static_scale(self, run_type):
+        """
+        Mean ratio of the recorded CPU times of the runs of the type to their static estimates
+        (1 with no history).
+        """
+        ratios = [
+            mean / static_estimate(algorithm, budget)
+            for (_, algorithm, other_type, budget), (mean, _) in self._entries()
+            if other_type == run_type
+        ]
+        return sum(ratios) / len(ratios) if ratios else 1.0
+
+    def _entries(self):
+        """ ((problem, algorithm, run type, budget), (mean, count)) of the recorded runs. """
+        for key, value in self.runtimes.items():
+            problem, algorithm, limit = key.split("::")
+            run_type, _, budget = limit.partition(":")
+            if not budget:
+                # recorded without the run type, which cannot be told apart
+                continue
+            yield (problem, algorithm, run_type, float(budget)), value
+
+
+def longest_first(
+    simulation_cases: List[SimulationCase], history: RuntimeHistory
+) -> List[SimulationCase]:
+    """
+    Orders the cases by decreasing expected CPU time, so that the long ones do not start last and
+    leave the rest of the pool idle. The cases with no history are estimated statically.
+    """
+    scales = {}
+    estimates = []
+    for simulation in simulation_cases:
+        estimate = history.estimate(simulation)
+        if estimate is None:
+            run_type = get_run_type(simulation)
+            if run_type not in scales:
+                scales[run_type] = history.static_scale(run_type)
+            estimate = scales[run_type] * static_estimate(
+                simulation.algorithm_name, get_budget(simulation)
+            )
+        estimates.append(estimate)
+    logger.debug("Expected CPU time of the job queue: %.3fs", sum(estimates))
+
+    order = sorted(range(len(simulation_cases)), key=lambda i: estimates[i], reverse=True)
+    return [simulation_cases[i] for i in order]
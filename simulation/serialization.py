@@ -1,3 +1,4 @@
+import logging
 import re
 from collections import defaultdict
 from contextlib import suppress
@@ -5,15 +6,35 @@ from importlib import import_module
 from pathlib import Path
 
 from simulation import model, metrics_processor
+from simulation.manifest import ResultsManifest
 from simulation.model import SimulationCase
-from simulation.serializer import Serializer, ResultWithMetadata
+from simulation.serializer import Serializer, ResultWithMetadata, stored_results
 
 RESULTS_DIR = "../results_temp/results_k2"
 
+RUN_DIR_PATTERN = r"(?P<rundate>\d{4}-\d{2}-\d{2}\.\d{2}\d{2}\d{2}\.\d{6})__(?P<runid>\d{7})"
+
 
 class ResultsExtractor:
     def load(self, algo_name, problem_name, results_path):
-        runs = self._each_run(algo_name, problem_name, results_path)
+        results_manifest = ResultsManifest(results_path)
+        runs = None
+        if results_manifest.is_complete():
+            entries = results_manifest.query(problem=problem_name, algorithm=algo_name)
+            unindexed = self._unindexed_runs(algo_name, problem_name, results_path, entries)
+            if unindexed:
+                logging.getLogger(__name__).warning(
+                    "%d runs of %s on %s are not indexed (e.g. copied into %s), "
+                    "listing the run directories; run rebuild_manifest",
+                    len(unindexed),
+                    algo_name,
+                    problem_name,
+                    results_path,
+                )
+            else:
+                runs = self._indexed_runs(entries, results_path)
+        if runs is None:
+            runs = self._each_run(algo_name, problem_name, results_path)
         return self.load_result(runs)
 
     def load_result(self, runs):
@@ -24,10 +45,7 @@ class ResultsExtractor:
         run_no = 0
         for candidate in sorted(rootpath.iterdir()):
             try:
-                match = re.fullmatch(
-                    "(?P<rundate>\d{4}-\d{2}-\d{2}\.\d{2}\d{2}\d{2}\.\d{6})__(?P<runid>\d{7})",
-                    candidate.name,
-                )
+                match = re.fullmatch(RUN_DIR_PATTERN, candidate.name)
                 matchdict = match.groupdict()
                 run_id = matchdict["runid"]
                 run_date = matchdict["rundate"]
@@ -39,11 +57,43 @@ class ResultsExtractor:
                     results_path,
                     model.get_simulation_id(run_id, run_date),
                 )
-                yield (simulation_case, run_no)
+                yield (simulation_case, run_no, None)
                 run_no += 1
             except AttributeError:
                 pass
 
+    @staticmethod
+    def _unindexed_runs(algo, problem, results_path, entries):
+        """
+        Run directories of the algorithm holding results but no manifest entries, e.g. added to
+        the tree otherwise than by Serializer.store (copied from another node, merged trees). Only
+        the directories are listed and nothing is loaded, so that the check stays cheap.
+        """
+        indexed = {entry.simulation_id for entry in entries}
+        unindexed = []
+        with suppress(FileNotFoundError):
+            for candidate in Path(results_path, problem, algo).iterdir():
+                if (
+                    candidate.name not in indexed
+                    and re.fullmatch(RUN_DIR_PATTERN, candidate.name)
+                    and stored_results(candidate)
+                ):
+                    unindexed.append(candidate)
+        return unindexed
+
+    @staticmethod
+    def _indexed_runs(entries, results_path):
+        """ Same as _each_run, with the manifest entries of the results of every run. """
+        by_simulation = defaultdict(list)
+        for entry in entries:
+            by_simulation[entry.simulation_id].append(entry)
+        for run_no, simulation_id in enumerate(sorted(by_simulation)):
+            entry = by_simulation[simulation_id][0]
+            simulation_case = SimulationCase(
+                entry.problem, entry.algorithm, entry.run_id, None, results_path, simulation_id
+            )
+            yield (simulation_case, run_no, by_simulation[simulation_id])
+
 
 class NumberMeasuredResultExtractor(ResultsExtractor):
     def __init__(self, property_name):
@@ -51,31 +101,50 @@ class NumberMeasuredResultExtractor(ResultsExtractor):
 
     def load_result(self, runs):
         by_number = defaultdict(list)
-        for simulation_case, run_no in runs:
-            for runbudget in self.load_number_measured_results(simulation_case, run_no):
+        for simulation_case, run_no, entries in runs:
+            for runbudget in self.load_number_measured_results(
+                simulation_case, run_no, entries
+            ):
                 by_number[int(runbudget.name)].append(runbudget)
         return [
             (by_number[number], {self.property_name: number})
             for number in sorted(by_number)
         ]
 
-    def load_number_measured_results(self, simulation_case, run_no):
+    def load_number_measured_results(self, simulation_case, run_no, entries=None):
+        """
+        Results of the run, not loaded yet (see ResultWithMetadata).
+
+        :param entries: Manifest entries of the results of the run; if None, the results are
+            listed from the run directory.
+        """
         numbers = []
-        serializer = Serializer(simulation_case)
-        with suppress(FileNotFoundError):
-            for candidate in sorted(serializer.path.iterdir()):
-                try:
-                    match = re.fullmatch(f"(?P<{self.property_name}>[0-9]+)\.pickle", candidate.name)
-
-                    number = int(match.groupdict()[self.property_name])
-                    population_pickle = serializer.load(number)
-
-                    res = ResultWithMetadata(
-                        population_pickle, candidate, run_no, simulation_case
-                    )
-                    numbers.append(res)
-                except (AttributeError, IsADirectoryError):
-                    pass
+        if entries is None:
+            stored = Serializer(simulation_case).stored_results()
+            for name in sorted(stored):
+                numbers.append(
+                    ResultWithMetadata(None, stored[name], run_no, simulation_case, name)
+                )
+            return numbers
+
+        for entry in sorted(entries, key=lambda e: e.name):
+            path = Path(simulation_case.results_dir, entry.path)
+            if not path.exists():
+                logging.getLogger(__name__).warning(
+                    "Indexed result %s is missing, run rebuild_manifest", path
+                )
+                continue
+            numbers.append(
+                ResultWithMetadata(
+                    None,
+                    path,
+                    run_no,
+                    simulation_case,
+                    entry.name,
+                    entry.cost,
+                    entry.population_size,
+                )
+            )
         return numbers
 
 
@@ -89,7 +158,7 @@ class TimeResultsExtractor(NumberMeasuredResultExtractor):
         super().__init__("time")
 
 
-def each_result(result_extractor: ResultsExtractor, results_path=RESULTS_DIR):
+def each_result(result_extractor: ResultsExtractor, results_path=RESULTS_DIR, pool=None):
     def f_algo(problem_path, algo_path, problem_mod):
         algo_name = algo_path.name
         problem_name = problem_path.name
@@ -100,7 +169,7 @@ def each_result(result_extractor: ResultsExtractor, results_path=RESULTS_DIR):
                 "problem": problem_name,
                 "algo": algo_name,
                 "results": results,
-                "analysis": metrics_processor.yield_metrics(results, problem_mod),
+                "analysis": metrics_processor.yield_metrics(results, problem_mod, pool),
                 **config,
             }
 
@@ -111,6 +180,8 @@ def each_result(result_extractor: ResultsExtractor, results_path=RESULTS_DIR):
 
     with suppress(FileNotFoundError):
         for problem in Path(results_path).iterdir():
+            if not problem.is_dir():
+                continue
             problem_mod = ".".join(["problems", problem.name, "problem"])
             problem_mod = import_module(problem_mod)
             yield problem.name, problem_mod, f_problem(problem, problem_mod)
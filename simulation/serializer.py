@@ -1,10 +1,27 @@
+import collections
+import os
 import pickle
+import re
+import struct
+import zipfile
 from contextlib import suppress
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Optional
 
+import numpy as np
+
+from simulation import run_config
+from simulation.manifest import ResultsManifest
 from simulation.model import SimulationCase
 
+# Single file of a run holding all its results with the "npz" storage (see Serializer).
+COLUMNAR_FILE_NAME = "results.npz"
+
+# How many layouts of columnar files (offsets of their arrays) are kept between loads.
+COLUMNAR_CACHE_SIZE = 64
+
+_columnar_layouts = collections.OrderedDict()
+
 
 class Result:
     def __init__(self, population, population_fitnesses, **additional_data):
@@ -14,14 +31,68 @@ class Result:
 
 
 class ResultWithMetadata(Result):
+    """
+    A stored result and where it comes from. Unless given, the population, fitnesses and
+    additional data are loaded from `path` on first access and dropped again by release(), so
+    that lists of results stay small until they are actually used.
+    """
+
     def __init__(
-        self, result: Result, path: Path, run_no: int, simulation_case: SimulationCase
+        self,
+        result: Optional[Result],
+        path: Path,
+        run_no: int,
+        simulation_case: SimulationCase,
+        name: str = None,
+        cost=None,
+        population_size: int = None,
     ):
-        super().__init__(result.population, result.fitnesses, **result.additional_data)
+        self._result = result
         self.path = path
-        self.name = path.with_suffix("").name
+        self.name = name if name else path.with_suffix("").name
         self.run_no = run_no
         self.simulation_case = simulation_case
+        self._cost = cost
+        self._population_size = population_size
+        self.non_dominated_fitnesses = None
+
+    @property
+    def population(self):
+        return self._loaded().population
+
+    @property
+    def fitnesses(self):
+        return self._loaded().fitnesses
+
+    @property
+    def additional_data(self):
+        return self._loaded().additional_data
+
+    @property
+    def cost(self):
+        if self._cost is None:
+            self._cost = self._peek().additional_data["cost"]
+        return self._cost
+
+    @property
+    def population_size(self) -> int:
+        if self._population_size is None:
+            self._population_size = len(self._peek().population)
+        return self._population_size
+
+    def release(self):
+        """ Drops the loaded data (and the derived non-dominated fitnesses). """
+        self._result = None
+        self.non_dominated_fitnesses = None
+
+    def _loaded(self) -> Result:
+        if self._result is None:
+            self._result = load_result(self.path, self.name)
+        return self._result
+
+    def _peek(self) -> Result:
+        # loaded data is not kept when only a summary value is needed
+        return self._result if self._result is not None else load_result(self.path, self.name)
 
 
 def load_file(path: Path):
@@ -35,25 +106,143 @@ def save_file(path: Path, obj: Any):
 
 
 class Serializer:
-    def __init__(self, simulation_case: SimulationCase):
+    """
+    Results of a simulation case, stored in its run directory either as one `<name>.pickle` file
+    per result ("pickle" storage) or as float64 arrays in a single, uncompressed `results.npz`
+    ("npz" storage), selected by run_config.results_storage. Loading supports both.
+    """
+
+    def __init__(self, simulation_case: SimulationCase, storage: str = None):
         self.path = Path(
             simulation_case.results_dir,
             simulation_case.problem_name,
             simulation_case.algorithm_name,
             simulation_case.id,
         )
+        self.storage = storage if storage else run_config.results_storage
+        self.simulation_case = simulation_case
 
     def store(self, result: Result, file_name: str) -> Path:
         with suppress(FileExistsError):
             self.path.mkdir(parents=True)
 
-        store_path = self.get_result_path(file_name)
-        save_file(store_path, result)
+        if self.storage == "npz":
+            store_path = self.path / COLUMNAR_FILE_NAME
+            store_columnar(store_path, file_name, result)
+        else:
+            store_path = self.get_result_path(file_name)
+            save_file(store_path, result)
+        ResultsManifest(self.simulation_case.results_dir).add(
+            self.simulation_case, file_name, store_path, result
+        )
         return store_path
 
     def get_result_path(self, file_name) -> Path:
         return self.path / f"{file_name}.pickle"
 
     def load(self, file_name) -> Result:
-        load_path = self.get_result_path(file_name)
-        return load_file(load_path)
+        return load_result(stored_results(self.path)[str(file_name)], str(file_name))
+
+    def stored_results(self) -> Dict[str, Path]:
+        return stored_results(self.path)
+
+
+def stored_results(run_path: Path) -> Dict[str, Path]:
+    """ {result name: file holding it} of the results stored in the run directory. """
+    results = {}
+    with suppress(FileNotFoundError):
+        for candidate in run_path.iterdir():
+            match = re.fullmatch(r"(?P<name>[0-9]+)\.pickle", candidate.name)
+            if match and candidate.is_file():
+                results[match.group("name")] = candidate
+    columnar_path = run_path / COLUMNAR_FILE_NAME
+    if columnar_path.exists():
+        for name in _columnar_layout(columnar_path):
+            results.setdefault(name, columnar_path)
+    return results
+
+
+def load_result(path: Path, name: str) -> Result:
+    """ The result `name` stored in the file at path (a result pickle or a columnar file). """
+    if path.name == COLUMNAR_FILE_NAME:
+        return load_columnar(path, name)
+    return load_file(path)
+
+
+def store_columnar(path: Path, name: str, result: Result):
+    """
+    Adds (or replaces) the result in the columnar file of the run. The arrays of the other results
+    are copied over: a run has few of them and the file is replaced atomically, so a killed worker
+    never leaves a truncated one.
+    """
+    arrays = {}
+    if path.exists():
+        with np.load(str(path)) as stored:
+            arrays = {
+                key: stored[key] for key in stored.files if key.split(".", 1)[0] != name
+            }
+    arrays[name + ".population"] = np.asarray(result.population, dtype=float)
+    arrays[name + ".fitnesses"] = np.asarray(result.fitnesses, dtype=float)
+    for key, value in result.additional_data.items():
+        arrays["{}.{}".format(name, key)] = np.asarray(value)
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open(mode="wb") as fh:
+        np.savez(fh, **arrays)
+    os.replace(str(tmp_path), str(path))
+
+
+def load_columnar(path: Path, name: str) -> Result:
+    """ The result `name` of the columnar file, its arrays memory-mapped read only. """
+    data = {}
+    for field, (offset, shape, dtype, fortran_order) in _columnar_layout(path)[name].items():
+        if int(np.prod(shape)) == 0:
+            array = np.empty(shape, dtype=dtype)
+        else:
+            array = np.memmap(
+                str(path),
+                dtype=dtype,
+                mode="r",
+                offset=offset,
+                shape=shape,
+                order="F" if fortran_order else "C",
+            )
+        data[field] = array.item() if array.ndim == 0 else array
+    population = data.pop("population")
+    fitnesses = data.pop("fitnesses")
+    return Result(population, fitnesses, **data)
+
+
+def _columnar_layout(path: Path):
+    """
+    {result name: {field: (offset, shape, dtype, fortran order)}} of the arrays in the columnar
+    file. np.savez stores the .npy members uncompressed, so every array is a contiguous block of
+    the file which can be memory-mapped directly.
+    """
+    stat = path.stat()
+    key = (str(path), stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    if key in _columnar_layouts:
+        _columnar_layouts.move_to_end(key)
+        return _columnar_layouts[key]
+
+    layout = collections.defaultdict(dict)
+    with zipfile.ZipFile(str(path)) as archive, path.open(mode="rb") as fh:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError("Compressed columnar result files are not supported: " + str(path))
+            # the local file header is 30 bytes followed by the member name and an extra field
+            fh.seek(info.header_offset)
+            name_length, extra_length = struct.unpack("<HH", fh.read(30)[26:30])
+            fh.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(fh)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fh)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fh)
+            name, field = info.filename[: -len(".npy")].split(".", 1)
+            layout[name][field] = (fh.tell(), shape, dtype, fortran_order)
+
+    _columnar_layouts[key] = layout
+    if len(_columnar_layouts) > COLUMNAR_CACHE_SIZE:
+        _columnar_layouts.popitem(last=False)
+    return layout
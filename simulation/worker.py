@@ -3,18 +3,24 @@ import logging
 import os
 import random
 import time
+from contextlib import suppress
+from pathlib import Path
 from types import ModuleType
 
 from rx import operators as ops
 
+from algorithms.base import evaluation
 from algorithms.base.driver import BudgetRun, Driver, TimeRun
 from algorithms.base.model import TimeProgressMessage
 from simulation import factory, log_helper
 from simulation.model import SimulationCase
 from simulation.run_config import NotViableConfiguration
-from simulation.serializer import Serializer, Result
+from simulation.serializer import Serializer, Result, load_file, save_file
 from simulation.timing import log_time, process_time
 
+# Snapshot of the driver after the last stored budget, removed once the run is finished.
+CHECKPOINT_FILE_NAME = "driver.checkpoint"
+
 
 class SimulationWorker:
     def __init__(self, simulation: SimulationCase, simulation_no: int):
@@ -46,6 +52,7 @@ class SimulationWorker:
 
             logger.debug("Creating the driver used to perform computation")
             driver = final_driver()
+            driver = self.resume(driver, logger)
             proc_time = []
             logger.debug(
                 "Beginning processing of %s, simulation: %s", driver, self.simulation
@@ -58,7 +65,7 @@ class SimulationWorker:
             ):
                 results = self.run_driver(driver, problem_mod, logger)
 
-            return results, proc_time[-1], self.simulation_no
+            return results, proc_time[-1], self.simulation_no, self.resumed
 
         except NotViableConfiguration as e:
             reason = inspect.trace()[-1]
@@ -79,6 +86,15 @@ class SimulationWorker:
                 driver.shutdown()
             logger.debug("Finished processing. simulation case:%s", self.simulation)
 
+    def resume(self, driver: Driver, logger: logging.Logger) -> Driver:
+        """ The driver to run: the new driver, unless the run continues an interrupted one. """
+        return driver
+
+    @property
+    def resumed(self) -> bool:
+        """ Whether the run continues an interrupted one, its CPU time covering only a part. """
+        return False
+
     def run_driver(
         self, driver: Driver, problem_mod: ModuleType, logger: logging.Logger
     ):
@@ -101,27 +117,63 @@ class SimulationWorker:
 class BudgetWorker(SimulationWorker):
     def __init__(self, simulation: SimulationCase, simulation_no: int):
         super().__init__(simulation, simulation_no)
+        self.budget_done = None
 
     @property
     def budgets(self):
         return self.simulation.params[factory.BUDGETS_PARAM]
 
+    @property
+    def resumed(self) -> bool:
+        return self.budget_done is not None
+
+    @property
+    def checkpoint_path(self) -> Path:
+        return Serializer(self.simulation).path / CHECKPOINT_FILE_NAME
+
+    def resume(self, driver: Driver, logger: logging.Logger) -> Driver:
+        """
+        The driver of the run's checkpoint if there is one, the new driver being shut down, else
+        the new driver.
+        """
+        checkpoint = load_checkpoint(self.checkpoint_path, logger)
+        if not checkpoint:
+            return driver
+        driver.shutdown()
+        driver, self.budget_done = checkpoint
+        logger.info(
+            "Resuming %s from the checkpoint of budget %d", self.simulation, self.budget_done
+        )
+        return driver
+
     def run_driver(
         self, driver: Driver, problem_mod: ModuleType, logger: logging.Logger
     ):
         serializer = Serializer(self.simulation)
+        checkpoint_path = self.checkpoint_path
+        checkpointing = True
         results = []
 
         def process_results(budget: int):
+            nonlocal checkpointing
             finalpop = driver.finalized_population()
-            finalpop_fit = [[fit(x) for fit in problem_mod.fitnesses] for x in finalpop]
+            finalpop_fit = evaluation.evaluate(
+                evaluation.problem_fitnesses(problem_mod), finalpop
+            )
             serializer.store(
                 Result(finalpop, finalpop_fit, cost=driver.cost), str(budget)
             )
             results.append((driver.cost, finalpop))
+            if checkpointing and budget != self.budgets[-1]:
+                # a driver which did not pickle once will not the next time
+                checkpointing = save_checkpoint(checkpoint_path, driver, budget, logger)
 
         driver.max_budget = self.budgets[-1]
-        for budget in self.budgets:
+        budgets = self.budgets
+        if self.budget_done is not None:
+            budgets = [budget for budget in self.budgets if budget > self.budget_done]
+
+        for budget in budgets:
             budget_run = BudgetRun(budget)
             budget_run.create_job(driver).pipe(
                 ops.do_action(on_completed=lambda: process_results(budget))
@@ -136,9 +188,49 @@ class BudgetWorker(SimulationWorker):
                     )
                 )
             )
+        with suppress(FileNotFoundError):
+            checkpoint_path.unlink()
         return results
 
 
+def save_checkpoint(
+    path: Path, driver: Driver, budget: int, logger: logging.Logger
+) -> bool:
+    """
+    Snapshots the driver (with the state of the random generator) after the budget, so that a run
+    killed in the middle continues from there. Drivers which cannot be pickled (e.g. the ones
+    holding actor systems) are not checkpointed.
+
+    :return: Whether the checkpoint was saved.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        save_file(tmp_path, (driver, budget, random.getstate()))
+    except Exception as e:
+        logger.warning(
+            "Driver state not checkpointed, the run will not resume if interrupted: %s", e
+        )
+        with suppress(FileNotFoundError):
+            tmp_path.unlink()
+        return False
+    # written aside and renamed, so that a killed worker does not leave a truncated checkpoint
+    os.replace(str(tmp_path), str(path))
+    return True
+
+
+def load_checkpoint(path: Path, logger: logging.Logger):
+    """ (driver, budget) of the checkpoint at path, or None. """
+    try:
+        driver, budget, random_state = load_file(path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring the unreadable checkpoint %s: %s", path, e)
+        return None
+    random.setstate(random_state)
+    return driver, budget
+
+
 class TimeWorker(SimulationWorker):
     def __init__(self, simulation: SimulationCase, simulation_no: int):
         super().__init__(simulation, simulation_no)
@@ -159,7 +251,9 @@ class TimeWorker(SimulationWorker):
         def process_results(msg: TimeProgressMessage):
             finalpop = driver.finalized_population()
             print(f"final pop result: {finalpop}")
-            finalpop_fit = [[fit(x) for fit in problem_mod.fitnesses] for x in finalpop]
+            finalpop_fit = evaluation.evaluate(
+                evaluation.problem_fitnesses(problem_mod), finalpop
+            )
 
             time_slot = msg.elapsed_time
 
@@ -87,7 +87,7 @@ def table_rank(args):
                                     "analysis"
                                 ]:
                                     if metric_name in best_func:
-                                        data_process = list(x() for x in data_process)
+                                        data_process = list(data_process)
                                         data_analysis = yield_analysis(
                                             data_process, boot_size
                                         )
@@ -206,7 +206,7 @@ def detailed_rank(args):
                                 "analysis"
                             ]:
                                 if metric_name in best_func:
-                                    data_process = list(x() for x in data_process)
+                                    data_process = list(data_process)
                                     data_analysis = yield_analysis(
                                         data_process, boot_size
                                     )
@@ -260,7 +260,7 @@ def rank(args):
                     ) in max_budget_result["analysis"]:
                         if metric_name in best_func:
 
-                            data_process = list(x() for x in data_process)
+                            data_process = list(data_process)
                             data_analysis = yield_analysis(data_process, boot_size)
 
                             score = data_analysis["btstrpd"]["metrics"]
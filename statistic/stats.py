@@ -48,7 +48,7 @@ fields = [
 def force_data(args):
     boot_size, (metric_name, metric_name_long, data_process) = args
 
-    data_process = list(x() for x in data_process)
+    data_process = list(data_process)
     force_analysis = yield_analysis(data_process, boot_size)
     return metric_name, metric_name_long, data_process, force_analysis
 
@@ -83,7 +83,7 @@ def statistics(args):
 
     with close_and_join(multiprocessing.Pool(min(int(args["-j"]), 8))) as p:
         for problem_name, problem_mod, algorithms in serialization.each_result(
-            BudgetResultsExtractor()
+            BudgetResultsExtractor(), pool=p
         ):
             for algo_name, budgets in algorithms:
                 header_just_printed = print_header()
@@ -93,7 +93,7 @@ def statistics(args):
 
                     first_budget_line = True
                     avg_pop_len = average(
-                        [len(x.population) for x in result["results"]]
+                        [x.population_size for x in result["results"]]
                     )
 
                     with log_time(
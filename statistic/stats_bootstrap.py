@@ -7,7 +7,7 @@ def validate_cost(result, boot_size, delta=500):
     budget = result["budget"]
     for metric_name, _, data_process in result["analysis"]:
         if metric_name == "cost":
-            cost_data = list(x() for x in data_process)
+            cost_data = list(data_process)
             data_analysis = yield_analysis(cost_data, boot_size)
             cost_val = data_analysis["btstrpd"]["metrics"]
             return cost_val <= budget + delta
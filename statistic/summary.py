@@ -1,21 +1,15 @@
 # base
+import logging
 
 # self
-from simulation import serialization
-from simulation.serialization import BudgetResultsExtractor
+from simulation.manifest import ResultsManifest
 
 
-def analyse_results(*args, **kwargs):
-    for problem_name, problem_mod, algorithms in serialization.each_result(
-        BudgetResultsExtractor()
-    ):
-        for algo_name, budgets in algorithms:
-            for result in budgets:
-                print(
-                    "{:9} {:14} {:>4} {:>2}".format(
-                        problem_name,
-                        algo_name,
-                        result["budget"],
-                        len(result["results"]),
-                    )
-                )
+def analyse_results(args):
+    results_manifest = ResultsManifest(args["--dir"])
+    if not results_manifest.is_complete():
+        logging.getLogger(__name__).info("Indexing the results first")
+        results_manifest.rebuild()
+
+    for problem_name, algo_name, budget, runs in results_manifest.summary():
+        print("{:9} {:14} {:>4} {:>2}".format(problem_name, algo_name, budget, runs))
@@ -29,3 +29,20 @@ class DriverTest(unittest.TestCase):
                 self.assertIsInstance(proxy, ProgressMessage)
                 self.assertEqual(proxy.step_no, driver.step_no - 1)
                 self.assertEqual(proxy.cost, driver.cost)
+
+    def test_cost_counts_evaluations(self):
+        for algorithm in ["NSGAII", "SPEA2", "SMSEMOA", "IBEA", "OMOPSO"]:
+            with self.subTest(algorithm=algorithm):
+                driver_factory, _ = prepare(algorithm, "ZDT1")
+                driver = driver_factory()
+                for _ in range(2):
+                    driver.next_step()
+                self.assertEqual(driver.cost, driver.evaluator.evaluations)
+                self.assertGreater(driver.cost, 0)
+
+    def test_smsemoa_cost_counts_offspring(self):
+        driver_factory, _ = prepare("SMSEMOA", "ZDT1")
+        driver = driver_factory()
+        population_size = len(driver.individuals)
+        driver.next_step()
+        self.assertEqual(driver.cost, population_size + driver.epoch_length)
@@ -0,0 +1,179 @@
+import os
+import pickle
+import random
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from unittest import mock
+
+import numpy as np
+
+from algorithms.base import evaluation
+
+BATCH_PROBLEMS = ["ZDT1", "ZDT2", "ZDT3", "ZDT4", "ZDT6"] + [
+    "UF{}".format(i) for i in range(1, 13)
+]
+
+SHARED_PROBLEMS = ["ZDT1", "ZDT2", "ZDT3", "ZDT4", "ZDT6", "UF11", "UF12"]
+
+
+def process_id(_):
+    return os.getpid()
+
+
+def random_solutions(problem_mod, seed, number):
+    rnd = random.Random(seed)
+    return [[rnd.uniform(a, b) for a, b in problem_mod.dims] for _ in range(number)]
+
+
+class EvaluationTest(unittest.TestCase):
+    def test_evaluate_batch_matches_fitnesses(self):
+        for problem in BATCH_PROBLEMS:
+            with self.subTest(problem=problem):
+                problem_mod = import_module("problems.{}.problem".format(problem))
+                solutions = random_solutions(problem_mod, problem, 20)
+                expected = [
+                    [objective(x) for objective in problem_mod.fitnesses]
+                    for x in solutions
+                ]
+                fitnesses = evaluation.problem_fitnesses(problem_mod)
+                self.assertIsInstance(fitnesses, evaluation.ProblemFitnesses)
+                np.testing.assert_allclose(
+                    evaluation.evaluate(fitnesses, solutions), expected, rtol=1e-9
+                )
+
+    def test_evaluate_matches_fitnesses(self):
+        for problem in SHARED_PROBLEMS:
+            with self.subTest(problem=problem):
+                problem_mod = import_module("problems.{}.problem".format(problem))
+                fitnesses = evaluation.problem_fitnesses(problem_mod)
+                for x in random_solutions(problem_mod, problem, 5):
+                    expected = [objective(x) for objective in problem_mod.fitnesses]
+                    self.assertEqual(evaluation.evaluate_one(fitnesses, x), expected)
+                    self.assertEqual([objective(x) for objective in fitnesses], expected)
+
+    def test_objectives_share_evaluation(self):
+        calls = []
+
+        def evaluate(x):
+            calls.append(tuple(x))
+            return [x[0], x[0] + x[1]]
+
+        shared = evaluation.SharedObjectives(evaluate)
+        f1, f2 = evaluation.Objective(shared, 0), evaluation.Objective(shared, 1)
+        x1, x2, x3 = [1.0, 2.0], [3.0, 4.0], [5.0, 6.0]
+
+        self.assertEqual([f1(x1), f1(x2), f2(x1), f2(x2)], [1.0, 3.0, 3.0, 7.0])
+        self.assertEqual(calls, [(1.0, 2.0), (3.0, 4.0)])
+        f1(x3)
+        f2(x1)
+        self.assertEqual(calls, [(1.0, 2.0), (3.0, 4.0), (5.0, 6.0), (1.0, 2.0)])
+
+    def test_problems_without_batch_evaluation(self):
+        problem_mod = import_module("problems.kursawe.problem")
+        fitnesses = evaluation.problem_fitnesses(problem_mod)
+        self.assertIs(fitnesses, problem_mod.fitnesses)
+        self.assertEqual(
+            evaluation.evaluate(fitnesses, [[0.5, 0.5, 0.5]]),
+            [[objective([0.5, 0.5, 0.5]) for objective in fitnesses]],
+        )
+
+    def test_evaluator_with_cache(self):
+        calls = []
+
+        def objective(x):
+            calls.append(tuple(x))
+            return sum(x)
+
+        cache = {(1.0, 1.0): [-1.0]}
+        evaluator = evaluation.Evaluator([objective], cache)
+        objectives, evaluations = evaluator.evaluate(
+            [(1.0, 1.0), (1.0, 2.0), (1.0, 2.0), (0.0, 0.0)]
+        )
+
+        self.assertEqual(objectives, [[-1.0], [3.0], [3.0], [0.0]])
+        self.assertEqual(evaluations, 2)
+        self.assertEqual(calls, [(1.0, 2.0), (0.0, 0.0)])
+        self.assertEqual(cache[(0.0, 0.0)], [0.0])
+
+        self.assertEqual(evaluator.evaluate([(0.0, 0.0)]), ([[0.0]], 0))
+        self.assertEqual(evaluator.evaluations, 2)
+
+    def test_evaluator_with_list_solutions(self):
+        cache = {}
+        evaluator = evaluation.Evaluator([sum], cache)
+        objectives, evaluations = evaluator.evaluate([[1.0, 2.0], [0.0, 0.0], [1.0, 2.0]])
+
+        self.assertEqual(objectives, [[3.0], [0.0], [3.0]])
+        self.assertEqual(evaluations, 2)
+        self.assertEqual(cache, {(1.0, 2.0): [3.0], (0.0, 0.0): [0.0]})
+        self.assertEqual(evaluator.evaluate([[0.0, 0.0]]), ([[0.0]], 0))
+
+    def test_evaluator_with_executor(self):
+        problem_mod = import_module("problems.ZDT1.problem")
+        fitnesses = evaluation.problem_fitnesses(problem_mod)
+        solutions = random_solutions(problem_mod, "executor", 50)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            evaluator = evaluation.Evaluator(fitnesses, executor=executor, chunk_size=8)
+            objectives, evaluations = evaluator.evaluate(solutions)
+
+        self.assertEqual(evaluations, 50)
+        np.testing.assert_allclose(objectives, evaluation.evaluate(fitnesses, solutions))
+        self.assertIsNone(pickle.loads(pickle.dumps(evaluator)).executor)
+
+    def test_process_pool_evaluator(self):
+        problem_mod = import_module("problems.ZDT1.problem")
+        fitnesses = evaluation.problem_fitnesses(problem_mod)
+        solutions = [tuple(x) for x in random_solutions(problem_mod, "pool", 40)]
+        cache = {}
+
+        evaluator = evaluation.ProcessPoolEvaluator(fitnesses, cache, processes=2)
+        objectives, evaluations = evaluator.evaluate(solutions + solutions[:5])
+
+        self.assertEqual(evaluations, 40)
+        np.testing.assert_allclose(
+            objectives, evaluation.evaluate(fitnesses, solutions + solutions[:5])
+        )
+        self.assertEqual(len(cache), 40)
+        self.assertEqual(evaluator.evaluate(solutions[:3])[1], 0)
+
+    def test_process_pool_evaluator_unpicklable_fitnesses(self):
+        fitnesses = [lambda x: x[0], lambda x: x[0] + x[1]]
+        evaluator = evaluation.ProcessPoolEvaluator(fitnesses, processes=2)
+        self.assertEqual(
+            evaluator.evaluate([(1.0, 2.0), (3.0, 4.0)]), ([[1.0, 3.0], [3.0, 7.0]], 2)
+        )
+
+    def test_fork_server_pool_without_start_method(self):
+        problem_mod = import_module("problems.ZDT1.problem")
+        fitnesses = evaluation.problem_fitnesses(problem_mod)
+        solutions = [tuple(x) for x in random_solutions(problem_mod, "fork server", 40)]
+        archive = {x: evaluation.evaluate_one(fitnesses, x) for x in solutions[:10]}
+        with mock.patch.object(evaluation.sys, "version_info", (3, 6, 5)), mock.patch.object(
+            evaluation, "_evaluation_pools", {}
+        ):
+            try:
+                self.assertIsInstance(
+                    evaluation.evaluation_pool(2), evaluation._ForkServerPool
+                )
+                pids, _ = evaluation.ProcessPoolEvaluator([process_id], processes=2).evaluate(
+                    [(float(i),) for i in range(16)]
+                )
+                self.assertNotIn(os.getpid(), {pid for [pid] in pids})
+
+                evaluator = evaluation.ProcessPoolEvaluator(fitnesses, dict(archive), 2)
+                objectives, evaluations = evaluator.evaluate(solutions + solutions[:5])
+            finally:
+                evaluation.shutdown_evaluation_pools()
+
+        expected, expected_evaluations = evaluation.Evaluator(fitnesses, dict(archive)).evaluate(
+            solutions + solutions[:5]
+        )
+        self.assertEqual(evaluations, expected_evaluations)
+        self.assertEqual(evaluations, 30)
+        np.testing.assert_allclose(objectives, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
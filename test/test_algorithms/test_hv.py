@@ -0,0 +1,89 @@
+import random
+import unittest
+from unittest import mock
+
+from algorithms.base import hv
+from algorithms.base.hv import (
+    HyperVolume,
+    estimate_hypervolume,
+    hypervolume,
+    hypervolume_contributions,
+)
+from evotools.nd_sort import non_dominated_front
+
+
+class HypervolumeTest(unittest.TestCase):
+    def test_kernels_match_recursive_algorithm(self):
+        random.seed(42)
+        for objectives_no in [1, 2, 3]:
+            for _ in range(50):
+                # integer grid: plenty of ties, dominated points and points outside the box
+                front = [
+                    [random.randint(0, 5) for _ in range(objectives_no)]
+                    for _ in range(random.randint(1, 30))
+                ]
+                reference_point = [4.5] * objectives_no
+                with self.subTest(front=front):
+                    self.assertAlmostEqual(
+                        hypervolume(front, reference_point),
+                        HyperVolume(reference_point).computeRecursive(front),
+                    )
+
+    def test_does_not_depend_on_order(self):
+        random.seed(42)
+        front = [[random.randint(0, 5) for _ in range(4)] for _ in range(15)]
+        front += front[:3]
+        expected = hypervolume(front, [4.5] * 4)
+        for _ in range(10):
+            random.shuffle(front)
+            self.assertAlmostEqual(hypervolume(front, [4.5] * 4), expected)
+
+    def test_contributions_match_leave_one_out(self):
+        random.seed(42)
+        for objectives_no in [2, 3, 4]:
+            for _ in range(30):
+                points = [
+                    [random.randint(0, 5) for _ in range(objectives_no)]
+                    for _ in range(random.randint(1, 30))
+                ]
+                front = [points[i] for i in non_dominated_front(points)]
+                front.append(front[0])
+                reference_point = [4.5] * objectives_no
+                total = hypervolume(front, reference_point)
+                contributions = hypervolume_contributions(front, reference_point)
+                with self.subTest(front=front):
+                    for i in range(len(front)):
+                        self.assertAlmostEqual(
+                            contributions[i],
+                            total - hypervolume(front[:i] + front[i + 1 :], reference_point),
+                        )
+
+    def test_simple_volumes(self):
+        self.assertEqual(hypervolume([[1, 0, 1], [0, 1, 0]], [2, 2, 2]), 5.0)
+        self.assertEqual(hypervolume([[0, 1], [1, 0]], [2, 2]), 3.0)
+        self.assertEqual(hypervolume([[3, 3]], [2, 2]), 0.0)
+        self.assertEqual(HyperVolume([2, 2]).compute([]), 0.0)
+
+    def test_estimate_within_interval(self):
+        random.seed(42)
+        front = [[random.random() for _ in range(3)] for _ in range(50)]
+        exact = hypervolume(front, [1.0] * 3)
+        estimate = estimate_hypervolume(front, [1.0] * 3, samples=2 ** 14, seed=0)
+        self.assertEqual(estimate.samples, 2 ** 14)
+        self.assertLessEqual(estimate.lower, exact)
+        self.assertGreaterEqual(estimate.upper, exact)
+
+        estimate = estimate_hypervolume(front, [1.0] * 3, relative_error=0.01, seed=0)
+        self.assertLessEqual(estimate.upper - estimate.value, 0.01 * estimate.value)
+        self.assertAlmostEqual(
+            HyperVolume([1.0] * 3, estimation={"samples": 2 ** 14, "seed": 0}).compute(front),
+            estimate_hypervolume(front, [1.0] * 3, samples=2 ** 14, seed=0).value,
+        )
+
+    def test_estimate_without_sobol_points(self):
+        front = [[0.5, 0.5, 0.5]]
+        with mock.patch.object(hv, "qmc", None):
+            estimate = estimate_hypervolume(front, [1.0] * 3, samples=2 ** 12, seed=0)
+            self.assertAlmostEqual(estimate.value, 0.125, delta=0.02)
+            with self.assertRaises(ValueError):
+                estimate_hypervolume(front, [1.0] * 3, sampler="sobol")
@@ -0,0 +1,73 @@
+import math
+import unittest
+
+import numpy as np
+
+from algorithms.IBEA.IBEA import IBEA
+from simulation.factory import prepare
+
+
+class IBEATest(unittest.TestCase):
+    def setUp(self):
+        driver_factory, _ = prepare("IBEA", "ZDT1")
+        self.driver = driver_factory()
+
+    def set_objectives(self, objective_values, population_size):
+        self.driver.individuals = [
+            IBEA.Individual([i]) for i in range(len(objective_values))
+        ]
+        for ind, objectives in zip(self.driver.individuals, objective_values):
+            ind.objectives = objectives
+        self.driver.population_size = population_size
+        self.driver._scale_objectives()
+
+    def test_eplus_indicators(self):
+        scaled = np.array([[0, 1], [0.5, 0.5], [1, 0]])
+        indicators = IBEA.eplus_indicators(scaled)
+        for i, x1 in enumerate(scaled):
+            for j, x2 in enumerate(scaled):
+                self.assertEqual(indicators[i, j], max(x1 - x2))
+
+    def expected_fitness(self, objective_values):
+        scaled = [[x / 2 for x in objectives] for objectives in objective_values]
+        indicators = [[max(np.subtract(x1, x2)) for x2 in scaled] for x1 in scaled]
+        c = max(abs(i) for row in indicators for i in row)
+        return [
+            -sum(
+                math.exp(-indicators[i][j] / (c * self.driver.k))
+                for i in range(len(scaled))
+                if i != j
+            )
+            for j in range(len(scaled))
+        ]
+
+    def test_fitness(self):
+        objective_values = [[0, 2], [1, 1], [2, 0], [2, 2]]
+        self.set_objectives(objective_values, 4)
+        self.driver._calculate_fitness()
+        np.testing.assert_allclose(
+            self.driver.fitness, self.expected_fitness(objective_values)
+        )
+
+    def test_environmental_selection(self):
+        objective_values = [[0, 2], [2, 2], [1, 1], [1.5, 1.5], [2, 0]]
+        self.set_objectives(objective_values, 3)
+        self.driver._calculate_fitness()
+        self.driver._environmental_selection()
+
+        # [2, 2] removed first, then [1.5, 1.5]
+        survivors = [ind.v[0] for ind in self.driver.individuals]
+        self.assertCountEqual(survivors, [0, 2, 4])
+        # as if computed among the survivors only, c being the same
+        fitness = dict(zip([0, 2, 4], self.expected_fitness([[0, 2], [1, 1], [2, 0]])))
+        np.testing.assert_allclose(self.driver.fitness, [fitness[i] for i in survivors])
+
+    def test_objectives_evaluated_once(self):
+        population_size = len(self.driver.individuals)
+        self.assertEqual(self.driver.cost, population_size)
+        self.driver.step()
+        self.assertEqual(self.driver.cost, population_size + self.driver.mating_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
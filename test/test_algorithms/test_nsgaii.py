@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+
+from algorithms.NSGAII.message import NSGAIIIMGAMessageAdapter
+from simulation.factory import prepare
+
+
+class NSGAIITest(unittest.TestCase):
+    def setUp(self):
+        driver_factory, _ = prepare("NSGAII", "ZDT1")
+        self.driver = driver_factory()
+
+    def set_objectives(self, objective_values, population_size):
+        self.driver.vectors = np.arange(len(objective_values), dtype=float)[:, None]
+        self.driver.objective_values = np.asarray(objective_values, dtype=float)
+        self.driver.population_size = population_size
+
+    def test_crowding_and_selection(self):
+        self.set_objectives([[3, 3], [0, 3], [1, 2], [2, 1], [3, 0]], 4)
+        self.driver._nd_sort()
+        self.driver._crowding()
+
+        self.assertListEqual(self.driver.rank.tolist(), [2, 1, 1, 1, 1])
+        np.testing.assert_allclose(
+            self.driver.crowding, [0, np.inf, 4 / 3, 4 / 3, np.inf]
+        )
+        self.assertListEqual(self.driver.first_front[:, 0].tolist(), [1, 2, 3, 4])
+
+        self.assertListEqual(
+            self.driver._environmental_selection().tolist(), [1, 4, 2, 3]
+        )
+        self.assertListEqual(self.driver.vectors[:, 0].tolist(), [1, 4, 2, 3])
+        self.assertListEqual(self.driver.rank.tolist(), [1, 1, 1, 1])
+
+    def test_steps_keep_rows_aligned(self):
+        for _ in range(3):
+            self.driver.step()
+            self.assertEqual(len(self.driver.vectors), len(self.driver.objective_values))
+            self.assertEqual(
+                len(self.driver.vectors),
+                self.driver.population_size + self.driver.mating_size,
+            )
+        self.assertEqual(
+            len(self.driver.finalized_population()), self.driver.population_size
+        )
+
+    def test_migration(self):
+        adapter = NSGAIIIMGAMessageAdapter(self.driver)
+        population = self.driver.population
+        objective_values = self.driver.objective_values
+
+        migrants = adapter.emigrate([population[3], population[0]])
+        self.assertListEqual(
+            migrants,
+            [
+                (population[0], objective_values[0].tolist()),
+                (population[3], objective_values[3].tolist()),
+            ],
+        )
+        self.assertEqual(len(self.driver.vectors), len(population) - 2)
+
+        adapter.immigrate(migrants)
+        self.assertListEqual(self.driver.population[-2:], [population[0], population[3]])
+        np.testing.assert_array_equal(
+            self.driver.objective_values[-2:], objective_values[[0, 3]]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from algorithms.NSGAIII.NSGAIII import reference_directions, theta_non_dominated_sort
+from simulation.factory import prepare
+
+
+class NSGAIIITest(unittest.TestCase):
+    def setUp(self):
+        driver_factory, _ = prepare("NSGAIII", "ZDT1")
+        self.driver = driver_factory()
+
+    def test_reference_directions(self):
+        directions = reference_directions(3, 10)
+        self.assertEqual(directions.shape, (10, 3))
+        np.testing.assert_allclose(directions.sum(axis=1), 1)
+        self.assertTrue((directions >= 0).all())
+        self.assertIs(reference_directions(3, 10), directions)
+
+    def test_clustering(self):
+        self.driver.reference_points = np.array([[1.0, 0.0], [0.5, 0.5], [0.0, 1.0]])
+        self.driver.reference_point_lengths = np.linalg.norm(
+            self.driver.reference_points, axis=1
+        )
+        clusters, projections, rejections = self.driver.clustering(
+            np.array([[0.9, 0.1], [0.4, 0.6], [0.0, 2.0]])
+        )
+        self.assertListEqual(clusters.tolist(), [0, 1, 2])
+        np.testing.assert_allclose(projections, [0.9, 1 / 2 ** 0.5, 2])
+        np.testing.assert_allclose(rejections, [0.1, 0.2 / 2 ** 0.5, 0], atol=1e-12)
+
+    def test_theta_non_dominated_sort(self):
+        clusters = np.array([0, 1, 0, 0, 1, 2])
+        theta_fitness = np.array([0.5, 2.0, 0.1, 0.5, 1.0, 3.0])
+        self.assertListEqual(
+            theta_non_dominated_sort(clusters, theta_fitness).tolist(), [2, 2, 1, 2, 1, 1]
+        )
+
+    def test_steps(self):
+        for _ in range(3):
+            self.driver.step()
+        self.assertEqual(
+            len(self.driver.finalized_population()), self.driver.population_size
+        )
+        self.assertEqual(
+            sum(len(front) for front in self.driver.front.values()),
+            2 * self.driver.population_size,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from algorithms.base import selection
+
+
+class SelectionTest(unittest.TestCase):
+    def setUp(self):
+        self.objective_values = np.array([[3, 3], [0, 3], [1, 2], [2, 1], [3, 0]], float)
+
+    def test_ranks(self):
+        self.assertListEqual(
+            selection.ranks(self.objective_values).tolist(), [2, 1, 1, 1, 1]
+        )
+        self.assertListEqual(selection.ranks(np.zeros((0, 2))).tolist(), [])
+
+    def test_crowding_distances(self):
+        rank = selection.ranks(self.objective_values)
+        np.testing.assert_allclose(
+            selection.crowding_distances(self.objective_values, rank),
+            [0, np.inf, 4 / 3, 4 / 3, np.inf],
+        )
+        np.testing.assert_allclose(
+            selection.crowding_distances([[0], [1], [3]], np.array([1, 1, 1])),
+            [np.inf, 1, 4 / 3],
+        )
+        self.assertEqual(len(selection.crowding_distances(np.zeros((0, 2)), rank[:0])), 0)
+
+    def test_crowded_order(self):
+        rank = np.array([2, 1, 1, 1])
+        crowding = np.array([np.inf, 0.5, np.inf, 1.0])
+        self.assertListEqual(selection.crowded_order(rank, crowding).tolist(), [2, 3, 1, 0])
+
+    def test_binary_tournament(self):
+        rank = np.array([1, 1, 2])
+        crowding = np.array([1.0, 2.0, np.inf])
+        draws = np.random.RandomState(0)
+        first, second = draws.randint(3, size=100), draws.randint(3, size=100)
+
+        def key(i):
+            return rank[i], -crowding[i]
+
+        self.assertListEqual(
+            selection.binary_tournament(rank, crowding, 100, np.random.RandomState(0)).tolist(),
+            [min(a, b, key=key) for a, b in zip(first, second)],
+        )
+        self.assertListEqual(
+            selection.binary_tournament(
+                rank, crowding, 100, np.random.RandomState(0), p=0.0
+            ).tolist(),
+            [max(a, b, key=key) for a, b in zip(first, second)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import random
+import unittest
+
+import numpy as np
+
+from algorithms.SPEA2.SPEA2 import SPEA2
+from simulation.factory import prepare
+
+
+def brute_force_truncate(points, archive_size):
+    points = list(points)
+    while len(points) > archive_size:
+        rows = [
+            sorted(float(np.linalg.norm(np.subtract(p, q))) for q in points)
+            for p in points
+        ]
+        del points[rows.index(min(rows))]
+    return points
+
+
+class SPEA2Test(unittest.TestCase):
+    def setUp(self):
+        driver_factory, _ = prepare("SPEA2", "ZDT1")
+        self.driver = driver_factory()
+
+    def truncate(self, points, archive_size):
+        self.driver._SPEA2__archive_size = archive_size
+        distances = SPEA2.distance_matrix([{"objectives": p} for p in points])
+        kept = self.driver.truncate(list(range(len(points))), distances)
+        return [points[i] for i in kept]
+
+    def test_truncation_removes_most_crowded(self):
+        points = [[0.0], [1.0], [1.1], [3.0]]
+        self.assertListEqual(self.truncate(points, 3), [[0.0], [1.1], [3.0]])
+        self.assertListEqual(self.truncate(points, 2), [[0.0], [3.0]])
+
+    def test_truncation_matches_brute_force(self):
+        rnd = random.Random(7)
+        for _ in range(20):
+            # distinct distances, so that the order of the removals is unique
+            points = [[rnd.random(), rnd.random()] for _ in range(rnd.randint(2, 40))]
+            archive_size = rnd.randint(1, len(points))
+            with self.subTest(points=points, archive_size=archive_size):
+                self.assertListEqual(
+                    self.truncate(points, archive_size),
+                    brute_force_truncate(points, archive_size),
+                )
+
+    def test_densities(self):
+        distances = SPEA2.distance_matrix(
+            [{"objectives": p} for p in [[0, 0], [3, 4], [6, 8], [0, 1]]]
+        )
+        np.testing.assert_allclose(distances[0], [0, 5, 10, 1])
+        # k = 2: the second nearest individual apart from itself
+        np.testing.assert_allclose(
+            SPEA2.calculate_densities(distances),
+            [1 / 7, 1 / 7, 1 / (2 + 85 ** 0.5), 1 / (2 + 18 ** 0.5)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
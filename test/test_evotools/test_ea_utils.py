@@ -9,6 +9,8 @@ from evotools.ea_utils import (
     domination_cmp,
     dominates,
     gen_population,
+    domination_matrix,
+    dominance_fronts,
 )
 from metrics.metrics_utils import euclid_sqr_distance
 
@@ -123,3 +125,26 @@ class TestEAUtils(unittest.TestCase):
                             )
                         )
                         raise e
+
+
+class TestDominationMatrix(unittest.TestCase):
+    def test_matches_pairwise_dominates(self):
+        random.seed(42)
+        pop = [[random.choice([0, 1, 2, 3]) for _ in range(3)] for _ in range(60)]
+        for block_size in [None, 1, 7]:
+            with self.subTest(block_size=block_size):
+                matrix = domination_matrix(pop, block_size=block_size)
+                for (i, a), (j, b) in itertools.product(enumerate(pop), repeat=2):
+                    self.assertEqual(dominates(a, b), matrix[i, j])
+
+    def test_cross_matrix_shape(self):
+        matrix = domination_matrix([[0, 0], [2, 2]], [[1, 1], [0, 0], [3, 0]])
+        self.assertListEqual(
+            matrix.tolist(), [[True, False, True], [False, False, False]]
+        )
+
+    def test_dominance_fronts(self):
+        fits = [[0, 0], [1, 1], [0, 1], [1, 0], [1, 1]]
+        fronts = dominance_fronts(fits)
+        self.assertListEqual(fronts, [[0], [2, 3], [1, 4]])
+        self.assertListEqual(dominance_fronts([]), [])
@@ -0,0 +1,35 @@
+import random
+import unittest
+
+from evotools.ea_utils import dominance_fronts, paretofront_layers
+from evotools.nd_sort import iter_fronts, non_dominated_front, non_dominated_sort
+
+
+class TestNdSort(unittest.TestCase):
+    def test_matches_brute_force(self):
+        random.seed(42)
+        for objectives_no in [1, 2, 3, 4]:
+            for _ in range(30):
+                # few distinct values, so that ties and duplicates are common
+                pop = [
+                    [random.randint(0, 3) for _ in range(objectives_no)]
+                    for _ in range(random.randint(1, 200))
+                ]
+                expected = [sorted(front) for front in dominance_fronts(pop)]
+                with self.subTest(objectives_no=objectives_no, pop=pop):
+                    self.assertListEqual(non_dominated_sort(pop), expected)
+                    self.assertListEqual(non_dominated_front(pop), expected[0])
+                    self.assertListEqual(list(iter_fronts(pop)), expected)
+
+    def test_empty(self):
+        self.assertListEqual(non_dominated_sort([]), [])
+        self.assertListEqual(non_dominated_front([]), [])
+        self.assertListEqual(list(iter_fronts([])), [])
+
+    def test_paretofront_layers(self):
+        pop = [("a", [0, 0]), ("b", [1, 1]), ("c", [0, 1]), ("d", [1, 0]), ("e", [1, 1])]
+        layers = list(paretofront_layers(pop, lambda x: x[1]))
+        self.assertListEqual(
+            [[name for name, _ in layer] for layer in layers],
+            [["a"], ["c", "d"], ["b", "e"]],
+        )
@@ -0,0 +1,42 @@
+import random
+import unittest
+
+from metrics.epsilon import epsilon
+
+
+def brute_force_epsilon(solution, pareto):
+    return max(
+        min(max(p - s for s, p in zip(point, reference)) for reference in pareto)
+        for point in solution
+    )
+
+
+class TestEpsilon(unittest.TestCase):
+    def test_matches_brute_force(self):
+        random.seed(42)
+        for _ in range(50):
+            objectives_no = random.randint(1, 4)
+            solution = [
+                [random.random() for _ in range(objectives_no)]
+                for _ in range(random.randint(1, 30))
+            ]
+            pareto = [
+                [random.random() for _ in range(objectives_no)]
+                for _ in range(random.randint(1, 30))
+            ]
+            self.assertEqual(
+                epsilon(solution, pareto), brute_force_epsilon(solution, pareto)
+            )
+
+    def test_returns_index(self):
+        value, index = epsilon(
+            [[0.3, 1.5], [2.0, 2.0]], [[0.0, 1.0], [1.0, 0.0]], return_index=True
+        )
+        self.assertEqual(index, (0, 0))
+        self.assertAlmostEqual(value, -0.3)
+
+    def test_multiplicative(self):
+        self.assertEqual(
+            epsilon([[1.0, 2.0]], [[2.0, 2.0], [1.0, 1.0]], kind="multiplicative"), 1.0
+        )
+        self.assertEqual(epsilon([], [[1.0, 1.0]]), float("-inf"))
@@ -0,0 +1,78 @@
+import math
+import random
+import unittest
+
+from metrics import metrics_utils
+
+
+def brute_force_distance(from_set, to_set):
+    distances = [
+        min(metrics_utils.euclid_sqr_distance(f, t) for t in to_set) for f in from_set
+    ]
+    return math.sqrt(sum(distances) / len(distances))
+
+
+class TestDistanceMetrics(unittest.TestCase):
+    def setUp(self):
+        random.seed(42)
+        self.solution = [[random.random() for _ in range(3)] for _ in range(40)]
+        self.pareto = [[random.random() for _ in range(3)] for _ in range(100)]
+
+    def test_generational_distances(self):
+        self.assertAlmostEqual(
+            metrics_utils.generational_distance(self.solution, self.pareto),
+            brute_force_distance(self.solution, self.pareto),
+        )
+        self.assertAlmostEqual(
+            metrics_utils.inverse_generational_distance(self.solution, self.pareto),
+            brute_force_distance(self.pareto, self.solution),
+        )
+
+    def test_average_hausdorff_distance(self):
+        not_dominated = metrics_utils.filter_not_dominated(self.solution)
+        self.assertAlmostEqual(
+            metrics_utils.average_hausdorff_distance(
+                self.solution, not_dominated, self.pareto
+            ),
+            max(
+                brute_force_distance(not_dominated, self.pareto),
+                brute_force_distance(self.pareto, self.solution),
+            ),
+        )
+
+    def test_distance_from_pareto(self):
+        self.assertAlmostEqual(
+            metrics_utils.distance_from_pareto(self.solution, self.pareto),
+            sum(
+                min(metrics_utils.euclid_distance(x, y) for y in self.pareto)
+                for x in self.solution
+            )
+            / len(self.solution),
+        )
+
+
+class TestSpreadMetrics(unittest.TestCase):
+    def test_extent(self):
+        solution = [[0.0, 3.0], [1.0, 1.0], [4.0, 0.0]]
+        self.assertEqual(metrics_utils.extent(solution), math.sqrt(7.0))
+
+    def test_spacing_matches_pairwise_definition(self):
+        random.seed(42)
+        solution = [[random.randint(0, 5) for _ in range(3)] for _ in range(30)]
+        min_distances = [
+            min(
+                sum(abs(a - b) for a, b in zip(x, y))
+                for j, y in enumerate(solution)
+                if i != j
+            )
+            for i, x in enumerate(solution)
+        ]
+        mean = sum(min_distances) / len(min_distances)
+        self.assertAlmostEqual(
+            metrics_utils.spacing(solution),
+            math.sqrt(
+                sum((mean - d) ** 2 for d in min_distances)
+                / (len(solution) - 1 + metrics_utils.EPSILON)
+            ),
+        )
+        self.assertEqual(metrics_utils.spacing([[1.0, 2.0]]), 0.0)
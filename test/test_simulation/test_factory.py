@@ -0,0 +1,39 @@
+import tempfile
+import unittest
+
+from simulation import factory, serializer
+from simulation.model import SimulationCase
+from simulation.serializer import Result
+
+
+class ResumeSimulationTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def cases(self):
+        return [
+            SimulationCase(
+                "ZDT1",
+                "NSGAII",
+                run_id,
+                None,
+                self.temp_dir.name,
+                **{factory.BUDGETS_PARAM: [500, 1000]}
+            )
+            for run_id in range(3)
+        ]
+
+    def test_only_missing_work_scheduled(self):
+        finished, unfinished, _ = self.cases()
+        for budget in ["500", "1000"]:
+            serializer.Serializer(finished).store(Result([], []), budget)
+        serializer.Serializer(unfinished).store(Result([], []), "500")
+
+        pending = factory.resume_simulation(self.cases())
+
+        self.assertListEqual([case.run_id for case in pending], [1, 2])
+        self.assertEqual(pending[0].id, unfinished.id)
+        self.assertNotEqual(pending[1].id, unfinished.id)
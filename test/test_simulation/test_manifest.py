@@ -0,0 +1,74 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from simulation import serialization
+from simulation.manifest import ResultsManifest
+from simulation.model import SimulationCase
+from simulation.serializer import Result, Serializer
+
+
+class ResultsManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manifest = ResultsManifest(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def store(self, problem, algorithm, run_id, budget, population_size=4, results_dir=None):
+        results_dir = results_dir if results_dir else self.temp_dir.name
+        case = SimulationCase(problem, algorithm, run_id, None, results_dir)
+        population = [[0.5, 0.5]] * population_size
+        Serializer(case).store(Result(population, population, cost=budget + 12), str(budget))
+
+    def test_filtered_queries(self):
+        self.manifest.initialize()
+        self.store("UF3", "HGS+NSGAII", 0, 5500)
+        self.store("UF3", "HGS+SPEA2", 0, 5500, population_size=7)
+        self.store("UF3", "HGS+SPEA2", 0, 6500)
+        self.store("UF3", "NSGAII", 0, 5500)
+        self.store("UF4", "HGS+NSGAII", 0, 5500)
+
+        self.assertTrue(self.manifest.is_complete())
+        entries = self.manifest.query(problem="UF3", algorithm="HGS+*", number=5500)
+        self.assertListEqual(
+            [(e.algorithm, e.population_size, e.cost) for e in entries],
+            [("HGS+NSGAII", 4, 5512.0), ("HGS+SPEA2", 7, 5512.0)],
+        )
+        self.assertIn(("UF3", "HGS+SPEA2", 6500, 1), self.manifest.summary())
+
+    def test_rebuild_legacy_tree(self):
+        self.store("ZDT1", "NSGAII", 0, 500)
+        self.store("ZDT1", "NSGAII", 1, 500)
+        self.manifest.path.unlink()
+
+        self.manifest.initialize()
+        self.assertFalse(self.manifest.is_complete())
+        self.assertEqual(self.manifest.rebuild(), 2)
+        self.assertTrue(self.manifest.is_complete())
+
+        [(results, config)] = serialization.BudgetResultsExtractor().load(
+            "NSGAII", "ZDT1", self.temp_dir.name
+        )
+        self.assertEqual(config, {"budget": 500})
+        self.assertListEqual([result.run_no for result in results], [0, 1])
+
+    def test_copied_run_not_indexed(self):
+        self.manifest.initialize()
+        self.store("ZDT1", "NSGAII", 0, 500)
+        with tempfile.TemporaryDirectory() as other_dir:
+            self.store("ZDT1", "NSGAII", 1, 500, results_dir=other_dir)
+            [run_path] = Path(other_dir, "ZDT1", "NSGAII").iterdir()
+            shutil.copytree(
+                str(run_path), str(Path(self.temp_dir.name, "ZDT1", "NSGAII", run_path.name))
+            )
+
+        self.assertTrue(self.manifest.is_complete())
+        with self.assertLogs(serialization.__name__, "WARNING"):
+            [(results, _)] = serialization.BudgetResultsExtractor().load(
+                "NSGAII", "ZDT1", self.temp_dir.name
+            )
+        self.assertListEqual([result.run_no for result in results], [0, 1])
+
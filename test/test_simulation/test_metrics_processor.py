@@ -0,0 +1,93 @@
+import multiprocessing
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import problems.ZDT1.problem as zdt1
+from evotools.random_tools import close_and_join
+from simulation import metrics_processor, serializer
+from simulation.metrics_store import MetricsStore
+from simulation.model import SimulationCase
+from simulation.serializer import Result, ResultWithMetadata
+
+
+class MetricsProcessorTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        case = SimulationCase("ZDT1", "NSGAII", 1, None, self.temp_dir.name)
+        fitnesses = [[x / 10, 1 - (x / 10) ** 0.5] for x in range(11)] + [[0.5, 0.9]]
+        path = serializer.Serializer(case).store(
+            Result(fitnesses, fitnesses, cost=100), "500"
+        )
+        self.result = ResultWithMetadata(None, path, 0, case)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_metrics_stored_in_results_dir_database(self):
+        names = [name for name, _, _ in metrics_processor.METRICS if name != "pdi"]
+        values = metrics_processor.evaluate_metrics([self.result], zdt1, names)[0]
+
+        files = sorted(p.name for p in Path(self.result.path.parent).iterdir())
+        self.assertListEqual(files, ["500.pickle"])
+        self.assertTrue(Path(self.temp_dir.name, MetricsStore.FILE_NAME).exists())
+        self.assertAlmostEqual(values["ndr"], 11 / 12)
+
+        # the second pass is answered from the database
+        with mock.patch.object(metrics_processor, "compute_metric", side_effect=AssertionError):
+            self.assertDictEqual(
+                metrics_processor.evaluate_metrics([self.result], zdt1, names)[0], values
+            )
+
+    def test_metrics_evaluated_on_pool(self):
+        with close_and_join(multiprocessing.Pool(2)) as pool:
+            analysis = {
+                metric_name: values
+                for metric_name, _, values in metrics_processor.yield_metrics(
+                    [self.result], zdt1, pool
+                )
+            }
+        self.assertListEqual(analysis["cost"], [100.0])
+        self.assertAlmostEqual(analysis["ndr"][0], 11 / 12)
+
+        # stored by the parent process
+        with mock.patch.object(metrics_processor, "compute_metric", side_effect=AssertionError):
+            values = metrics_processor.evaluate_metrics([self.result], zdt1)[0]
+        self.assertDictEqual(
+            values, {metric_name: analysis[metric_name][0] for metric_name in values}
+        )
+
+    def test_legacy_metric_pickles_imported(self):
+        names = [name for name, _, _ in metrics_processor.METRICS if name != "pdi"]
+        values = metrics_processor.evaluate_metrics([self.result], zdt1, names)[0]
+        Path(self.temp_dir.name, MetricsStore.FILE_NAME).unlink()
+
+        legacy_path = self.result.path.with_name("500.spacing.pickle")
+        serializer.save_file(
+            legacy_path,
+            {"metric": {"params": {"pareto": zdt1.pareto_front}}, "value": values["spacing"]},
+        )
+        imported = metrics_processor.import_metric_pickles(self.temp_dir.name, remove=True)
+
+        self.assertEqual(imported, 1)
+        self.assertFalse(legacy_path.exists())
+        with mock.patch.object(metrics_processor, "compute_metric", side_effect=AssertionError):
+            self.assertEqual(
+                metrics_processor.evaluate_metrics([self.result], zdt1, ["spacing"])[0]["spacing"],
+                values["spacing"],
+            )
+
+    def test_legacy_metric_pickles_read_without_database(self):
+        values = metrics_processor.evaluate_metrics([self.result], zdt1, ["spacing"])[0]
+        Path(self.temp_dir.name, MetricsStore.FILE_NAME).unlink()
+        serializer.save_file(
+            self.result.path.with_name("500.spacing.pickle"),
+            {"metric": {"params": {"pareto": zdt1.pareto_front}}, "value": values["spacing"]},
+        )
+
+        with mock.patch.object(metrics_processor, "compute_metric", side_effect=AssertionError):
+            self.assertDictEqual(
+                metrics_processor.evaluate_metrics([self.result], zdt1, ["spacing"])[0], values
+            )
+        self.assertTrue(Path(self.temp_dir.name, MetricsStore.FILE_NAME).exists())
@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+
+from simulation import factory, scheduling
+from simulation.model import SimulationCase
+
+
+class SchedulingTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def case(self, problem, algorithm, budget):
+        return SimulationCase(
+            problem,
+            algorithm,
+            1,
+            None,
+            self.temp_dir.name,
+            **{factory.BUDGETS_PARAM: [budget]}
+        )
+
+    def time_case(self, problem, algorithm, timeout):
+        return SimulationCase(
+            problem,
+            algorithm,
+            1,
+            None,
+            self.temp_dir.name,
+            **{factory.TIMEOUT_PARAM: timeout, factory.SAMPLING_INTERVAL_PARAM: 1}
+        )
+
+    def test_longest_first(self):
+        history = scheduling.RuntimeHistory(self.temp_dir.name)
+        history.add(self.case("ZDT1", "NSGAII", 1000), 1.0)
+        history.add(self.case("ZDT1", "NSGAII", 1000), 3.0)
+        history.add(self.case("UF9", "NSGAIII", 1000), 50.0)
+        history.save()
+
+        history = scheduling.RuntimeHistory(self.temp_dir.name)
+        self.assertEqual(history.estimate(self.case("ZDT1", "NSGAII", 1000)), 2.0)
+        # scaled from the other budget
+        self.assertEqual(history.estimate(self.case("ZDT1", "NSGAII", 3000)), 6.0)
+        self.assertIsNone(history.estimate(self.case("ZDT2", "NSGAII", 1000)))
+
+        cases = [
+            self.case("ZDT1", "NSGAII", 1000),
+            self.case("ZDT2", "HGS+NSGAII", 500),
+            self.case("UF9", "NSGAIII", 1000),
+        ]
+        ordered = scheduling.longest_first(cases, history)
+        # no history for HGS+NSGAII: 2 drivers * 500 * the mean recorded time per budget unit
+        self.assertListEqual(ordered, [cases[2], cases[1], cases[0]])
+
+    def test_run_types_kept_apart(self):
+        history = scheduling.RuntimeHistory(self.temp_dir.name)
+        history.add(self.case("ZDT1", "NSGAII", 60), 0.5)
+        history.add(self.time_case("ZDT1", "NSGAII", 60), 60.0)
+        history.add(self.time_case("ZDT1", "NSGAII", 10), 10.0)
+        history.save()
+
+        history = scheduling.RuntimeHistory(self.temp_dir.name)
+        self.assertEqual(history.estimate(self.case("ZDT1", "NSGAII", 60)), 0.5)
+        self.assertEqual(history.estimate(self.time_case("ZDT1", "NSGAII", 60)), 60.0)
+        # scaled from the time runs only
+        self.assertEqual(history.estimate(self.time_case("ZDT1", "NSGAII", 30)), 30.0)
+        self.assertEqual(history.estimate(self.case("ZDT1", "NSGAII", 120)), 1.0)
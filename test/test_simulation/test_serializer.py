@@ -0,0 +1,40 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from simulation import serializer
+from simulation.model import SimulationCase
+from simulation.serializer import Result
+
+
+class ColumnarStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.case = SimulationCase("ZDT1", "NSGAII", 1, None, self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_results_round_trip(self):
+        columnar = serializer.Serializer(self.case, storage="npz")
+        population = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
+        fitnesses = [[1.0, 2.0], [3.0, 4.0]]
+        columnar.store(Result([[0.0] * 3], [[0.0] * 2], cost=1), "500")
+        columnar.store(Result(population, fitnesses, cost=1000), "1000")
+        # replaces the stored one
+        path = columnar.store(Result(population, fitnesses, cost=512), "500")
+        serializer.Serializer(self.case, storage="pickle").store(
+            Result(population, fitnesses, cost=2000), "2000"
+        )
+
+        stored = columnar.stored_results()
+        self.assertListEqual(sorted(stored, key=int), ["500", "1000", "2000"])
+        self.assertEqual(stored["500"], path)
+
+        result = columnar.load("500")
+        self.assertIsInstance(result.fitnesses, np.memmap)
+        np.testing.assert_array_equal(result.population, population)
+        np.testing.assert_array_equal(result.fitnesses, fitnesses)
+        self.assertEqual(result.additional_data, {"cost": 512})
+        self.assertEqual(columnar.load("2000").additional_data, {"cost": 2000})
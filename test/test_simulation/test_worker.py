@@ -0,0 +1,80 @@
+import logging
+import tempfile
+import unittest
+from unittest import mock
+
+from algorithms.NSGAII.NSGAII import NSGAII
+from simulation import factory, worker
+from simulation.factory import prepare
+from simulation.model import SimulationCase
+
+
+class BudgetWorkerTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.simulation = SimulationCase(
+            "ZDT1",
+            "NSGAII",
+            1,
+            None,
+            self.temp_dir.name,
+            **{factory.BUDGETS_PARAM: [200, 400]}
+        )
+        # other tests replace factory.prepare
+        for patch in [
+            mock.patch.object(worker.log_helper, "init"),
+            mock.patch.object(factory, "prepare", prepare),
+        ]:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_resumed_driver_shut_down(self):
+        budget_worker = worker.BudgetWorker(self.simulation, 0)
+        driver_factory, _ = prepare("NSGAII", "ZDT1")
+        checkpoint_path = budget_worker.checkpoint_path
+        checkpoint_path.parent.mkdir(parents=True)
+        self.assertTrue(
+            worker.save_checkpoint(
+                checkpoint_path, driver_factory(), 200, logging.getLogger(__name__)
+            )
+        )
+
+        with mock.patch.object(NSGAII, "shutdown", autospec=True) as shutdown:
+            results, _, _, resumed = budget_worker.run()
+
+        # only the budget after the checkpoint is run
+        self.assertTrue(resumed)
+        self.assertEqual(len(results), 1)
+        self.assertFalse(checkpoint_path.exists())
+        # the new driver, replaced by the restored one, and the restored one
+        self.assertEqual(shutdown.call_count, 2)
+        self.assertIsNot(shutdown.call_args_list[0][0][0], shutdown.call_args_list[1][0][0])
+
+    def test_unpicklable_driver_warned_once(self):
+        budget_worker = worker.BudgetWorker(
+            SimulationCase(
+                "ZDT1",
+                "NSGAII",
+                1,
+                None,
+                self.temp_dir.name,
+                **{factory.BUDGETS_PARAM: [200, 400, 600]}
+            ),
+            0,
+        )
+        with mock.patch.object(
+            worker, "save_file", side_effect=TypeError("cannot pickle")
+        ) as save_file, self.assertLogs(worker.__name__, logging.WARNING) as logs:
+            results, _, _, resumed = budget_worker.run()
+
+        self.assertFalse(resumed)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(save_file.call_count, 1)
+        self.assertEqual(len(logs.records), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()